@@ -1,10 +1,28 @@
 #!/usr/bin/env python3
 """
 Create placeholder sprites for the wedding game with exact dimensions
+
+Each character is rendered as one frame template in a NumPy array (plus the
+odd-frame variant) and tiled across the strip; regions are filled with slice
+assignment. Sheets whose spec has not changed since the last run are skipped.
 """
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+from functools import lru_cache
+import numpy as np
+import argparse
+import hashlib
+import json
+import time
 import os
 
+PLACEHOLDER_DIR = '/home/joe/Documents/wedding-game-v7/assets/graphics/placeholders'
+
+# Spec hashes of the sheets written by the last run
+MANIFEST_NAME = '.placeholder_manifest.json'
+
+# Bump when the drawing changes so every sheet is rewritten
+RENDERER_VERSION = 1
+
 # Character specifications
 CHARACTERS = {
     # Main Playable Characters (32x32)
@@ -34,8 +52,64 @@ CHARACTERS = {
     'psychedelic_joe': {'size': (64, 64), 'frames': 8, 'color': '#FF1493', 'name': 'Psychedelic Joe'},
 }
 
+@lru_cache(maxsize=None)
+def _rgba(color):
+    return np.array(ImageColor.getcolor(color, 'RGBA'), dtype=np.uint8)
+
+def _outline(frame, left, top, right, bottom, color):
+    """1px rectangle outline with inclusive corners, like ImageDraw.rectangle"""
+    frame[top, left:right + 1] = color
+    frame[bottom, left:right + 1] = color
+    frame[top:bottom + 1, left] = color
+    frame[top:bottom + 1, right] = color
+
+@lru_cache(maxsize=None)
+def _eye_mask(eye_size):
+    """Pixels ImageDraw fills for an eye ellipse, drawn once per size and reused as a stamp"""
+    stamp = Image.new('1', (eye_size + 1, eye_size + 1), 0)
+    ImageDraw.Draw(stamp).ellipse([0, 0, eye_size, eye_size], fill=1)
+    return np.array(stamp, dtype=bool)
+
+def render_frame_templates(width, height, color):
+    """Even and odd frame templates for one character, shape (2, height, width, 4)"""
+    templates = np.zeros((2, height, width, 4), dtype=np.uint8)
+    base = templates[0]
+    
+    # Character placeholder (simple colored rectangle with border)
+    base[2:height - 1, 2:width - 1] = _rgba(color)
+    _outline(base, 2, 2, width - 2, height - 2, _rgba('#000000'))
+    
+    # Simple face (dots for eyes)
+    if width >= 16:  # Only add face if sprite is big enough
+        eye_size = max(1, width // 16)
+        mask = _eye_mask(eye_size)
+        for eye_x in (width // 4, 3 * width // 4):
+            region = base[height // 4:height // 4 + eye_size + 1, eye_x:eye_x + eye_size + 1]
+            region[mask[:region.shape[0], :region.shape[1]]] = _rgba('#000000')
+    
+    # Odd frames - slightly different (inner white outline)
+    templates[1] = base
+    _outline(templates[1], 4, 4, width - 4, height - 4, _rgba('#FFFFFF'))
+    return templates
+
+def render_placeholder_sheet(char_data):
+    """Horizontal strip for a character as an RGBA array, tiled from its frame templates"""
+    width, height = char_data['size']
+    frames = char_data['frames']
+    templates = render_frame_templates(width, height, char_data['color'])
+    strip = templates[np.arange(frames) % 2]  # (frames, height, width, 4)
+    return np.ascontiguousarray(strip.transpose(1, 0, 2, 3).reshape(height, frames * width, 4))
+
 def create_placeholder_sprite(char_name, char_data):
     """Create a placeholder sprite sheet for a character"""
+    return Image.fromarray(render_placeholder_sheet(char_data), 'RGBA')
+
+def spec_hash(char_data):
+    spec = dict(char_data, renderer=RENDERER_VERSION)
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+def draw_placeholder_sprite(char_name, char_data):
+    """Original ImageDraw renderer, kept as the reference for --benchmark"""
     width, height = char_data['size']
     frames = char_data['frames']
     color = char_data['color']
@@ -79,25 +153,72 @@ def create_placeholder_sprite(char_name, char_data):
     
     return sprite_sheet
 
+def benchmark(rounds=20):
+    """Compare the ImageDraw and NumPy renderers on CHARACTERS and check they match"""
+    identical = all(np.array_equal(np.asarray(draw_placeholder_sprite(name, data)), render_placeholder_sheet(data))
+                    for name, data in CHARACTERS.items())
+    timings = {}
+    for label, render in (('ImageDraw', draw_placeholder_sprite), ('NumPy', create_placeholder_sprite)):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for char_name, char_data in CHARACTERS.items():
+                render(char_name, char_data)
+        timings[label] = (time.perf_counter() - started) / rounds
+    print(f"ImageDraw: {timings['ImageDraw'] * 1000:.2f} ms, NumPy: {timings['NumPy'] * 1000:.2f} ms "
+          f"for {len(CHARACTERS)} sheets ({timings['ImageDraw'] / timings['NumPy']:.1f}x), "
+          f"{'identical' if identical else 'DIFFERENT'} pixels")
+
 def main():
+    parser = argparse.ArgumentParser(description='Create placeholder sprite sheets for the wedding game')
+    parser.add_argument('--output-dir', type=str, default=PLACEHOLDER_DIR,
+                       help=f'Directory to write sheets to (default: {PLACEHOLDER_DIR})')
+    parser.add_argument('--force', action='store_true',
+                       help='Rewrite every sheet even if its spec is unchanged')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='Time the NumPy renderer against the ImageDraw one and exit')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark()
+        return
+    
     # Create placeholders directory
-    placeholder_dir = '/home/joe/Documents/wedding-game-v7/assets/graphics/placeholders'
+    placeholder_dir = args.output_dir
     os.makedirs(placeholder_dir, exist_ok=True)
+    manifest_path = os.path.join(placeholder_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path) and not args.force:
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
     
     print("Creating placeholder sprites...")
     
+    skipped = 0
     for char_name, char_data in CHARACTERS.items():
         try:
-            sprite_sheet = create_placeholder_sprite(char_name, char_data)
             filename = f"{char_name}_spritesheet.png"
             filepath = os.path.join(placeholder_dir, filename)
+            digest = spec_hash(char_data)
+            if manifest.get(filename) == digest and os.path.exists(filepath):
+                skipped += 1
+                continue
             
+            sprite_sheet = create_placeholder_sprite(char_name, char_data)
             sprite_sheet.save(filepath)
+            manifest[filename] = digest
             print(f"✓ Created {filename} ({char_data['size'][0]}x{char_data['size'][1]}, {char_data['frames']} frames)")
             
         except Exception as e:
             print(f"✗ Failed to create {char_name}: {e}")
     
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    if skipped:
+        print(f"⏭️  {skipped} unchanged sheets skipped (use --force to rewrite)")
+    
     print(f"\nPlaceholder sprites created in: {placeholder_dir}")
     print("\nSprite Sheet Format:")
     print("- Horizontal strips (frames side by side)")
@@ -2,6 +2,7 @@
 """Create placeholder sprites for the wedding game"""
 
 from PIL import Image
+import numpy as np
 import os
 
 def create_drumstick():
@@ -11,12 +12,10 @@ def create_drumstick():
 
 def create_camera():
     """Create a camera sprite"""
-    img = Image.new('RGBA', (12, 8), (32, 32, 32, 255))  # Dark grey
+    pixels = np.full((8, 12, 4), (32, 32, 32, 255), dtype=np.uint8)  # Dark grey
     # Add white flash
-    for x in range(2, 6):
-        for y in range(2, 4):
-            img.putpixel((x, y), (255, 255, 255, 255))
-    return img
+    pixels[2:4, 2:6] = (255, 255, 255, 255)
+    return Image.fromarray(pixels, 'RGBA')
 
 def main():
     items_dir = "assets/graphics/items"
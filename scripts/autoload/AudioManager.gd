@@ -15,6 +15,8 @@ const VOICE_BUS := "Voice"
 const AUDIO_PATH := "res://assets/audio/"
 const MUSIC_PATH := AUDIO_PATH + "music/"
 const SFX_PATH := AUDIO_PATH + "sfx/"
+# Written by scripts/tools/audio_analyzer.py: per-file loudness and playback gain
+const AUDIO_MANIFEST_PATH := AUDIO_PATH + "audio_manifest.json"
 
 # Music tracks - loaded dynamically to avoid missing file errors
 var music_tracks := {}
@@ -22,6 +24,10 @@ var music_tracks := {}
 # Sound effects - loaded dynamically to avoid missing file errors
 var sound_effects := {}
 
+# Playback gain (dB) per track/effect from the audio manifest, applied on every play
+var music_gain_db := {}
+var sfx_gain_db := {}
+
 # Audio players
 var music_player: AudioStreamPlayer
 var sfx_players: Array[AudioStreamPlayer] = []
@@ -123,6 +129,8 @@ func _load_audio_files() -> void:
 		"bingo_wrong": "bingo_wrong.wav"
 	}
 
+	var manifest := _load_audio_manifest()
+
 	# Load music files if they exist
 	for track_name in music_files:
 		var path = MUSIC_PATH + music_files[track_name]
@@ -130,6 +138,7 @@ func _load_audio_files() -> void:
 			var stream = load(path)
 			if stream:
 				music_tracks[track_name] = stream
+				music_gain_db[track_name] = _manifest_gain(manifest, "music/" + music_files[track_name])
 				print("Loaded music: " + track_name)
 		else:
 			print("Music file not found: " + path + " (skipping)")
@@ -141,12 +150,29 @@ func _load_audio_files() -> void:
 			var stream = load(path)
 			if stream:
 				sound_effects[sfx_name] = stream
+				sfx_gain_db[sfx_name] = _manifest_gain(manifest, "sfx/" + sfx_files[sfx_name])
 				print("Loaded SFX: " + sfx_name)
 		else:
 			print("SFX file not found: " + path + " (skipping)")
 
 	print("Audio loading complete. Music tracks: %d, SFX: %d" % [music_tracks.size(), sound_effects.size()])
 
+## Read per-file levels written by audio_analyzer.py (empty if not generated)
+func _load_audio_manifest() -> Dictionary:
+	if not FileAccess.file_exists(AUDIO_MANIFEST_PATH):
+		return {}
+	var parsed = JSON.parse_string(FileAccess.get_file_as_string(AUDIO_MANIFEST_PATH))
+	if typeof(parsed) != TYPE_DICTIONARY or typeof(parsed.get("files")) != TYPE_DICTIONARY:
+		print("Audio manifest unreadable: " + AUDIO_MANIFEST_PATH + " (using unity gain)")
+		return {}
+	return parsed["files"]
+
+func _manifest_gain(manifest: Dictionary, relative_path: String) -> float:
+	var entry = manifest.get(relative_path, {})
+	if typeof(entry) != TYPE_DICTIONARY:
+		return 0.0
+	return float(entry.get("gain_db", 0.0))
+
 ## Play music track
 func play_music(track_name: String, fade_in: bool = true) -> void:
 	if track_name == current_music and music_player.playing:
@@ -166,13 +192,14 @@ func play_music(track_name: String, fade_in: bool = true) -> void:
 		music_player.stop()
 
 	# Play new music
+	var gain_db: float = music_gain_db.get(track_name, 0.0)
 	music_player.stream = music_tracks[track_name]
-	music_player.volume_db = -80.0 if fade_in else 0.0
+	music_player.volume_db = -80.0 if fade_in else gain_db
 	music_player.play()
 
 	if fade_in:
 		var tween = create_tween()
-		tween.tween_property(music_player, "volume_db", 0.0, 0.5)
+		tween.tween_property(music_player, "volume_db", gain_db, 0.5)
 
 	current_music = track_name
 	music_changed.emit(track_name)
@@ -208,7 +235,7 @@ func play_sfx(sfx_name: String, volume_offset: float = 0.0, pitch: float = 1.0)
 	var player = _get_available_sfx_player()
 	if player:
 		player.stream = sound_effects[sfx_name]
-		player.volume_db = volume_offset
+		player.volume_db = volume_offset + sfx_gain_db.get(sfx_name, 0.0)
 		player.pitch_scale = pitch
 		player.play()
 		return player
@@ -226,7 +253,7 @@ func play_sfx_pooled(sfx_name: String, volume_offset: float = 0.0, pitch: float
 	if has_node("/root/ObjectPool"):
 		pooled_player = get_node("/root/ObjectPool").get_object("audio_players")
 	if pooled_player and pooled_player.has_method("play_pooled"):
-		pooled_player.play_pooled(sound_effects[sfx_name], volume_offset, pitch)
+		pooled_player.play_pooled(sound_effects[sfx_name], volume_offset + sfx_gain_db.get(sfx_name, 0.0), pitch)
 		return pooled_player
 	else:
 		# Fallback to regular SFX player
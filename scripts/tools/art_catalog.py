@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Art Catalog
+SQLite index of downloaded art items, their files, hashes, licenses and categories.
+
+Usage:
+    python art_catalog.py [--catalog=./downloaded_art/catalog.sqlite]
+
+Features:
+- Replaces download_log.json: recording an item is one row upsert, not a full rewrite
+- Indexed by URL, license folder and category so reports are single queries
+- WAL mode, so readers (reports, reorganizer) never block the downloader
+- Imports download_log.json and existing metadata.json folders on first use
+"""
+
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    author TEXT,
+    license TEXT,
+    license_folder TEXT,
+    folder TEXT,
+    category TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    metadata TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    item_url TEXT NOT NULL REFERENCES items(url) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    size INTEGER,
+    sha256 TEXT,
+    PRIMARY KEY (item_url, filename)
+);
+CREATE TABLE IF NOT EXISTS crawl_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_license ON items(license_folder);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items(category);
+CREATE INDEX IF NOT EXISTS idx_items_folder ON items(folder);
+CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files(sha256);
+"""
+
+LICENSE_FOLDERS = ['cc0', 'cc-by', 'cc-by-sa', 'gpl', 'other']
+
+class ArtCatalog:
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by worker threads; the lock serializes access
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # -- Crawl state -----------------------------------------------------
+
+    def get_state(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM crawl_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_state(self, key: str, value: str):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO crawl_state (key, value) VALUES (?, ?)", (key, value))
+
+    # -- Items and files -------------------------------------------------
+
+    def record_item(self, art_info: Dict, license_folder: str, folder: str, status: str,
+                    files: Optional[Dict[str, Dict]] = None):
+        """Insert or update an item and its verified files in one transaction."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                """INSERT INTO items (url, title, author, license, license_folder, folder, status, metadata, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       title = excluded.title, author = excluded.author, license = excluded.license,
+                       license_folder = excluded.license_folder, folder = excluded.folder,
+                       status = excluded.status, metadata = excluded.metadata, updated_at = excluded.updated_at""",
+                (art_info['url'], art_info.get('title'), art_info.get('author'), art_info.get('license'),
+                 license_folder, folder, status, json.dumps(art_info, ensure_ascii=False), time.time()))
+            for filename, record in (files or {}).items():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (item_url, filename, size, sha256) VALUES (?, ?, ?, ?)",
+                    (art_info['url'], filename, record.get('size'), record.get('sha256')))
+
+    def set_category(self, url: str, category: str):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE items SET category = ? WHERE url = ?", (category, url))
+
+    def downloaded_urls(self) -> Set[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT url FROM items WHERE status = 'downloaded'").fetchall()
+        return {row['url'] for row in rows}
+
+    def file_checksums(self, url: str) -> Dict[str, Dict]:
+        """Verified size and SHA-256 of each file recorded for an item."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT filename, size, sha256 FROM files WHERE item_url = ? AND sha256 IS NOT NULL",
+                (url,)).fetchall()
+        return {row['filename']: {'size': row['size'], 'sha256': row['sha256']} for row in rows}
+
+    def iter_items(self) -> Iterator[Dict]:
+        """Yield one row per item folder with its metadata and file names."""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT items.url, items.license_folder, items.folder, items.metadata,
+                          group_concat(files.filename, char(10)) AS filenames
+                   FROM items LEFT JOIN files ON files.item_url = items.url
+                   WHERE items.folder IS NOT NULL
+                   GROUP BY items.url
+                   ORDER BY items.license_folder, items.folder""").fetchall()
+        for row in rows:
+            yield {
+                'url': row['url'],
+                'license_folder': row['license_folder'],
+                'folder': row['folder'],
+                'metadata': json.loads(row['metadata']) if row['metadata'] else {},
+                'files': row['filenames'].split('\n') if row['filenames'] else [],
+            }
+
+    # -- Reports ---------------------------------------------------------
+
+    def count_by_license(self) -> Dict[str, int]:
+        """Item folders per license folder (items sharing a folder count once)."""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT license_folder, COUNT(DISTINCT folder) AS n FROM items
+                   WHERE folder IS NOT NULL GROUP BY license_folder""").fetchall()
+        counts = {license_dir: 0 for license_dir in LICENSE_FOLDERS}
+        counts.update({row['license_folder']: row['n'] for row in rows})
+        return counts
+
+    def count_by_category(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT category, COUNT(DISTINCT folder) AS n FROM items
+                   WHERE category IS NOT NULL GROUP BY category""").fetchall()
+        return {row['category']: row['n'] for row in rows}
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            row = self.conn.execute(
+                """SELECT COUNT(*) AS files, COALESCE(SUM(size), 0) AS bytes,
+                          COUNT(DISTINCT sha256) AS unique_files FROM files""").fetchone()
+        return dict(row)
+
+    # -- Migration -------------------------------------------------------
+
+    def import_existing(self, output_dir: Path):
+        """One-time import of download_log.json and metadata.json folders."""
+        if self.get_state('imported_legacy'):
+            return
+        output_dir = Path(output_dir)
+        logged: Set[str] = set()
+        log_file = output_dir / "download_log.json"
+        if log_file.exists():
+            try:
+                with open(log_file, 'r') as f:
+                    logged = set(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+        imported = set()
+        for license_dir in LICENSE_FOLDERS:
+            license_path = output_dir / license_dir
+            if not license_path.is_dir():
+                continue
+            for item_dir in license_path.iterdir():
+                metadata_file = item_dir / "metadata.json"
+                if not metadata_file.is_file():
+                    continue
+                try:
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if 'url' not in metadata:
+                    continue
+                status = 'downloaded' if metadata['url'] in logged else 'partial'
+                art_info = {k: v for k, v in metadata.items() if k != 'file_checksums'}
+                # Older folders have no checksums; record their files unverified (no sha256)
+                files = {path.name: {'size': path.stat().st_size, 'sha256': None}
+                         for path in item_dir.iterdir()
+                         if path.is_file() and path.name != 'metadata.json'
+                         and not path.name.startswith('.') and not path.name.endswith(('.part', '.part.json'))}
+                files.update(metadata.get('file_checksums', {}))
+                self.record_item(art_info, license_dir, item_dir.name, status, files)
+                imported.add(metadata['url'])
+
+        # Logged URLs whose folder could not be found still count as done
+        for url in logged - imported:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO items (url, status, updated_at) VALUES (?, 'downloaded', ?)",
+                    (url, time.time()))
+        self.set_state('imported_legacy', time.strftime('%Y-%m-%d %H:%M:%S'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Show statistics from the art catalog')
+    parser.add_argument('--catalog', type=str, default='./downloaded_art/catalog.sqlite',
+                       help='Catalog database (default: ./downloaded_art/catalog.sqlite)')
+    args = parser.parse_args()
+
+    if not Path(args.catalog).exists():
+        print(f"❌ Catalog not found: {args.catalog}")
+        return
+
+    catalog = ArtCatalog(args.catalog)
+    print("📚 Items by license:")
+    for license_type, count in catalog.count_by_license().items():
+        print(f"  {license_type:10s} {count}")
+    categories = catalog.count_by_category()
+    if categories:
+        print("🗂️  Items by category:")
+        for category, count in sorted(categories.items()):
+            print(f"  {category:14s} {count}")
+    totals = catalog.totals()
+    print(f"📦 {totals['files']} files, {totals['unique_files']} unique, {totals['bytes'] / (1024 * 1024):.1f} MB")
+    catalog.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Texture Atlas Packer for Wedding Game
+Packs character and item frames into power-of-two atlases with a JSON frame map
+
+Usage:
+    python atlas_packer.py                                   # Pack atlas_specs/*.json
+    python atlas_packer.py atlas_specs/characters.json --tres
+    python atlas_packer.py --force                           # Ignore the previous build
+
+Features:
+- MaxRects bin packing (best short side fit) into the smallest power-of-two
+  page that holds everything; overflow goes to extra pages
+- Transparent borders are trimmed; the offset and original size are kept so
+  frames still line up (Godot AtlasTexture margin)
+- Identical frames (e.g. repeated walk-cycle poses) are stored once
+- Strips are cut by frame size, or by sprite detection for irregular sheets
+- Incremental: sources whose content hash is unchanged are not re-packed, and
+  a changed source whose frames still fit their old slots only repaints its
+  own atlas page
+- Optional Godot SpriteFrames .tres per source, built from AtlasTextures
+"""
+
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+from pathlib import Path
+from PIL import Image
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from character_sprite_extractor import detect_sprites, opacity_mask
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SPECS = Path(__file__).resolve().parent / "atlas_specs"
+
+MIN_PAGE_SIZE = 32
+
+class Frame(NamedTuple):
+    """A trimmed frame ready to pack."""
+    name: str
+    source: str  # Repo-relative path of the source image
+    pixels: np.ndarray  # Trimmed RGBA, shape (h, w, 4)
+    offset: Tuple[int, int]  # Trimmed pixels' position inside the untrimmed frame
+    source_size: Tuple[int, int]
+    digest: str
+
+class MaxRectsBin:
+    """MaxRects packer using the best short side fit heuristic."""
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if width <= fw and height <= fh:
+                leftover_w, leftover_h = fw - width, fh - height
+                score = (min(leftover_w, leftover_h), max(leftover_w, leftover_h))
+                if best_score is None or score < best_score:
+                    best, best_score = (fx, fy), score
+        if best is not None:
+            self._place(best[0], best[1], width, height)
+        return best
+
+    def _place(self, x: int, y: int, width: int, height: int):
+        right, bottom = x + width, y + height
+        split = []
+        for free in self.free:
+            fx, fy, fw, fh = free
+            if x >= fx + fw or right <= fx or y >= fy + fh or bottom <= fy:
+                split.append(free)
+                continue
+            # Keep the parts of the free rectangle not covered by the placed one
+            if x > fx:
+                split.append((fx, fy, x - fx, fh))
+            if right < fx + fw:
+                split.append((right, fy, fx + fw - right, fh))
+            if y > fy:
+                split.append((fx, fy, fw, y - fy))
+            if bottom < fy + fh:
+                split.append((fx, bottom, fw, fy + fh - bottom))
+        # Drop free rectangles contained in another one
+        split = list(dict.fromkeys(split))
+        self.free = [a for a in split
+                     if not any(a is not b and b[0] <= a[0] and b[1] <= a[1] and
+                                a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3] for b in split)]
+
+def page_sizes(max_size: int) -> List[Tuple[int, int]]:
+    """Power-of-two page sizes up to max_size, smallest and squarest first."""
+    sides = []
+    side = MIN_PAGE_SIZE
+    while side <= max_size:
+        sides.append(side)
+        side *= 2
+    return sorted(((w, h) for w in sides for h in sides), key=lambda size: (size[0] * size[1], abs(size[0] - size[1]), -size[0]))
+
+def _try_pack(sizes: List[Tuple[int, int]], width: int, height: int, padding: int) -> Optional[List[Tuple[int, int]]]:
+    # Padding is added to each rectangle and to the bin, so edges need none
+    packer = MaxRectsBin(width + padding, height + padding)
+    positions = []
+    for w, h in sizes:
+        position = packer.insert(w + padding, h + padding)
+        if position is None:
+            return None
+        positions.append(position)
+    return positions
+
+def pack(sizes: List[Tuple[int, int]], max_size: int = 2048, padding: int = 1) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int, int]]]:
+    """Pack rectangles into power-of-two pages.
+
+    Returns the page sizes and, for each rectangle, ``(page, x, y)``.
+    """
+    for w, h in sizes:
+        if w > max_size or h > max_size:
+            raise ValueError(f"A {w}x{h} frame does not fit a {max_size}x{max_size} atlas")
+    # Big, long rectangles first
+    order = sorted(range(len(sizes)), key=lambda i: (max(sizes[i]), sizes[i][0] * sizes[i][1]), reverse=True)
+    pages: List[Tuple[int, int]] = []
+    placements: List[Optional[Tuple[int, int, int]]] = [None] * len(sizes)
+    candidates = page_sizes(max_size)
+
+    while order:
+        area = sum((sizes[i][0] + padding) * (sizes[i][1] + padding) for i in order)
+        remaining = [sizes[i] for i in order]
+        for width, height in candidates:
+            if width * height < area:
+                continue
+            positions = _try_pack(remaining, width, height, padding)
+            if positions is not None:
+                for i, (x, y) in zip(order, positions):
+                    placements[i] = (len(pages), x, y)
+                pages.append((width, height))
+                order = []
+                break
+        else:
+            # Too much for one page: fill a full-size page and carry the rest over
+            packer = MaxRectsBin(max_size + padding, max_size + padding)
+            overflow = []
+            for i in order:
+                position = packer.insert(sizes[i][0] + padding, sizes[i][1] + padding)
+                if position is None:
+                    overflow.append(i)
+                else:
+                    placements[i] = (len(pages), *position)
+            pages.append((max_size, max_size))
+            order = overflow
+    return pages, placements
+
+def trim(pixels: np.ndarray) -> Tuple[Optional[np.ndarray], Tuple[int, int]]:
+    """Crop fully transparent borders; returns (None, (0, 0)) for an empty frame."""
+    opaque = pixels[:, :, 3] > 0
+    rows = np.flatnonzero(opaque.any(axis=1))
+    if not len(rows):
+        return None, (0, 0)
+    cols = np.flatnonzero(opaque.any(axis=0))
+    top, left = int(rows[0]), int(cols[0])
+    return pixels[top:rows[-1] + 1, left:cols[-1] + 1], (left, top)
+
+def load_frames(path: Path, rule: Dict, do_trim: bool = True) -> List[Frame]:
+    """Cut one source image into frames according to its spec entry.
+
+    ``frame_size: [w, h]`` cuts a regular grid, ``slice: "auto"`` uses sprite
+    detection for irregular sheets, and otherwise the image is one frame.
+    """
+    with Image.open(path) as image:
+        if rule.get('slice') == 'auto':
+            mask = opacity_mask(image, rule.get('tolerance', 16))
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        pixels = np.asarray(image.convert('RGBA'))
+    source = path.relative_to(REPO_ROOT).as_posix()
+    stem = rule.get('prefix', '') + path.stem
+
+    if rule.get('slice') == 'auto':
+        boxes = [sprite['box'] for sprite in detect_sprites(mask, rule.get('gap', 1), rule.get('min_pixels', 4))]
+        if not has_alpha:
+            pixels = pixels.copy()
+            pixels[:, :, 3] = np.where(mask, 255, 0)  # Keyed background becomes transparent
+        cells = [pixels[b['y']:b['y'] + b['height'], b['x']:b['x'] + b['width']] for b in boxes]
+    elif 'frame_size' in rule:
+        frame_w, frame_h = rule['frame_size']
+        columns, rows = pixels.shape[1] // frame_w, pixels.shape[0] // frame_h
+        grid = pixels[:rows * frame_h, :columns * frame_w].reshape(rows, frame_h, columns, frame_w, 4).swapaxes(1, 2)
+        cells = [grid[row, column] for row in range(rows) for column in range(columns)]
+    else:
+        cells = [pixels]
+
+    frames = []
+    for index, cell in enumerate(cells):
+        name = f"{stem}_{index:02d}" if len(cells) > 1 else stem
+        trimmed, offset = trim(cell) if do_trim else (cell, (0, 0))
+        if trimmed is None:
+            continue  # Fully transparent cell
+        trimmed = np.ascontiguousarray(trimmed)
+        digest = hashlib.sha1(trimmed.tobytes() + str(trimmed.shape).encode()).hexdigest()
+        frames.append(Frame(name, source, trimmed, offset, (cell.shape[1], cell.shape[0]), digest))
+    return frames
+
+# Per-source fields compared between builds; content-based so a fresh checkout is up to date
+SOURCE_KEYS = ('sha1', 'size')
+
+def _source_stat(path: Path) -> Dict:
+    data = path.read_bytes()
+    return {'sha1': hashlib.sha1(data).hexdigest(), 'size': len(data)}
+
+class AtlasBuilder:
+    def __init__(self, spec_path: Path, force: bool = False, tres: bool = False):
+        self.spec_path = Path(spec_path)
+        with open(self.spec_path, 'r', encoding='utf-8') as f:
+            self.spec = json.load(f)
+        self.name = self.spec.get('name', self.spec_path.stem)
+        self.output_dir = REPO_ROOT / self.spec.get('output_dir', 'assets/graphics/atlases')
+        self.max_size = self.spec.get('max_size', 2048)
+        self.padding = self.spec.get('padding', 1)
+        self.trim = self.spec.get('trim', True)
+        self.force = force
+        self.tres = tres
+        self.map_path = self.output_dir / f"{self.name}.json"
+        self.spec_hash = hashlib.sha1(json.dumps(self.spec, sort_keys=True).encode()).hexdigest()
+
+    def sources(self) -> Dict[Path, Dict]:
+        """Each source image and the first spec rule that matches it."""
+        matched: Dict[Path, Dict] = {}
+        for rule in self.spec['sources']:
+            paths = sorted(REPO_ROOT.glob(rule['glob'])) if 'glob' in rule else [REPO_ROOT / rule['path']]
+            for path in paths:
+                if path.is_file() and path not in matched:
+                    matched[path] = rule
+        return matched
+
+    def _previous(self) -> Optional[Dict]:
+        if self.force or not self.map_path.exists():
+            return None
+        try:
+            with open(self.map_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return previous if previous.get('spec_hash') == self.spec_hash else None
+
+    def build(self) -> Dict:
+        started = time.perf_counter()
+        sources = self.sources()
+        stats = {path.relative_to(REPO_ROOT).as_posix(): _source_stat(path) for path in sources}
+        previous = self._previous()
+
+        if previous is not None:
+            old_stats = {source: {k: entry.get(k) for k in SOURCE_KEYS} for source, entry in previous['sources'].items()}
+            changed = [source for source in stats if old_stats.get(source) != stats[source]]
+            if not changed and set(old_stats) == set(stats):
+                print(f"✅ {self.name}: up to date ({len(previous['frames'])} frames)")
+                return previous
+            if set(old_stats) == set(stats):
+                atlas_map = self._update_in_place(previous, changed, sources, stats)
+                if atlas_map is not None:
+                    self._finish(atlas_map, started, f"updated {len(changed)} source(s) in place")
+                    return atlas_map
+
+        frames = []
+        for path, rule in sources.items():
+            frames.extend(load_frames(path, rule, self.trim))
+        atlas_map = self._pack_all(frames, stats)
+        self._finish(atlas_map, started, f"packed {len(sources)} sources")
+        return atlas_map
+
+    def _pack_all(self, frames: List[Frame], stats: Dict[str, Dict]) -> Dict:
+        # Identical trimmed frames share one region
+        unique: Dict[str, Frame] = {}
+        for frame in frames:
+            unique.setdefault(frame.digest, frame)
+        digests = list(unique)
+        pages, placements = pack([(unique[d].pixels.shape[1], unique[d].pixels.shape[0]) for d in digests],
+                                 self.max_size, self.padding)
+
+        images = [np.zeros((height, width, 4), dtype=np.uint8) for width, height in pages]
+        regions = {}
+        for digest, (page, x, y) in zip(digests, placements):
+            pixels = unique[digest].pixels
+            images[page][y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+            regions[digest] = (page, [x, y, pixels.shape[1], pixels.shape[0]])
+
+        atlas_map = {
+            'name': self.name,
+            'spec_hash': self.spec_hash,
+            'atlases': [{'file': self._page_file(page), 'size': [width, height]} for page, (width, height) in enumerate(pages)],
+            'frames': {},
+            'sources': {source: dict(stat, frames=[]) for source, stat in stats.items()},
+        }
+        for frame in frames:
+            page, region = regions[frame.digest]
+            atlas_map['frames'][frame.name] = self._frame_entry(frame, page, region)
+            atlas_map['sources'][frame.source]['frames'].append(frame.name)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for page, image in enumerate(images):
+            Image.fromarray(image, 'RGBA').save(self.output_dir / self._page_file(page), optimize=True)
+        # Pages left over from a bigger previous build
+        stale = len(images)
+        while (self.output_dir / self._page_file(stale)).exists():
+            (self.output_dir / self._page_file(stale)).unlink()
+            stale += 1
+        return atlas_map
+
+    def _update_in_place(self, previous: Dict, changed: List[str], sources: Dict[Path, Dict],
+                         stats: Dict[str, Dict]) -> Optional[Dict]:
+        """Repaint changed sources into their old slots; None if a full repack is needed."""
+        by_source = {path.relative_to(REPO_ROOT).as_posix(): (path, rule) for path, rule in sources.items()}
+        region_users: Dict[Tuple, int] = {}
+        for entry in previous['frames'].values():
+            key = (entry['atlas'], *entry['region'][:2])
+            region_users[key] = region_users.get(key, 0) + 1
+
+        updates = []
+        for source in changed:
+            path, rule = by_source[source]
+            frames = load_frames(path, rule, self.trim)
+            if [frame.name for frame in frames] != previous['sources'][source]['frames']:
+                return None
+            for frame in frames:
+                old = previous['frames'][frame.name]
+                x, y, width, height = old['region']
+                if region_users[(old['atlas'], x, y)] > 1:
+                    return None  # Slot is shared with an identical frame elsewhere
+                if frame.pixels.shape[1] > width or frame.pixels.shape[0] > height:
+                    return None  # Grew beyond its slot
+                updates.append((frame, old))
+
+        pages = {}
+        for frame, old in updates:
+            page = old['atlas']
+            if page not in pages:
+                with Image.open(self.output_dir / previous['atlases'][page]['file']) as image:
+                    pages[page] = np.array(image.convert('RGBA'))
+            x, y, width, height = old['region']
+            pages[page][y:y + height, x:x + width] = 0
+            pixels = frame.pixels
+            pages[page][y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+            previous['frames'][frame.name] = self._frame_entry(frame, page, [x, y, pixels.shape[1], pixels.shape[0]])
+        for page, image in pages.items():
+            Image.fromarray(image, 'RGBA').save(self.output_dir / previous['atlases'][page]['file'], optimize=True)
+        for source in changed:
+            previous['sources'][source].update(stats[source])
+        return previous
+
+    def _page_file(self, page: int) -> str:
+        return f"{self.name}_{page}.png"
+
+    def _frame_entry(self, frame: Frame, page: int, region: List[int]) -> Dict:
+        width, height = frame.source_size
+        return {
+            'atlas': page,
+            'region': region,
+            # Godot AtlasTexture margin: trim offset and the size trimmed away
+            'margin': [frame.offset[0], frame.offset[1], width - region[2], height - region[3]],
+            'source_size': [width, height],
+            'digest': frame.digest,
+        }
+
+    def _finish(self, atlas_map: Dict, started: float, action: str):
+        report = occupancy(atlas_map)
+        for atlas, page_report in zip(atlas_map['atlases'], report):
+            atlas.update(page_report)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.map_path, 'w', encoding='utf-8') as f:
+            json.dump(atlas_map, f, indent=2)
+        if self.tres:
+            write_sprite_frames(atlas_map, self.output_dir)
+
+        elapsed = time.perf_counter() - started
+        print(f"🧩 {self.name}: {action} in {elapsed * 1000:.0f} ms")
+        source_bytes = sum(entry['size'] for entry in atlas_map['sources'].values())
+        atlas_bytes = sum((self.output_dir / atlas['file']).stat().st_size for atlas in atlas_map['atlases'])
+        for atlas in atlas_map['atlases']:
+            width, height = atlas['size']
+            print(f"  {atlas['file']:24s} {width:5d}x{height:<5d} {atlas['frames']:4d} frames "
+                  f"{atlas['unique_frames']:4d} unique  {atlas['occupancy'] * 100:5.1f}% occupied")
+        print(f"  {len(atlas_map['sources'])} source textures -> {len(atlas_map['atlases'])} atlas page(s), "
+              f"{source_bytes / 1024:.1f} KB -> {atlas_bytes / 1024:.1f} KB")
+
+def occupancy(atlas_map: Dict) -> List[Dict]:
+    """Frames, unique regions and the fraction of each page covered by frame pixels."""
+    report = [{'frames': 0, 'unique_frames': 0, 'occupancy': 0.0} for _ in atlas_map['atlases']]
+    seen = set()
+    for entry in atlas_map['frames'].values():
+        page = entry['atlas']
+        report[page]['frames'] += 1
+        key = (page, *entry['region'][:2])
+        if key in seen:
+            continue
+        seen.add(key)
+        report[page]['unique_frames'] += 1
+        report[page]['occupancy'] += entry['region'][2] * entry['region'][3]
+    for page_report, atlas in zip(report, atlas_map['atlases']):
+        page_report['occupancy'] = round(page_report['occupancy'] / (atlas['size'][0] * atlas['size'][1]), 4)
+    return report
+
+def write_sprite_frames(atlas_map: Dict, output_dir: Path):
+    """Write ``<source>_frames.tres`` SpriteFrames built from AtlasTextures."""
+    res_dir = "res://" + output_dir.relative_to(REPO_ROOT).as_posix()
+    for source, entry in atlas_map['sources'].items():
+        names = entry['frames']
+        if not names:
+            continue
+        pages = sorted({atlas_map['frames'][name]['atlas'] for name in names})
+        ext_ids = {page: str(i + 1) for i, page in enumerate(pages)}
+        lines = [f'[gd_resource type="SpriteFrames" load_steps={len(pages) + len(names) + 1} format=3]', '']
+        for page in pages:
+            lines.append(f'[ext_resource type="Texture2D" path="{res_dir}/{atlas_map["atlases"][page]["file"]}" id="{ext_ids[page]}"]')
+        lines.append('')
+        for index, name in enumerate(names):
+            frame = atlas_map['frames'][name]
+            lines += [f'[sub_resource type="AtlasTexture" id="AtlasTexture_{index}"]',
+                      f'atlas = ExtResource("{ext_ids[frame["atlas"]]}")',
+                      'region = Rect2({}, {}, {}, {})'.format(*frame['region']),
+                      'margin = Rect2({}, {}, {}, {})'.format(*frame['margin']), '']
+        textures = ', {\n'.join(f'"duration": 1.0,\n"texture": SubResource("AtlasTexture_{i}")\n}}' for i in range(len(names)))
+        lines += ['[resource]', 'animations = [{', '"frames": [{', textures + '],',
+                  '"loop": true,', '"name": &"default",', '"speed": 8.0', '}]', '']
+        with open(output_dir / f"{Path(source).stem}_frames.tres", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+
+def find_specs(paths: List[str]) -> List[Path]:
+    specs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            specs.extend(sorted(path.glob('*.json')))
+        else:
+            specs.append(path)
+    return specs
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack sprite frames into power-of-two texture atlases')
+    parser.add_argument('specs', nargs='*', default=[str(DEFAULT_SPECS)],
+                       help=f'Atlas spec files or directories of specs (default: {DEFAULT_SPECS})')
+    parser.add_argument('--force', action='store_true',
+                       help='Repack everything even if sources are unchanged')
+    parser.add_argument('--tres', action='store_true',
+                       help='Also write a Godot SpriteFrames .tres per source image')
+    args = parser.parse_args()
+
+    for spec_path in find_specs(args.specs):
+        try:
+            AtlasBuilder(spec_path, args.force, args.tres).build()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ {spec_path.name}: {e}")
+
+if __name__ == "__main__":
+    main()
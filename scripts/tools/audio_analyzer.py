@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Audio Asset Analyzer and Loudness Normalizer
+Measures every WAV under assets/audio and writes a manifest the game reads at startup
+
+Usage:
+    python audio_analyzer.py                                   # Analyze assets/audio, write audio_manifest.json
+    python audio_analyzer.py ../../assets/audio/sfx --target-lufs=-16
+    python audio_analyzer.py --normalize                       # Normalize WAVs in place to the target
+    python audio_analyzer.py --trim --normalize                # Also cut leading/trailing silence
+
+Features:
+- WAV data is memory-mapped, never read into Python bytes
+- Peak, RMS, integrated loudness (BS.1770-style K-weighting applied via FFT,
+  400 ms gated blocks), DC offset, leading/trailing silence and clipped samples
+- --normalize scales samples in place through a writable memmap so loudness
+  hits the target without exceeding the peak ceiling
+- --trim rewrites files without their silent head and tail
+- The manifest records a playback gain per file; AudioManager reads it at
+  load and adds it to volume_db on every play, on top of any caller offset
+- Compressed formats (.ogg, .mp3) are listed but not measured
+"""
+
+import os
+import json
+import time
+import wave
+import struct
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Default tree: <repo>/assets/audio
+DEFAULT_AUDIO_ROOT = Path(__file__).resolve().parents[2] / "assets" / "audio"
+MANIFEST_NAME = "audio_manifest.json"
+
+DEFAULT_TARGET_LUFS = -16.0
+DEFAULT_PEAK_CEILING_DB = -1.0
+DEFAULT_SILENCE_DB = -60.0
+TRIM_PAD_SECONDS = 0.005  # Keep a few ms around trimmed sounds so attacks are not clipped
+
+# BS.1770 K-weighting: a high shelf (head effect) then a high-pass (RLB)
+SHELF_GAIN_DB = 3.999843853973347
+SHELF_Q = 0.7071752369554196
+SHELF_FREQUENCY = 1681.974450955533
+HIGHPASS_Q = 0.5003270373238773
+HIGHPASS_FREQUENCY = 38.13547087602444
+
+GATE_BLOCK_SECONDS = 0.4
+GATE_OVERLAP = 0.75
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+COMPRESSED_EXTENSIONS = {'.ogg', '.mp3'}
+
+def map_wav(path: Path, writable: bool = False) -> Tuple[np.memmap, int]:
+    """Memory-map a PCM/float WAV's sample data as a (frames, channels) array.
+
+    Returns the array and the sample rate. Only the header is read with
+    Python; samples are paged in by the OS as NumPy touches them.
+    """
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"{path}: not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path}: no data chunk")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack('<HHIIHH', f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                data_size = chunk_size
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    if fmt is None:
+        raise ValueError(f"{path}: no fmt chunk")
+
+    format_tag, channels, sample_rate, _, _, bits = fmt
+    if format_tag == 3 and bits == 32:
+        dtype = np.float32
+    elif format_tag in (1, 0xFFFE) and bits in (8, 16, 32):
+        dtype = {8: np.uint8, 16: np.int16, 32: np.int32}[bits]
+    else:
+        raise ValueError(f"{path}: unsupported WAV encoding (format {format_tag}, {bits}-bit)")
+    frame_bytes = channels * np.dtype(dtype).itemsize
+    frames = min(data_size, path.stat().st_size - data_offset) // frame_bytes
+    data = np.memmap(path, dtype=dtype, mode='r+' if writable else 'r',
+                     offset=data_offset, shape=(frames, channels))
+    return data, sample_rate
+
+def to_float(data: np.ndarray) -> np.ndarray:
+    """Samples as float64 in [-1, 1]."""
+    if data.dtype == np.uint8:
+        return (data.astype(np.float64) - 128) / 128
+    if data.dtype == np.float32:
+        return data.astype(np.float64)
+    return data.astype(np.float64) / -np.iinfo(data.dtype).min
+
+def _biquad_response(frequencies: np.ndarray, sample_rate: int, kind: str,
+                     frequency: float, q: float, gain_db: float = 0.0) -> np.ndarray:
+    """Complex response of an RBJ-cookbook biquad at the given frequencies."""
+    k = np.tan(np.pi * frequency / sample_rate)
+    if kind == 'high_shelf':
+        vh = 10 ** (gain_db / 20)
+        vb = vh ** 0.4996667741545416
+        a0 = 1 + k / q + k * k
+        b = np.array([vh + vb * k / q + k * k, 2 * (k * k - vh), vh - vb * k / q + k * k]) / a0
+        a = np.array([1, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+    else:  # high_pass
+        b = np.array([1.0, -2.0, 1.0])
+        a0 = 1 + k / q + k * k
+        a = np.array([1, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+    z = np.exp(-2j * np.pi * frequencies / sample_rate)
+    return (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+
+def k_weighted_power(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Per-sample K-weighted power summed over channels (BS.1770 weights 1.0 for L/R/C)."""
+    frames = len(samples)
+    # Zero-pad so the FFT filter's circular wrap-around falls in the padding
+    size = 1 << int(np.ceil(np.log2(frames + sample_rate // 10 + 1)))
+    frequencies = np.fft.rfftfreq(size, 1 / sample_rate)
+    response = (_biquad_response(frequencies, sample_rate, 'high_shelf', SHELF_FREQUENCY, SHELF_Q, SHELF_GAIN_DB) *
+                _biquad_response(frequencies, sample_rate, 'high_pass', HIGHPASS_FREQUENCY, HIGHPASS_Q))
+    spectrum = np.fft.rfft(samples, n=size, axis=0)
+    spectrum *= response[:, None]
+    weighted = np.fft.irfft(spectrum, n=size, axis=0)[:frames]
+    return np.square(weighted).sum(axis=1)
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """Gated integrated loudness in LUFS (ungated for sounds shorter than one block)."""
+    power = k_weighted_power(samples, sample_rate)
+    block = int(GATE_BLOCK_SECONDS * sample_rate)
+    if len(power) < block:
+        mean_power = power.mean() if len(power) else 0.0
+        return -0.691 + 10 * np.log10(mean_power) if mean_power > 0 else float('-inf')
+
+    # Mean power of overlapping 400 ms blocks from a cumulative sum
+    step = max(1, int(block * (1 - GATE_OVERLAP)))
+    cumulative = np.concatenate(([0.0], np.cumsum(power)))
+    starts = np.arange(0, len(power) - block + 1, step)
+    block_power = (cumulative[starts + block] - cumulative[starts]) / block
+    with np.errstate(divide='ignore'):
+        block_loudness = -0.691 + 10 * np.log10(block_power)
+
+    gated = block_power[block_loudness > ABSOLUTE_GATE_LUFS]
+    if not len(gated):
+        return float('-inf')
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = block_power[block_loudness > max(ABSOLUTE_GATE_LUFS, relative_gate)]
+    return -0.691 + 10 * np.log10(gated.mean())
+
+def to_db(value: float) -> Optional[float]:
+    return round(20 * np.log10(value), 2) if value > 0 else None
+
+def analyze(data: np.ndarray, sample_rate: int, silence_db: float = DEFAULT_SILENCE_DB) -> Dict:
+    """Level statistics for a (frames, channels) sample array."""
+    samples = to_float(data)
+    frames = len(samples)
+    magnitude = np.abs(samples).max(axis=1) if frames else np.zeros(0)
+    peak = float(magnitude.max()) if frames else 0.0
+    rms = float(np.sqrt(np.mean(np.square(samples)))) if frames else 0.0
+
+    # Full-scale samples: the codes at (or one step from) the integer limits
+    if data.dtype == np.float32:
+        clipped = int(np.count_nonzero(np.abs(data) >= 1.0))
+    elif data.dtype == np.uint8:
+        clipped = int(np.count_nonzero((data <= 0) | (data >= 255)))
+    else:
+        limit = np.iinfo(data.dtype).max
+        clipped = int(np.count_nonzero((data >= limit) | (data <= -limit)))
+
+    audible = np.flatnonzero(magnitude > 10 ** (silence_db / 20))
+    first = int(audible[0]) if len(audible) else frames
+    last = int(audible[-1]) + 1 if len(audible) else frames
+    loudness = integrated_loudness(samples, sample_rate) if frames else float('-inf')
+
+    return {
+        'duration': round(frames / sample_rate, 4),
+        'sample_rate': sample_rate,
+        'channels': samples.shape[1],
+        'peak_db': to_db(peak),
+        'rms_db': to_db(rms),
+        'lufs': round(loudness, 2) if np.isfinite(loudness) else None,
+        'dc_offset': round(float(samples.mean()), 6) if frames else 0.0,
+        'leading_silence': round(first / sample_rate, 4),
+        'trailing_silence': round((frames - last) / sample_rate, 4),
+        'clipped_samples': clipped,
+    }
+
+def normalization_gain_db(stats: Dict, target_lufs: float, peak_ceiling_db: float) -> float:
+    """Gain that brings loudness to the target without pushing the peak past the ceiling."""
+    if stats['lufs'] is None or stats['peak_db'] is None:
+        return 0.0
+    return round(min(target_lufs - stats['lufs'], peak_ceiling_db - stats['peak_db']), 2)
+
+def apply_gain_in_place(data: np.memmap, gain_db: float):
+    """Scale a writable memmap's samples by ``gain_db``, rounding and clamping to its format."""
+    gain = 10 ** (gain_db / 20)
+    if data.dtype == np.float32:
+        data *= np.float32(gain)
+    elif data.dtype == np.uint8:
+        scaled = np.rint((data.astype(np.float64) - 128) * gain) + 128
+        data[:] = np.clip(scaled, 0, 255)
+    else:
+        info = np.iinfo(data.dtype)
+        data[:] = np.clip(np.rint(data * gain), info.min, info.max)
+    data.flush()
+
+def trim_silence(path: Path, data: np.ndarray, sample_rate: int, stats: Dict) -> bool:
+    """Rewrite a WAV without its leading/trailing silence; returns True if it changed."""
+    pad = int(TRIM_PAD_SECONDS * sample_rate)
+    first = max(0, int(round(stats['leading_silence'] * sample_rate)) - pad)
+    last = min(len(data), len(data) - int(round(stats['trailing_silence'] * sample_rate)) + pad)
+    if first == 0 and last == len(data):
+        return False
+    if first >= last:
+        return False  # Entirely silent; leave it for a human to look at
+
+    tmp_path = path.with_name(f".{path.name}.trim-tmp")
+    with wave.open(str(tmp_path), 'wb') as wav_file:
+        wav_file.setnchannels(data.shape[1])
+        wav_file.setsampwidth(data.dtype.itemsize)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.ascontiguousarray(data[first:last]).tobytes())
+    del data
+    os.replace(tmp_path, path)
+    return True
+
+def process_tree(root: Path, target_lufs: float = DEFAULT_TARGET_LUFS,
+                 peak_ceiling_db: float = DEFAULT_PEAK_CEILING_DB, silence_db: float = DEFAULT_SILENCE_DB,
+                 normalize: bool = False, trim: bool = False) -> Dict:
+    """Analyze (and optionally trim/normalize) every audio file under ``root``."""
+    entries = {}
+    for path in sorted(root.rglob('*')):
+        if not path.is_file():
+            continue
+        key = path.relative_to(root).as_posix()
+        suffix = path.suffix.lower()
+        if suffix in COMPRESSED_EXTENSIONS:
+            entries[key] = {'analyzed': False, 'reason': f"{suffix} is not decoded by this tool", 'gain_db': 0.0}
+            continue
+        if suffix != '.wav':
+            continue
+
+        try:
+            data, sample_rate = map_wav(path)
+        except ValueError as e:
+            entries[key] = {'analyzed': False, 'reason': str(e), 'gain_db': 0.0}
+            continue
+
+        stats = analyze(data, sample_rate, silence_db)
+        changes = []
+        if trim and trim_silence(path, data, sample_rate, stats):
+            data, sample_rate = map_wav(path)
+            stats = analyze(data, sample_rate, silence_db)
+            changes.append('trimmed')
+
+        gain_db = normalization_gain_db(stats, target_lufs, peak_ceiling_db)
+        if normalize and abs(gain_db) >= 0.1:
+            del data  # Re-open writable
+            writable, sample_rate = map_wav(path, writable=True)
+            apply_gain_in_place(writable, gain_db)
+            del writable
+            data, sample_rate = map_wav(path)
+            stats = analyze(data, sample_rate, silence_db)
+            changes.append(f"normalized {gain_db:+.1f} dB")
+            gain_db = normalization_gain_db(stats, target_lufs, peak_ceiling_db)
+        del data
+
+        entries[key] = {'analyzed': True, **stats, 'gain_db': gain_db}
+        if changes:
+            entries[key]['changes'] = changes
+    return entries
+
+def write_manifest(root: Path, entries: Dict, target_lufs: float, peak_ceiling_db: float) -> Path:
+    manifest_path = root / MANIFEST_NAME
+    manifest = {
+        'version': 1,
+        'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'target_lufs': target_lufs,
+        'peak_ceiling_db': peak_ceiling_db,
+        'files': entries,
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return manifest_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze and normalize audio assets')
+    parser.add_argument('root', nargs='?', default=str(DEFAULT_AUDIO_ROOT),
+                       help=f'Audio folder to scan (default: {DEFAULT_AUDIO_ROOT})')
+    parser.add_argument('--target-lufs', type=float, default=DEFAULT_TARGET_LUFS,
+                       help=f'Loudness target (default: {DEFAULT_TARGET_LUFS})')
+    parser.add_argument('--peak-ceiling', type=float, default=DEFAULT_PEAK_CEILING_DB,
+                       help=f'Highest allowed peak after gain, in dBFS (default: {DEFAULT_PEAK_CEILING_DB})')
+    parser.add_argument('--silence-threshold', type=float, default=DEFAULT_SILENCE_DB,
+                       help=f'Level treated as silence, in dBFS (default: {DEFAULT_SILENCE_DB})')
+    parser.add_argument('--normalize', action='store_true', help='Scale WAVs in place to the loudness target')
+    parser.add_argument('--trim', action='store_true', help='Remove leading/trailing silence from WAVs')
+    parser.add_argument('--no-manifest', action='store_true', help=f'Do not write {MANIFEST_NAME}')
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ Directory not found: {root}")
+        return
+
+    started = time.perf_counter()
+    entries = process_tree(root, args.target_lufs, args.peak_ceiling, args.silence_threshold,
+                           normalize=args.normalize, trim=args.trim)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'file':40s} {'peak':>7s} {'RMS':>7s} {'LUFS':>7s} {'gain':>6s} {'head s':>7s} {'tail s':>7s} {'clip':>5s}")
+    for key, entry in entries.items():
+        if not entry['analyzed']:
+            print(f"{key:40s}  (skipped: {entry['reason']})")
+            continue
+        fmt = lambda value: f"{value:7.1f}" if value is not None else "      -"
+        print(f"{key:40s} {fmt(entry['peak_db'])} {fmt(entry['rms_db'])} {fmt(entry['lufs'])} "
+              f"{entry['gain_db']:+6.1f} {entry['leading_silence']:7.3f} {entry['trailing_silence']:7.3f} "
+              f"{entry['clipped_samples']:5d}" + (f"  [{', '.join(entry['changes'])}]" if 'changes' in entry else ''))
+
+    analyzed = sum(1 for entry in entries.values() if entry['analyzed'])
+    print(f"\n🔊 Analyzed {analyzed} WAV files in {elapsed:.2f}s")
+    if not args.no_manifest:
+        manifest_path = write_manifest(root, entries, args.target_lufs, args.peak_ceiling)
+        print(f"📄 Manifest: {manifest_path}")
+
+if __name__ == "__main__":
+    main()
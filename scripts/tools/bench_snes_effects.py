@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+SNES Effect Benchmark
+Times every create_* effect of SNESAudioGenerator against the original
+implementation and checks both still produce the same samples.
+
+Usage:
+    python bench_snes_effects.py               # Time/allocation report per effect
+    python bench_snes_effects.py --rounds=200  # More rounds per effect
+    python snes_audio_generator.py --benchmark # Same report
+
+The original generator is kept here, not in snes_audio_generator.py, so the
+production module only carries the live renderer.
+"""
+
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from snes_audio_generator import SNESAudioGenerator
+
+class LegacySNESAudioGenerator:
+    """Benchmark baseline: verbatim copy of the generator before preallocated buffers.
+    
+    Every tone allocates a fresh array, envelopes build a full-length array
+    and sequences grow with np.concatenate.
+    """
+    def __init__(self, sample_rate=22050):  # Classic SNES sample rate
+        self.sample_rate = sample_rate
+        self.bit_depth = 16
+        
+    def generate_tone(self, frequency, duration, amplitude=0.5, wave_type='sine'):
+        """Generate a basic tone with SNES characteristics"""
+        samples = int(self.sample_rate * duration)
+        t = np.linspace(0, duration, samples, False)
+        
+        if wave_type == 'sine':
+            wave_data = amplitude * np.sin(2 * np.pi * frequency * t)
+        elif wave_type == 'square':
+            wave_data = amplitude * np.sign(np.sin(2 * np.pi * frequency * t))
+        elif wave_type == 'sawtooth':
+            wave_data = amplitude * (2 * (t * frequency - np.floor(t * frequency + 0.5)))
+        elif wave_type == 'triangle':
+            wave_data = amplitude * (2 * np.arcsin(np.sin(2 * np.pi * frequency * t)) / np.pi)
+        
+        return wave_data
+    
+    def apply_envelope(self, wave_data, attack=0.1, decay=0.1, sustain=0.7, release=0.2):
+        """Apply ADSR envelope to simulate classic SNES sound shaping"""
+        samples = len(wave_data)
+        envelope = np.ones(samples)
+        
+        attack_samples = int(attack * samples)
+        decay_samples = int(decay * samples)
+        release_samples = int(release * samples)
+        sustain_samples = samples - attack_samples - decay_samples - release_samples
+        
+        # Attack
+        envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
+        
+        # Decay
+        start_idx = attack_samples
+        end_idx = start_idx + decay_samples
+        envelope[start_idx:end_idx] = np.linspace(1, sustain, decay_samples)
+        
+        # Sustain
+        start_idx = end_idx
+        end_idx = start_idx + sustain_samples
+        envelope[start_idx:end_idx] = sustain
+        
+        # Release
+        start_idx = end_idx
+        envelope[start_idx:] = np.linspace(sustain, 0, release_samples)
+        
+        return wave_data * envelope
+    
+    def add_vibrato(self, wave_data, vibrato_frequency=5, vibrato_depth=0.1):
+        """Add vibrato effect common in SNES audio"""
+        samples = len(wave_data)
+        t = np.linspace(0, len(wave_data) / self.sample_rate, samples)
+        vibrato = 1 + vibrato_depth * np.sin(2 * np.pi * vibrato_frequency * t)
+        return wave_data * vibrato
+    
+    def quantize_to_8bit(self, wave_data):
+        """Simulate 8-bit quantization for more authentic SNES sound"""
+        # Convert to 8-bit equivalent resolution
+        quantized = np.round(wave_data * 127) / 127
+        return quantized
+    
+    def create_wedding_bell(self):
+        """Create a cheerful wedding bell chime"""
+        # Bell-like sound with multiple harmonics
+        base_freq = 523  # C5
+        duration = 1.5
+        
+        # Create bell harmonics
+        harmonics = [1, 2, 3, 4.2, 5.4]  # Bell-like harmonic series
+        amplitudes = [1.0, 0.6, 0.4, 0.3, 0.2]
+        
+        bell_sound = np.zeros(int(self.sample_rate * duration))
+        
+        for harmonic, amplitude in zip(harmonics, amplitudes):
+            freq = base_freq * harmonic
+            tone = self.generate_tone(freq, duration, amplitude * 0.3, 'sine')
+            bell_sound += tone
+        
+        # Apply envelope and effects
+        bell_sound = self.apply_envelope(bell_sound, 0.01, 0.1, 0.6, 0.8)
+        bell_sound = self.add_vibrato(bell_sound, 3, 0.05)
+        
+        return bell_sound
+    
+    def create_success_chime(self):
+        """Create a success/achievement sound"""
+        notes = [523, 659, 784]  # C-E-G major chord
+        duration = 0.4
+        
+        chord = np.zeros(int(self.sample_rate * duration))
+        
+        for note in notes:
+            tone = self.generate_tone(note, duration, 0.3, 'sine')
+            tone = self.apply_envelope(tone, 0.02, 0.1, 0.8, 0.3)
+            chord += tone
+        
+        return chord
+    
+    def create_menu_select(self):
+        """Create a menu selection beep"""
+        frequency = 800
+        duration = 0.1
+        
+        beep = self.generate_tone(frequency, duration, 0.5, 'square')
+        beep = self.apply_envelope(beep, 0.01, 0.02, 0.9, 0.05)
+        beep = self.quantize_to_8bit(beep)
+        
+        return beep
+    
+    def create_menu_confirm(self):
+        """Create a menu confirmation sound"""
+        # Two-tone confirmation
+        tone1 = self.generate_tone(600, 0.08, 0.4, 'square')
+        tone2 = self.generate_tone(800, 0.12, 0.4, 'square')
+        
+        # Add small gap between tones
+        gap = np.zeros(int(self.sample_rate * 0.02))
+        
+        confirm = np.concatenate([tone1, gap, tone2])
+        confirm = self.apply_envelope(confirm, 0.01, 0.05, 0.8, 0.1)
+        
+        return confirm
+    
+    def create_celebration_fanfare(self):
+        """Create a celebratory fanfare"""
+        # Rising notes sequence
+        notes = [392, 440, 494, 523, 587, 659]  # G-A-B-C-D-E
+        duration_per_note = 0.15
+        
+        fanfare = np.array([])
+        
+        for note in notes:
+            tone = self.generate_tone(note, duration_per_note, 0.6, 'square')
+            tone = self.apply_envelope(tone, 0.01, 0.05, 0.8, 0.05)
+            fanfare = np.concatenate([fanfare, tone])
+        
+        # Add final chord
+        final_chord = np.zeros(int(self.sample_rate * 0.5))
+        for note in [523, 659, 784]:  # C major chord
+            tone = self.generate_tone(note, 0.5, 0.4, 'sine')
+            tone = self.apply_envelope(tone, 0.02, 0.1, 0.7, 0.3)
+            final_chord += tone
+        
+        fanfare = np.concatenate([fanfare, final_chord])
+        
+        return fanfare
+    
+    def create_disaster_alarm(self):
+        """Create a disaster warning sound"""
+        # Alternating high-low alarm
+        high_freq = 1000
+        low_freq = 600
+        duration = 0.3
+        
+        high_tone = self.generate_tone(high_freq, duration, 0.6, 'square')
+        low_tone = self.generate_tone(low_freq, duration, 0.6, 'square')
+        
+        # Apply sharp envelope for alarm effect
+        high_tone = self.apply_envelope(high_tone, 0.01, 0.1, 0.9, 0.05)
+        low_tone = self.apply_envelope(low_tone, 0.01, 0.1, 0.9, 0.05)
+        
+        # Repeat pattern
+        alarm = np.concatenate([high_tone, low_tone, high_tone, low_tone])
+        
+        return alarm
+    
+    def create_bingo_correct(self):
+        """Create a correct answer sound for Glen's bingo"""
+        # Happy ascending arpeggio
+        notes = [523, 659, 784, 1047]  # C-E-G-C octave
+        duration_per_note = 0.1
+        
+        arpeggio = np.array([])
+        
+        for i, note in enumerate(notes):
+            amplitude = 0.5 - (i * 0.05)  # Gradually decrease volume
+            tone = self.generate_tone(note, duration_per_note, amplitude, 'sine')
+            tone = self.apply_envelope(tone, 0.01, 0.02, 0.9, 0.02)
+            arpeggio = np.concatenate([arpeggio, tone])
+        
+        return arpeggio
+    
+    def create_bingo_wrong(self):
+        """Create a wrong answer sound for Glen's bingo"""
+        # Descending disappointed sound
+        notes = [400, 350, 300]
+        duration_per_note = 0.2
+        
+        sad_sound = np.array([])
+        
+        for note in notes:
+            tone = self.generate_tone(note, duration_per_note, 0.4, 'sawtooth')
+            tone = self.apply_envelope(tone, 0.05, 0.1, 0.7, 0.3)
+            sad_sound = np.concatenate([sad_sound, tone])
+        
+        return sad_sound
+
+def benchmark_effects(rounds=50):
+    """Compare time, peak allocation and output per effect against LegacySNESAudioGenerator."""
+    current = SNESAudioGenerator()
+    legacy = LegacySNESAudioGenerator()
+    
+    effects = [name for name in dir(LegacySNESAudioGenerator) if name.startswith('create_')]
+    print(f"{'effect':28s} {'before ms':>10s} {'after ms':>10s} {'before KB':>10s} {'after KB':>10s} {'max diff':>9s}")
+    for name in effects:
+        before, after = getattr(legacy, name)(), getattr(current, name)()
+        difference = np.max(np.abs(before - after)) if len(before) == len(after) else float('inf')
+        row = []
+        for generator in (legacy, current):
+            effect = getattr(generator, name)
+            effect()  # Warm caches
+            started = time.perf_counter()
+            for _ in range(rounds):
+                effect()
+            elapsed = (time.perf_counter() - started) / rounds
+            tracemalloc.start()
+            effect()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row.append((elapsed, peak))
+        (before_time, before_peak), (after_time, after_peak) = row
+        print(f"{name:28s} {before_time * 1000:10.3f} {after_time * 1000:10.3f} "
+              f"{before_peak / 1024:10.1f} {after_peak / 1024:10.1f} {difference:9.1e}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SNES effects against the original generator')
+    parser.add_argument('--rounds', type=int, default=50,
+                       help='Renders per effect and generator (default: 50)')
+    args = parser.parse_args()
+    benchmark_effects(args.rounds)
+
+if __name__ == "__main__":
+    main()
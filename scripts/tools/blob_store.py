@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Blob Store
+Keeps one copy of every art file, keyed by SHA-256, and links item folders into it.
+
+Usage:
+    python blob_store.py dedupe <tree> [--store=<tree>/.blobs] [--link-mode=hardlink] [--dry-run]
+    python blob_store.py stats [--store=./.blobs]
+
+Features:
+- Stores each unique file once under objects/<ab>/<sha256>
+- Item folders hold hardlinks (or copy-on-write reflinks) into the store
+- Placing a blob falls back to a plain copy when links are impossible; ingesting
+  never does, so a store on another filesystem is refused instead of silently
+  becoming a second full copy of every file
+- `dedupe` collapses byte-identical files in an existing tree and reports bytes reclaimed
+
+Note: hardlinked files share one inode, so editing a file in place edits every
+folder that links to it. Use --link-mode=reflink on CoW filesystems (Btrfs, XFS)
+to keep copies independent while still sharing storage.
+"""
+
+import os
+import sys
+import errno
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Linux FICLONE ioctl: make dst share src's extents copy-on-write
+FICLONE = 0x40049409
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(filepath: Path) -> str:
+    """Return the hex SHA-256 of a file."""
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def _reflink(src: Path, dst: Path):
+    """Clone src to dst copy-on-write; raises OSError where unsupported."""
+    if sys.platform != 'linux':
+        raise OSError(errno.ENOTSUP, "reflinks are only supported on Linux")
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+LINK_MODES = ['copy', 'hardlink', 'symlink', 'reflink']
+
+def link_file(src: Path, dst: Path, mode: str = 'hardlink', fallback: bool = True) -> str:
+    """Create dst from src using ``mode``, falling back to a copy.
+
+    Symlinks are relative, so a tree that is moved together with its source
+    keeps working. Returns the method actually used ('hardlink', 'symlink',
+    'reflink' or 'copy'). With ``fallback=False`` a failed link raises
+    instead of copying.
+    """
+    if mode == 'hardlink':
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except FileExistsError:
+            raise
+        except OSError:
+            if not fallback:
+                raise
+            # Cross-device, unsupported filesystem or link limit reached
+    elif mode == 'symlink':
+        try:
+            os.symlink(os.path.relpath(os.path.abspath(src), os.path.dirname(os.path.abspath(dst))), dst)
+            return 'symlink'
+        except FileExistsError:
+            raise
+        except OSError:
+            if not fallback:
+                raise
+            # E.g. Windows without symlink privilege
+    elif mode == 'reflink':
+        try:
+            _reflink(src, dst)
+            return 'reflink'
+        except OSError:
+            if not fallback:
+                raise
+            # Cross-device or no copy-on-write support
+    shutil.copy2(src, dst)
+    return 'copy'
+
+class BlobStore:
+    def __init__(self, root: str, link_mode: str = 'hardlink'):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.link_mode = link_mode
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {'ingested': 0, 'linked': 0, 'bytes_reclaimed': 0}
+
+    def blob_path(self, digest: str) -> Path:
+        """Location of a blob in the store."""
+        return self.objects_dir / digest[:2] / digest
+
+    def can_link(self, path: Path) -> bool:
+        """Whether files at ``path`` can share storage with the store.
+
+        Hardlinks and reflinks only work within one filesystem.
+        """
+        if self.link_mode not in ('hardlink', 'reflink'):
+            return True
+        return os.stat(path).st_dev == os.stat(self.objects_dir).st_dev
+
+    def ingest(self, filepath: Path, digest: Optional[str] = None) -> str:
+        """Add a file to the store and turn it into a link to its blob.
+
+        A file whose content is new becomes the blob itself (no bytes are
+        copied when hardlinking); a duplicate is replaced by a link to the
+        existing blob. Raises OSError instead of copying when the file
+        cannot be linked into the store, e.g. from another filesystem.
+        """
+        filepath = Path(filepath)
+        if not self.can_link(filepath):
+            raise OSError(errno.EXDEV, f"{filepath} is on a different filesystem than blob store {self.root}; "
+                                       f"{self.link_mode}s are impossible")
+        digest = digest or hash_file(filepath)
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(exist_ok=True)
+            try:
+                link_file(filepath, blob, self.link_mode, fallback=self.link_mode == 'copy')
+                self.stats['ingested'] += 1
+                return digest
+            except FileExistsError:
+                pass  # Another worker stored the same content first
+        self.place(digest, filepath)
+        return digest
+
+    def place(self, digest: str, dest: Path) -> bool:
+        """Materialize a blob at ``dest``, atomically replacing any existing file.
+
+        An existing file is only replaced when a real link could be made;
+        swapping a duplicate for another full copy would gain nothing.
+        Returns True when ``dest`` now shares storage with the blob.
+        """
+        dest = Path(dest)
+        blob = self.blob_path(digest)
+        if dest.exists() and os.path.samefile(blob, dest):
+            return True
+
+        tmp_path = dest.with_name(f".{dest.name}.blob-tmp")
+        tmp_path.unlink(missing_ok=True)
+        method = link_file(blob, tmp_path, self.link_mode)
+        if method == 'copy' and dest.exists():
+            tmp_path.unlink()
+            return False
+
+        if dest.exists():
+            old_stat = dest.stat()
+            # Bytes are only freed if no other path still links the old inode
+            if method == 'reflink' or old_stat.st_nlink == 1:
+                self.stats['bytes_reclaimed'] += old_stat.st_size
+        os.replace(tmp_path, dest)
+        self.stats['linked'] += 1
+        return method != 'copy'
+
+    def dedupe(self, tree: Path, dry_run: bool = False, min_size: int = 1) -> Dict:
+        """Collapse byte-identical files under ``tree`` into links to shared blobs.
+
+        Files are grouped by size first so only size collisions are hashed.
+        """
+        tree = Path(tree)
+        store_root = self.root.resolve()
+
+        # Group candidate files by size
+        by_size: Dict[int, List[Path]] = {}
+        scanned_files = scanned_bytes = 0
+        for root, dirs, files in os.walk(tree):
+            if Path(root).resolve() == store_root:
+                dirs[:] = []
+                continue
+            dirs[:] = [d for d in dirs if (Path(root) / d).resolve() != store_root]
+            for name in files:
+                filepath = Path(root) / name
+                if filepath.is_symlink() or name.endswith('.blob-tmp'):
+                    continue
+                size = filepath.stat().st_size
+                scanned_files += 1
+                scanned_bytes += size
+                if size >= min_size:
+                    by_size.setdefault(size, []).append(filepath)
+
+        # Hash size collisions and collapse identical content
+        groups = 0
+        duplicates = 0
+        reclaimable = 0
+        before = self.stats['bytes_reclaimed']
+        for size, paths in by_size.items():
+            if len(paths) < 2:
+                continue
+            by_hash: Dict[str, List[Path]] = {}
+            for filepath in paths:
+                by_hash.setdefault(hash_file(filepath), []).append(filepath)
+            for digest, same in by_hash.items():
+                if len(same) < 2:
+                    continue
+                inodes = {(p.stat().st_dev, p.stat().st_ino) for p in same}
+                if len(inodes) < 2:
+                    continue  # Already sharing storage
+                groups += 1
+                duplicates += len(same) - 1
+                reclaimable += size * (len(inodes) - 1)
+                if dry_run:
+                    continue
+                for filepath in same:
+                    try:
+                        self.ingest(filepath, digest)
+                    except OSError as e:
+                        print(f"  ⚠ Could not link {filepath}: {e}")
+
+        return {
+            'scanned_files': scanned_files,
+            'scanned_bytes': scanned_bytes,
+            'duplicate_groups': groups,
+            'duplicate_files': duplicates,
+            'bytes_reclaimed': reclaimable if dry_run else self.stats['bytes_reclaimed'] - before,
+        }
+
+    def usage(self) -> Dict:
+        """Count blobs and bytes held by the store."""
+        blobs = [p for p in self.objects_dir.glob('*/*') if p.is_file()]
+        return {'blobs': len(blobs), 'bytes': sum(p.stat().st_size for p in blobs)}
+
+def format_size(num_bytes: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed store and deduplication for art assets')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    dedupe_parser = subparsers.add_parser('dedupe', help='Collapse duplicate files in a tree into shared blobs')
+    dedupe_parser.add_argument('tree', type=str, help='Directory to scan (e.g. ../../assets)')
+    dedupe_parser.add_argument('--store', type=str, default=None,
+                               help='Blob store directory (default: <tree>/.blobs)')
+    dedupe_parser.add_argument('--link-mode', choices=['hardlink', 'reflink'], default='hardlink',
+                               help='How files are linked into the store (default: hardlink)')
+    dedupe_parser.add_argument('--min-size', type=int, default=1,
+                               help='Ignore files smaller than this many bytes (default: 1)')
+    dedupe_parser.add_argument('--dry-run', action='store_true',
+                               help='Report duplicates without changing anything')
+
+    stats_parser = subparsers.add_parser('stats', help='Show blob store usage')
+    stats_parser.add_argument('--store', type=str, default='./.blobs', help='Blob store directory')
+
+    args = parser.parse_args()
+
+    if args.command == 'dedupe':
+        tree = Path(args.tree)
+        if not tree.is_dir():
+            print(f"❌ Directory not found: {tree}")
+            return
+        store = BlobStore(args.store or str(tree / ".blobs"), link_mode=args.link_mode)
+        if not store.can_link(tree):
+            print(f"❌ Blob store {store.root} is on a different filesystem than {tree}; "
+                  f"{args.link_mode}s are impossible, so deduping would only add copies")
+            return
+        print(f"🔍 Scanning {tree} for duplicate files{' (dry run)' if args.dry_run else ''}...")
+        result = store.dedupe(tree, dry_run=args.dry_run, min_size=args.min_size)
+        print(f"📄 Scanned {result['scanned_files']} files ({format_size(result['scanned_bytes'])})")
+        print(f"♻️  {result['duplicate_files']} duplicate files in {result['duplicate_groups']} groups")
+        verb = "Reclaimable" if args.dry_run else "Reclaimed"
+        print(f"💾 {verb}: {format_size(result['bytes_reclaimed'])}")
+    elif args.command == 'stats':
+        usage = BlobStore(args.store).usage()
+        print(f"📦 {usage['blobs']} blobs, {format_size(usage['bytes'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+BRR Codec for Wedding Game Audio
+SNES-style Bit Rate Reduction: 4-bit ADPCM in 9-byte blocks of 16 samples
+
+Usage:
+    python brr_codec.py compress ../../assets/audio/sfx [--out=./brr]   # Encode a folder, report size/quality/time
+    python brr_codec.py encode sound.wav [sound.brr]                     # Encode one file
+    python brr_codec.py decode sound.brr [sound.wav]                     # Decode back to 16-bit WAV
+
+Format:
+- Each block is a header byte (shift << 4 | filter << 2 | loop << 1 | end)
+  followed by 8 bytes holding 16 signed 4-bit residuals, high nibble first
+- Filters 0-3 are the SNES DSP predictors (0, 15/16, 61/32 -15/16, 115/64 -13/16)
+  in the DSP's integer arithmetic; samples are 15-bit internally
+- 32 bytes of PCM become 9 bytes of BRR (about 3.56x smaller)
+- .brr files carry a 16-byte header (magic, sample rate, sample count) so
+  they decode back to the exact original length
+
+The encoder searches filter/shift pairs per block, decoding each candidate
+to keep the predictor state exact, and keeps the pair with the least error.
+"""
+
+import os
+import sys
+import time
+import wave
+import struct
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BLOCK_SAMPLES = 16
+BLOCK_BYTES = 9
+MAX_SHIFT = 12  # Shifts 13-15 are degenerate on real hardware
+
+BRR_MAGIC = b'SBRR'
+BRR_HEADER = struct.Struct('<4sHHII')  # magic, version, flags, sample rate, sample count
+BRR_VERSION = 1
+
+def _predict(block_filter: int, old: int, older: int) -> int:
+    """SNES DSP prediction from the two previous (15-bit) samples."""
+    if block_filter == 0:
+        return 0
+    if block_filter == 1:
+        return old + ((-old) >> 4)
+    if block_filter == 2:
+        return (old << 1) + ((-old * 3) >> 5) - older + (older >> 4)
+    return (old << 1) + ((-old * 13) >> 6) - older + ((older * 3) >> 4)
+
+def _estimate_shift(block_filter: int, target: List[int], old: int, older: int) -> int:
+    """Smallest shift whose 4-bit range covers the filter's open-loop residuals."""
+    peak = 0
+    for value in target:
+        peak = max(peak, abs(value - _predict(block_filter, old, older)))
+        older, old = old, value
+    shift = 0
+    while shift < MAX_SHIFT and peak * 2 > (7 << shift):
+        shift += 1
+    return shift
+
+def encode(samples: np.ndarray) -> bytes:
+    """Encode 16-bit PCM samples to raw BRR blocks (padded to 16 samples).
+
+    For each filter the shift is estimated from its open-loop residuals;
+    that shift and its neighbours are then encoded closed-loop (tracking the
+    decoder's exact state) and the pair with the least squared error wins.
+    A candidate is abandoned as soon as it falls behind the best so far.
+    """
+    pcm = np.asarray(samples, dtype=np.int64) >> 1  # 15-bit working range
+    blocks = -(-len(pcm) // BLOCK_SAMPLES) or 1
+    padded = np.zeros(blocks * BLOCK_SAMPLES, dtype=np.int64)
+    padded[:len(pcm)] = pcm
+
+    output = bytearray()
+    old = older = 0
+    for block_index, target in enumerate(padded.reshape(-1, BLOCK_SAMPLES).tolist()):
+        if not any(target) and old == 0 and older == 0:
+            candidates = [(0, 0)]  # Silence needs no search
+        else:
+            candidates = []
+            for block_filter in range(4):
+                shift = _estimate_shift(block_filter, target, old, older)
+                candidates.extend((block_filter, s) for s in (shift - 1, shift, shift + 1) if 0 <= s <= MAX_SHIFT)
+
+        best = None
+        for block_filter, shift in candidates:
+            cand_old, cand_older = old, older
+            error = 0
+            nibbles = []
+            for value in target:
+                prediction = _predict(block_filter, cand_old, cand_older)
+                nibble = min(max(round((value - prediction) * 2 / (1 << shift)), -8), 7)
+                decoded = min(max(prediction + ((nibble << shift) >> 1), -16384), 16383)
+                error += (value - decoded) ** 2
+                if best is not None and error >= best[0]:
+                    break
+                nibbles.append(nibble)
+                cand_older, cand_old = cand_old, decoded
+            else:
+                best = (error, block_filter, shift, nibbles, cand_old, cand_older)
+
+        _, block_filter, shift, nibbles, old, older = best
+        end_flag = 1 if block_index == blocks - 1 else 0
+        output.append((shift << 4) | (block_filter << 2) | end_flag)
+        output.extend(((nibbles[i] & 0xF) << 4) | (nibbles[i + 1] & 0xF) for i in range(0, BLOCK_SAMPLES, 2))
+    return bytes(output)
+
+def decode(data: bytes, sample_count: int = None) -> np.ndarray:
+    """Decode raw BRR blocks to 16-bit PCM samples."""
+    if len(data) % BLOCK_BYTES:
+        raise ValueError(f"BRR data length {len(data)} is not a multiple of {BLOCK_BYTES}")
+    raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, BLOCK_BYTES)
+    headers = raw[:, 0]
+    # Unpack and sign-extend nibbles for every block at once
+    nibbles = np.empty((len(raw), BLOCK_SAMPLES), dtype=np.int64)
+    nibbles[:, 0::2] = raw[:, 1:] >> 4
+    nibbles[:, 1::2] = raw[:, 1:] & 0xF
+    nibbles[nibbles >= 8] -= 16
+    shifts = (headers >> 4).astype(np.int64)
+    filters = ((headers >> 2) & 3).astype(np.int64)
+    residuals = (nibbles << shifts[:, None]) >> 1
+
+    output = np.empty(len(raw) * BLOCK_SAMPLES, dtype=np.int64)
+    old = older = 0
+    for block_index in range(len(raw)):
+        base = block_index * BLOCK_SAMPLES
+        block_residuals = residuals[block_index]
+        block_filter = int(filters[block_index])
+        if block_filter == 0:
+            # No prediction: the block is its residuals
+            values = np.clip(block_residuals, -16384, 16383)
+            output[base:base + BLOCK_SAMPLES] = values
+            old, older = int(values[-1]), int(values[-2])
+            continue
+        for i, residual in enumerate(block_residuals.tolist()):
+            value = residual + _predict(block_filter, old, older)
+            value = -16384 if value < -16384 else 16383 if value > 16383 else value
+            output[base + i] = value
+            older, old = old, value
+
+    pcm = (output << 1).astype(np.int16)
+    return pcm[:sample_count] if sample_count is not None else pcm
+
+def read_wav(path: Path) -> Tuple[np.ndarray, int]:
+    """Read a 16-bit WAV as mono int16 samples (stereo is averaged)."""
+    with wave.open(str(path), 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        channels = wav_file.getnchannels()
+        samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        sample_rate = wav_file.getframerate()
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, sample_rate
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int):
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+
+def save_brr(path: Path, samples: np.ndarray, sample_rate: int) -> int:
+    """Encode samples to a .brr file; returns the file size."""
+    payload = encode(samples)
+    with open(path, 'wb') as f:
+        f.write(BRR_HEADER.pack(BRR_MAGIC, BRR_VERSION, 0, sample_rate, len(samples)))
+        f.write(payload)
+    return BRR_HEADER.size + len(payload)
+
+def load_brr(path: Path) -> Tuple[np.ndarray, int]:
+    """Decode a .brr file to (int16 samples, sample rate)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, _, sample_rate, sample_count = BRR_HEADER.unpack_from(data)
+    if magic != BRR_MAGIC:
+        raise ValueError(f"{path}: not a BRR file")
+    if version != BRR_VERSION:
+        raise ValueError(f"{path}: unsupported BRR version {version}")
+    return decode(data[BRR_HEADER.size:], sample_count), sample_rate
+
+def snr_db(original: np.ndarray, decoded: np.ndarray) -> float:
+    """Signal-to-noise ratio of a decode, in dB."""
+    signal = np.asarray(original, dtype=np.float64)
+    noise = signal - np.asarray(decoded, dtype=np.float64)
+    noise_power = np.mean(noise ** 2)
+    if noise_power == 0:
+        return float('inf')
+    return 10 * np.log10(np.mean(signal ** 2) / noise_power + 1e-20)
+
+def compress_folder(folder: Path, out_dir: Path) -> Dict:
+    """Encode every WAV in a folder to BRR and report size, quality and timings."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    totals = {'wav_bytes': 0, 'brr_bytes': 0, 'encode_s': 0.0, 'decode_s': 0.0, 'wav_read_s': 0.0}
+    print(f"{'file':28s} {'WAV KB':>8s} {'BRR KB':>8s} {'ratio':>6s} {'SNR dB':>7s} "
+          f"{'encode ms':>10s} {'decode ms':>10s} {'WAV read ms':>12s}")
+    for wav_path in sorted(folder.glob('*.wav')):
+        started = time.perf_counter()
+        samples, sample_rate = read_wav(wav_path)
+        wav_read = time.perf_counter() - started
+
+        brr_path = out_dir / f"{wav_path.stem}.brr"
+        started = time.perf_counter()
+        brr_size = save_brr(brr_path, samples, sample_rate)
+        encode_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        decoded, _ = load_brr(brr_path)
+        decode_time = time.perf_counter() - started
+
+        wav_size = wav_path.stat().st_size
+        print(f"{wav_path.name:28s} {wav_size / 1024:8.1f} {brr_size / 1024:8.1f} {wav_size / brr_size:6.2f} "
+              f"{snr_db(samples, decoded):7.1f} {encode_time * 1000:10.1f} {decode_time * 1000:10.1f} "
+              f"{wav_read * 1000:12.2f}")
+        totals['wav_bytes'] += wav_size
+        totals['brr_bytes'] += brr_size
+        totals['encode_s'] += encode_time
+        totals['decode_s'] += decode_time
+        totals['wav_read_s'] += wav_read
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description='SNES-style BRR (4-bit ADPCM) encoder/decoder')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compress_parser = subparsers.add_parser('compress', help='Encode a folder of WAVs and report tradeoffs')
+    compress_parser.add_argument('folder', type=str, help='Folder of WAV files (e.g. ../../assets/audio/sfx)')
+    compress_parser.add_argument('--out', type=str, default='./brr', help='Output folder (default: ./brr)')
+
+    encode_parser = subparsers.add_parser('encode', help='Encode one WAV file')
+    encode_parser.add_argument('input', type=str)
+    encode_parser.add_argument('output', type=str, nargs='?')
+
+    decode_parser = subparsers.add_parser('decode', help='Decode one BRR file to WAV')
+    decode_parser.add_argument('input', type=str)
+    decode_parser.add_argument('output', type=str, nargs='?')
+
+    args = parser.parse_args()
+
+    if args.command == 'compress':
+        folder = Path(args.folder)
+        if not folder.is_dir():
+            print(f"❌ Directory not found: {folder}")
+            sys.exit(1)
+        totals = compress_folder(folder, Path(args.out))
+        if not totals['brr_bytes']:
+            print("❌ No WAV files found")
+            return
+        print(f"\n📦 {totals['wav_bytes'] / 1024:.1f} KB WAV -> {totals['brr_bytes'] / 1024:.1f} KB BRR "
+              f"({totals['wav_bytes'] / totals['brr_bytes']:.2f}x smaller)")
+        print(f"⏱️  Encode {totals['encode_s']:.2f}s, decode {totals['decode_s'] * 1000:.0f} ms, "
+              f"WAV read {totals['wav_read_s'] * 1000:.0f} ms")
+    elif args.command == 'encode':
+        output = args.output or os.path.splitext(args.input)[0] + '.brr'
+        samples, sample_rate = read_wav(Path(args.input))
+        size = save_brr(Path(output), samples, sample_rate)
+        print(f"✅ {output}: {size} bytes ({os.path.getsize(args.input) / size:.2f}x smaller)")
+    elif args.command == 'decode':
+        output = args.output or os.path.splitext(args.input)[0] + '.wav'
+        samples, sample_rate = load_brr(Path(args.input))
+        write_wav(Path(output), samples, sample_rate)
+        print(f"✅ {output}: {len(samples)} samples at {sample_rate} Hz")
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,58 @@
 """
 Character Sprite Extractor
 Extracts individual character sprites from spritesheets for use in the wedding game.
+
+Sprites can be cut from a known grid (extract_grid) or found automatically
+(auto / auto_batch): connected-component labelling over the alpha mask gives
+tight boxes and foot pivots, ordered by row bands from the projection profile.
+scipy.ndimage is used for labelling when installed; otherwise a NumPy
+run-length labeller does the same job.
 """
 
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
 import json
 
-def extract_character_grid(spritesheet_path, output_dir, grid_width, grid_height, sprite_width, sprite_height, character_names=None):
+try:
+    from scipy import ndimage
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+def _encode_png(job):
+    """Encode one cell to PNG (runs in a worker process)."""
+    cell, mode, palette, transparency, sprite_path, optimize, compress_level = job
+    sprite = Image.fromarray(cell, mode)
+    if palette is not None:
+        sprite.putpalette(palette)
+    if transparency is not None:
+        sprite.info['transparency'] = transparency
+    sprite.save(sprite_path, "PNG", optimize=optimize, compress_level=compress_level)
+    return os.path.getsize(sprite_path)
+
+def _cell_coverage(cells, mode, transparency):
+    """Count of visible pixels in each cell of a (rows, cols, h, w[, channels]) view."""
+    if mode in ('RGBA', 'LA', 'PA'):
+        return np.count_nonzero(cells[..., -1], axis=(2, 3))
+    if mode == 'P' and isinstance(transparency, int):
+        return np.count_nonzero(cells != transparency, axis=(2, 3))
+    # No transparency information: every cell counts as visible
+    return np.full(cells.shape[:2], cells.shape[2] * cells.shape[3])
+
+def extract_character_grid(spritesheet_path, output_dir, grid_width, grid_height, sprite_width, sprite_height,
+                           character_names=None, skip_empty=True, optimize=False, compress_level=6, workers=None):
     """
     Extract characters from a grid-based spritesheet.
     
+    The sheet is decoded once into a NumPy array and every cell is a view
+    into it, so slicing copies nothing. Cells with no visible pixels are
+    skipped (their indices stay reserved so names do not shift), and the
+    remaining cells are PNG-encoded across a process pool.
+    
     Args:
         spritesheet_path: Path to the source spritesheet
         output_dir: Directory to save extracted sprites
@@ -21,25 +62,48 @@ def extract_character_grid(spritesheet_path, output_dir, grid_width, grid_height
         sprite_width: Width of each sprite in pixels
         sprite_height: Height of each sprite in pixels
         character_names: Optional list of names for characters
+        skip_empty: Don't write fully transparent cells
+        optimize: Let the PNG encoder search for the smallest output
+        compress_level: zlib level 0-9 (ignored when optimize is set)
+        workers: Encoder processes (default: one per 32 cells, up to one per CPU; 1 encodes inline)
     """
+    timings = {}
     
-    # Load the spritesheet
+    # Load the spritesheet once
+    started = time.perf_counter()
     spritesheet = Image.open(spritesheet_path)
+    spritesheet.load()
+    mode = spritesheet.mode
+    palette = spritesheet.getpalette() if mode in ('P', 'PA') else None
+    transparency = spritesheet.info.get('transparency')
+    pixels = np.asarray(spritesheet)
+    timings['load'] = time.perf_counter() - started
     
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    extracted_sprites = []
+    # Slice every cell as a view: (rows, cols, sprite_height, sprite_width[, channels])
+    started = time.perf_counter()
+    grid_h, grid_w = grid_height * sprite_height, grid_width * sprite_width
+    if pixels.shape[0] < grid_h or pixels.shape[1] < grid_w:
+        # Cells past the edge are padded transparent, as Image.crop does
+        padding = [(0, max(0, grid_h - pixels.shape[0])), (0, max(0, grid_w - pixels.shape[1]))]
+        pixels = np.pad(pixels, padding + [(0, 0)] * (pixels.ndim - 2))
+    trailing = pixels.shape[2:]
+    cells = pixels[:grid_h, :grid_w].reshape(grid_height, sprite_height, grid_width, sprite_width, *trailing)
+    cells = cells.swapaxes(1, 2)
+    coverage = _cell_coverage(cells, mode, transparency)
+    timings['slice'] = time.perf_counter() - started
     
+    extracted_sprites = []
+    skipped = []
+    jobs = []
     for row in range(grid_height):
         for col in range(grid_width):
             # Calculate position
             x = col * sprite_width
             y = row * sprite_height
             
-            # Extract sprite
-            sprite = spritesheet.crop((x, y, x + sprite_width, y + sprite_height))
-            
             # Generate filename
             sprite_index = row * grid_width + col
             if character_names and sprite_index < len(character_names):
@@ -47,39 +111,295 @@ def extract_character_grid(spritesheet_path, output_dir, grid_width, grid_height
             else:
                 filename = f"character_{sprite_index:03d}.png"
             
-            # Save sprite
-            sprite_path = os.path.join(output_dir, filename)
-            sprite.save(sprite_path, "PNG")
+            if skip_empty and coverage[row, col] == 0:
+                skipped.append(sprite_index)
+                continue
             
+            sprite_path = os.path.join(output_dir, filename)
+            jobs.append((np.ascontiguousarray(cells[row, col]), mode, palette, transparency,
+                         sprite_path, optimize, compress_level))
             extracted_sprites.append({
                 "index": sprite_index,
                 "filename": filename,
                 "position": {"x": x, "y": y},
                 "size": {"width": sprite_width, "height": sprite_height}
             })
-            
-            print(f"Extracted: {filename}")
+    
+    # Encode the surviving cells
+    started = time.perf_counter()
+    if workers is None:
+        # Pool start-up costs more than encoding a few dozen small cells
+        workers = min(os.cpu_count() or 1, max(1, len(jobs) // 32))
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sizes = list(pool.map(_encode_png, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        sizes = [_encode_png(job) for job in jobs]
+    timings['encode'] = time.perf_counter() - started
+    
+    for sprite, size in zip(extracted_sprites, sizes):
+        sprite["bytes"] = size
+        print(f"Extracted: {sprite['filename']}")
     
     # Save extraction metadata
     metadata = {
         "source": spritesheet_path,
         "grid": {"width": grid_width, "height": grid_height},
         "sprite_size": {"width": sprite_width, "height": sprite_height},
-        "sprites": extracted_sprites
+        "sprites": extracted_sprites,
+        "skipped_empty": skipped
     }
     
     metadata_path = os.path.join(output_dir, "extraction_metadata.json")
     with open(metadata_path, 'w') as f:
         json.dump(metadata, f, indent=2)
     
-    print(f"Extracted {len(extracted_sprites)} sprites to {output_dir}")
+    print(f"Extracted {len(extracted_sprites)} sprites to {output_dir} "
+          f"({len(skipped)} empty cells skipped, {sum(sizes) / 1024:.1f} KB)")
+    print("Timing: " + ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timings.items()))
     return extracted_sprites
 
-def extract_characters_6():
+def opacity_mask(image, tolerance=16):
+    """Boolean (h, w) array of pixels that belong to a sprite.
+    
+    Uses the alpha channel or palette transparency when present; otherwise
+    treats the corner colour as the background if all four corners agree
+    (within ``tolerance`` per channel, for noisy or compressed backdrops).
+    """
+    transparency = image.info.get('transparency')
+    if image.mode in ('RGBA', 'LA', 'PA'):
+        return np.asarray(image)[..., -1] > 0
+    if image.mode == 'P' and isinstance(transparency, int):
+        return np.asarray(image) != transparency
+    pixels = np.asarray(image.convert('RGB')).astype(np.int16)
+    corners = pixels[[0, 0, -1, -1], [0, -1, 0, -1]]
+    background = np.median(corners, axis=0)
+    if (np.abs(corners - background) <= tolerance).all():
+        return (np.abs(pixels - background) > tolerance).any(axis=-1)
+    return np.ones(pixels.shape[:2], dtype=bool)
+
+def _dilate(mask, gap):
+    """Grow the mask by ``gap`` pixels in every direction (separable box dilation)."""
+    grown = mask.copy()
+    for _ in range(gap):
+        grown[1:] |= grown[:-1].copy()
+        grown[:-1] |= grown[1:].copy()
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+    return grown
+
+def _row_runs(mask):
+    """Horizontal runs of True pixels as (row, start, end) arrays, end exclusive, row-major."""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+def _label_runs(rows, starts, ends, height):
+    """Union-find over runs: runs in adjacent rows that touch (8-connected) share a label."""
+    parent = list(range(len(rows)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    row_first = np.searchsorted(rows, np.arange(height + 1)).tolist()
+    starts_list, ends_list = starts.tolist(), ends.tolist()
+    for y in range(1, height):
+        i, i_end = row_first[y - 1], row_first[y]
+        j, j_end = row_first[y], row_first[y + 1]
+        while i < i_end and j < j_end:
+            if starts_list[j] <= ends_list[i] and starts_list[i] <= ends_list[j]:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            if ends_list[i] < ends_list[j]:
+                i += 1
+            else:
+                j += 1
+    roots = np.array([find(i) for i in range(len(rows))], dtype=np.intp)
+    return np.unique(roots, return_inverse=True)[1]
+
+def label_components(mask, gap=1):
+    """Label sprites in a mask; pixels up to ``2 * gap`` empty pixels apart join one sprite.
+    
+    Both sides grow by ``gap``, so the grown masks touch (8-connected) when
+    pixels are within ``2 * gap + 1`` of each other along x and y. Returns (rows, starts, ends, labels): every run of sprite pixels and the
+    sprite it belongs to. Uses scipy.ndimage when available, otherwise a
+    run-length union-find in NumPy.
+    """
+    joined = _dilate(mask, gap) if gap else mask
+    rows, starts, ends = _row_runs(mask)
+    if not len(rows):
+        return rows, starts, ends, np.zeros(0, dtype=np.intp)
+    
+    if SCIPY_AVAILABLE:
+        label_image, _ = ndimage.label(joined, structure=np.ones((3, 3), dtype=bool))
+        return rows, starts, ends, label_image[rows, starts] - 1
+    
+    # Map each original run onto the joined run that contains it
+    joined_rows, joined_starts, joined_ends = _row_runs(joined)
+    joined_labels = _label_runs(joined_rows, joined_starts, joined_ends, mask.shape[0])
+    width = mask.shape[1] + 2
+    containing = np.searchsorted(joined_rows * width + joined_starts, rows * width + starts, side='right') - 1
+    labels = joined_labels[containing]
+    return rows, starts, ends, np.unique(labels, return_inverse=True)[1]
+
+def detect_sprites(mask, gap=1, min_pixels=4):
+    """Tight bounding boxes and foot pivots of every sprite in a mask, in reading order.
+    
+    Sprites are ordered by the horizontal band they sit in (bands are split
+    where the row projection profile is empty) and then left to right.
+    """
+    rows, starts, ends, labels = label_components(mask, gap)
+    if not len(labels):
+        return []
+    count = labels.max() + 1
+    lengths = ends - starts
+    
+    top = np.full(count, mask.shape[0])
+    np.minimum.at(top, labels, rows)
+    bottom = np.zeros(count, dtype=np.intp)
+    np.maximum.at(bottom, labels, rows)
+    left = np.full(count, mask.shape[1])
+    np.minimum.at(left, labels, starts)
+    right = np.zeros(count, dtype=np.intp)
+    np.maximum.at(right, labels, ends)
+    pixels = np.bincount(labels, weights=lengths, minlength=count)
+    
+    # Pivot: centre of the sprite's lowest row of pixels (its feet)
+    on_bottom = rows == bottom[labels]
+    foot_width = np.bincount(labels[on_bottom], weights=lengths[on_bottom], minlength=count)
+    foot_centre = np.bincount(labels[on_bottom], weights=(lengths * (starts + ends - 1) / 2)[on_bottom],
+                              minlength=count) / np.maximum(foot_width, 1)
+    
+    # Row bands from the row projection profile
+    profile = np.zeros(mask.shape[0] + 2, dtype=np.int8)
+    profile[1:-1] = mask.any(axis=1)
+    band_starts = np.flatnonzero(np.diff(profile) == 1)
+    band = np.searchsorted(band_starts, top, side='right') - 1
+    
+    sprites = []
+    for label in np.lexsort((left, band)):
+        if pixels[label] < min_pixels:
+            continue
+        x, y = int(left[label]), int(top[label])
+        sprites.append({
+            "box": {"x": x, "y": y, "width": int(right[label] - x), "height": int(bottom[label] + 1 - y)},
+            "pivot": {"x": round(float(foot_centre[label]) - x + 0.5, 1), "y": int(bottom[label] + 1 - y)},
+            "row": int(band[label]),
+            "pixels": int(pixels[label]),
+        })
+    return sprites
+
+def auto_extract(spritesheet_path, output_dir, gap=1, min_pixels=4, tolerance=16, write_sprites=True,
+                 optimize=False, compress_level=6, workers=1, verbose=True):
+    """Find every sprite on a sheet and save each tight box plus extraction_metadata.json."""
+    timings = {}
+    started = time.perf_counter()
+    spritesheet = Image.open(spritesheet_path)
+    spritesheet.load()
+    mode = spritesheet.mode
+    palette = spritesheet.getpalette() if mode in ('P', 'PA') else None
+    transparency = spritesheet.info.get('transparency')
+    pixels = np.asarray(spritesheet)
+    timings['load'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    sprites = detect_sprites(opacity_mask(spritesheet, tolerance), gap, min_pixels)
+    timings['detect'] = time.perf_counter() - started
+    
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(spritesheet_path))[0]
+    jobs = []
+    for index, sprite in enumerate(sprites):
+        sprite["index"] = index
+        sprite["filename"] = f"{stem}_{index:03d}.png"
+        box = sprite["box"]
+        if write_sprites:
+            cell = pixels[box["y"]:box["y"] + box["height"], box["x"]:box["x"] + box["width"]]
+            jobs.append((np.ascontiguousarray(cell), mode, palette, transparency,
+                         os.path.join(output_dir, sprite["filename"]), optimize, compress_level))
+    
+    started = time.perf_counter()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_encode_png, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        for job in jobs:
+            _encode_png(job)
+    timings['encode'] = time.perf_counter() - started
+    
+    metadata = {
+        "source": str(spritesheet_path),
+        "mode": "auto",
+        "sheet_size": {"width": spritesheet.width, "height": spritesheet.height},
+        "settings": {"gap": gap, "min_pixels": min_pixels, "tolerance": tolerance},
+        "sprites": sprites
+    }
+    with open(os.path.join(output_dir, "extraction_metadata.json"), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    if verbose:
+        rows = len({sprite["row"] for sprite in sprites})
+        print(f"Detected {len(sprites)} sprites in {rows} rows on {spritesheet_path}")
+        print("Timing: " + ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timings.items()))
+    return sprites
+
+def _auto_extract_job(job):
+    sheet_path, output_dir, write_sprites = job
+    try:
+        return sheet_path, len(auto_extract(sheet_path, output_dir, write_sprites=write_sprites, verbose=False)), None
+    except (OSError, ValueError) as e:
+        return sheet_path, 0, str(e)
+
+def auto_extract_batch(source_root, output_root, write_sprites=False, workers=None):
+    """Auto-segment every PNG under ``source_root``, one sheet per worker process.
+    
+    Results mirror the source tree under ``output_root``; by default only
+    the metadata is written so a whole download mirror can be indexed quickly.
+    """
+    jobs = []
+    for root, dirs, files in os.walk(source_root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in sorted(files):
+            if name.lower().endswith('.png'):
+                sheet_path = os.path.join(root, name)
+                relative = os.path.relpath(sheet_path, source_root)
+                jobs.append((sheet_path, os.path.join(output_root, os.path.splitext(relative)[0]), write_sprites))
+    
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    total = failed = 0
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_auto_extract_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_auto_extract_job(job) for job in jobs]
+    for sheet_path, count, error in results:
+        if error:
+            failed += 1
+            print(f"Skipped {sheet_path}: {error}")
+        total += count
+    elapsed = time.perf_counter() - started
+    print(f"Segmented {len(jobs) - failed} sheets into {total} sprites in {elapsed:.2f}s "
+          f"({len(jobs) / max(elapsed, 1e-9):.1f} sheets/s)")
+    return total
+
+def extract_characters_6(auto=False):
     """Extract characters from characters_6.png (CC0)"""
     source_path = "/home/joe/Documents/wedding-game-v7/assets/downloaded_opengameart/cc0/Unknown/characters_6.png"
     output_dir = "/home/joe/Documents/wedding-game-v7/assets/sprites/characters_cc0"
     
+    if auto:
+        # Detect each character's real box instead of assuming the grid below
+        auto_extract(source_path, output_dir)
+        return
+    
     # Based on the image, it appears to be a 4-row spritesheet with different character types
     # Each character appears to be about 24x32 pixels
     extract_character_grid(
@@ -91,11 +411,16 @@ def extract_characters_6():
         sprite_height=32
     )
 
-def extract_hyptosis_characters():
+def extract_hyptosis_characters(auto=False):
     """Extract characters from hyptosis spritesheet (CC-BY)"""
     source_path = "/home/joe/Documents/wedding-game-v7/assets/downloaded_opengameart/cc-by/Unknown/hyptosis_sprites-and-tiles-for-you.png"
     output_dir = "/home/joe/Documents/wedding-game-v7/assets/sprites/hyptosis_characters"
     
+    if auto:
+        # Every sprite and tile on the sheet, with tight boxes and pivots
+        auto_extract(source_path, output_dir)
+        return
+    
     # This spritesheet has mixed content, so we'll extract specific character regions
     # Bottom rows have character sprites - let's extract those
     spritesheet = Image.open(source_path)
@@ -172,20 +497,47 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python character_sprite_extractor.py <command>")
         print("Commands:")
-        print("  extract_cc0 - Extract characters from characters_6.png")
-        print("  extract_hyptosis - Extract characters from hyptosis spritesheet")
-        print("  extract_all - Extract from all sources")
+        print("  extract_cc0 [--auto] - Extract characters from characters_6.png")
+        print("  extract_hyptosis [--auto] - Extract characters from hyptosis spritesheet")
+        print("  extract_all [--auto] - Extract from all sources")
+        print("               (--auto detects sprite boxes instead of using the hardcoded grid/regions)")
+        print("  extract_grid <sheet> <output_dir> <cols> <rows> <sprite_w> <sprite_h> [--optimize] [--jobs=N] [--keep-empty]")
+        print("               - Extract any grid spritesheet")
+        print("  auto <sheet> <output_dir> [--gap=N] [--min-pixels=N] [--tolerance=N]")
+        print("               - Detect sprite boxes and pivots automatically")
+        print("  auto_batch <source_root> <output_root> [--jobs=N] [--write-sprites]")
+        print("               - Auto-detect every PNG under a folder (e.g. the download mirror)")
         sys.exit(1)
     
     command = sys.argv[1]
     
-    if command == "extract_cc0":
-        extract_characters_6()
+    if command == "extract_grid":
+        if len(sys.argv) < 8:
+            print("Usage: python character_sprite_extractor.py extract_grid <sheet> <output_dir> <cols> <rows> <sprite_w> <sprite_h>")
+            sys.exit(1)
+        flags = sys.argv[8:]
+        jobs = next((int(flag.split('=', 1)[1]) for flag in flags if flag.startswith('--jobs=')), None)
+        extract_character_grid(sys.argv[2], sys.argv[3], *map(int, sys.argv[4:8]),
+                               skip_empty='--keep-empty' not in flags, optimize='--optimize' in flags, workers=jobs)
+    elif command in ("auto", "auto_batch"):
+        if len(sys.argv) < 4:
+            print(f"Usage: python character_sprite_extractor.py {command} <source> <output>")
+            sys.exit(1)
+        flags = dict(flag.lstrip('-').split('=', 1) if '=' in flag else (flag.lstrip('-'), '1')
+                     for flag in sys.argv[4:])
+        if command == "auto":
+            auto_extract(sys.argv[2], sys.argv[3], gap=int(flags.get('gap', 1)),
+                         min_pixels=int(flags.get('min-pixels', 4)), tolerance=int(flags.get('tolerance', 16)))
+        else:
+            auto_extract_batch(sys.argv[2], sys.argv[3], write_sprites='write-sprites' in flags,
+                               workers=int(flags['jobs']) if 'jobs' in flags else None)
+    elif command == "extract_cc0":
+        extract_characters_6(auto='--auto' in sys.argv)
     elif command == "extract_hyptosis":
-        extract_hyptosis_characters()
+        extract_hyptosis_characters(auto='--auto' in sys.argv)
     elif command == "extract_all":
-        extract_characters_6()
-        extract_hyptosis_characters()
+        extract_characters_6(auto='--auto' in sys.argv)
+        extract_hyptosis_characters(auto='--auto' in sys.argv)
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
\ No newline at end of file
@@ -1,68 +1,68 @@
 #!/usr/bin/env python3
 """
 Create debug package for playtesting by packaging the project files
+
+Files are streamed straight from the project into the ZIP in one walk, with
+excludes applied during the walk; no staging copy is made, so the archive is
+the only thing written to disk. --compare times this against the old
+copy-to-staging method.
 """
 
 import os
+import time
 import shutil
+import fnmatch
 import zipfile
+import argparse
 from pathlib import Path
 from datetime import datetime
 
-def create_debug_package(project_root, output_dir):
-    """Create a debug package of the wedding game project"""
-    
-    # Create timestamp for build
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    package_name = f"wedding-game-debug_{timestamp}"
-    package_dir = os.path.join(output_dir, package_name)
-    
-    print(f"Creating debug package: {package_name}")
-    
-    # Create package directory
-    os.makedirs(package_dir, exist_ok=True)
-    
-    # Files and directories to include
-    include_patterns = [
-        "project.godot",
-        "scenes/",
-        "scripts/",
-        "assets/",
-        "addons/",
-        "export_presets.cfg",
-        "icon.svg"
-    ]
-    
-    # Files to exclude
-    exclude_patterns = [
-        "__pycache__",
-        ".git",
-        ".godot",
-        "builds/",
-        ".tmp",
-        "*.log",
-        "*.tmp"
-    ]
-    
-    # Copy project files
-    for pattern in include_patterns:
+# Files and directories to include
+INCLUDE_PATTERNS = [
+    "project.godot",
+    "scenes/",
+    "scripts/",
+    "assets/",
+    "addons/",
+    "export_presets.cfg",
+    "icon.svg"
+]
+
+# Files to exclude (matched against each file and directory name, like shutil.ignore_patterns)
+EXCLUDE_PATTERNS = [
+    "__pycache__",
+    ".git",
+    ".godot",
+    "builds/",
+    ".tmp",
+    "*.log",
+    "*.tmp"
+]
+
+# Already-compressed formats are stored as-is; deflating them costs time for no gain
+STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.ogg', '.mp3', '.zip', '.gz', '.ctex'}
+
+def _excluded(name):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDE_PATTERNS)
+
+def iter_package_files(project_root):
+    """Yield (file path, archive path) for every file the package includes, in one walk."""
+    for pattern in INCLUDE_PATTERNS:
         source_path = os.path.join(project_root, pattern)
-        dest_path = os.path.join(package_dir, pattern)
-        
-        if os.path.exists(source_path):
-            if os.path.isfile(source_path):
-                # Copy file
-                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                shutil.copy2(source_path, dest_path)
-                print(f"  Copied file: {pattern}")
-            elif os.path.isdir(source_path):
-                # Copy directory
-                shutil.copytree(source_path, dest_path, 
-                              ignore=shutil.ignore_patterns(*exclude_patterns))
-                print(f"  Copied directory: {pattern}")
-    
-    # Create instructions file
-    instructions = """# Wedding Game Debug Build - Testing Instructions
+        if os.path.isfile(source_path):
+            yield source_path, pattern
+        elif os.path.isdir(source_path):
+            for root, dirs, files in os.walk(source_path, followlinks=True):
+                # Pruning dirs in place stops the walk from entering excluded folders
+                dirs[:] = sorted(d for d in dirs if not _excluded(d))
+                for file in sorted(files):
+                    if not _excluded(file):
+                        file_path = os.path.join(root, file)
+                        yield file_path, os.path.relpath(file_path, project_root)
+
+def testing_instructions():
+    """Contents of TESTING_INSTRUCTIONS.txt"""
+    return """# Wedding Game Debug Build - Testing Instructions
 
 ## System Requirements
 - Godot Engine 4.4+ (Download from https://godotengine.org/)
@@ -130,6 +130,73 @@ If you encounter crashes or technical problems:
 Thank you for helping test the Wedding Game!
 Generated: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """
 """
+
+def create_debug_package(project_root, output_dir):
+    """Create a debug package of the wedding game project, streaming files straight into the ZIP"""
+    
+    # Create timestamp for build
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    package_name = f"wedding-game-debug_{timestamp}"
+    zip_path = os.path.join(output_dir, f"{package_name}.zip")
+    partial_path = zip_path + ".partial"
+    
+    print(f"Creating debug package: {package_name}")
+    
+    file_count = 0
+    with zipfile.ZipFile(partial_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_path, arc_path in iter_package_files(project_root):
+            stored = os.path.splitext(file_path)[1].lower() in STORED_EXTENSIONS
+            zipf.write(file_path, arc_path, compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+            file_count += 1
+        zipf.writestr("TESTING_INSTRUCTIONS.txt", testing_instructions())
+    # Only a complete archive gets the final name
+    os.replace(partial_path, zip_path)
+    
+    # Calculate package size
+    package_size = os.path.getsize(zip_path) / (1024 * 1024)
+    
+    print(f"Debug package created successfully!")
+    print(f"Package: {zip_path}")
+    print(f"Files: {file_count + 1}")
+    print(f"Size: {package_size:.1f} MB")
+    
+    return zip_path
+
+def create_debug_package_staged(project_root, output_dir, package_name=None):
+    """Original method: copy into a staging folder, zip it, delete it (kept for --compare)"""
+    
+    # Create timestamp for build
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    package_name = package_name or f"wedding-game-debug_{timestamp}"
+    package_dir = os.path.join(output_dir, package_name)
+    
+    print(f"Creating debug package: {package_name}")
+    
+    # Create package directory
+    os.makedirs(package_dir, exist_ok=True)
+    
+    include_patterns = INCLUDE_PATTERNS
+    exclude_patterns = EXCLUDE_PATTERNS
+    
+    # Copy project files
+    for pattern in include_patterns:
+        source_path = os.path.join(project_root, pattern)
+        dest_path = os.path.join(package_dir, pattern)
+        
+        if os.path.exists(source_path):
+            if os.path.isfile(source_path):
+                # Copy file
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                shutil.copy2(source_path, dest_path)
+                print(f"  Copied file: {pattern}")
+            elif os.path.isdir(source_path):
+                # Copy directory
+                shutil.copytree(source_path, dest_path, 
+                              ignore=shutil.ignore_patterns(*exclude_patterns))
+                print(f"  Copied directory: {pattern}")
+    
+    # Create instructions file
+    instructions = testing_instructions()
     
     with open(os.path.join(package_dir, "TESTING_INSTRUCTIONS.txt"), "w") as f:
         f.write(instructions)
@@ -155,13 +222,59 @@ Generated: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """
     
     return zip_path
 
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, file)) for root, _, files in os.walk(path) for file in files)
+
+def compare_methods(project_root, output_dir):
+    """Time the streaming package against the staged one and check both hold the same files."""
+    print("⏱️  Comparing streaming and staged packaging")
+    
+    start = time.perf_counter()
+    staged_path = create_debug_package_staged(project_root, output_dir, "wedding-game-debug_staged")
+    staged_time = time.perf_counter() - start
+    # The staged method's peak disk use is its staging copy plus the archive
+    staging_size = sum(os.path.getsize(file_path) for file_path, _ in iter_package_files(project_root))
+    
+    start = time.perf_counter()
+    streamed_path = create_debug_package(project_root, output_dir)
+    streamed_time = time.perf_counter() - start
+    
+    with zipfile.ZipFile(staged_path) as staged, zipfile.ZipFile(streamed_path) as streamed:
+        # Instructions carry a generation timestamp, so compare everything else by CRC
+        staged_files = {info.filename: info.CRC for info in staged.infolist() if info.filename != "TESTING_INSTRUCTIONS.txt"}
+        streamed_files = {info.filename: info.CRC for info in streamed.infolist() if info.filename != "TESTING_INSTRUCTIONS.txt"}
+    same = staged_files == streamed_files
+    
+    staged_size = os.path.getsize(staged_path)
+    streamed_size = os.path.getsize(streamed_path)
+    print(f"\n  staged:    {staged_time:.2f}s, peak disk {(staging_size + staged_size) / (1024 * 1024):.1f} MB")
+    print(f"  streaming: {streamed_time:.2f}s, peak disk {streamed_size / (1024 * 1024):.1f} MB")
+    print(f"  speedup:   {staged_time / streamed_time:.2f}x")
+    print(f"  {'✅ same' if same else '❌ different'} contents ({len(streamed_files)} files)")
+    
+    os.remove(staged_path)
+    os.remove(streamed_path)
+    return same
+
 def main():
-    project_root = "/home/joe/Documents/wedding-game-v7"
-    output_dir = os.path.join(project_root, "builds", "debug")
+    parser = argparse.ArgumentParser(description='Create a debug package for playtesting')
+    parser.add_argument('--project-root', default="/home/joe/Documents/wedding-game-v7",
+                        help='Godot project to package')
+    parser.add_argument('--output-dir', help='Where to write the ZIP (default: <project-root>/builds/debug)')
+    parser.add_argument('--compare', action='store_true',
+                        help='Time streaming against the old staged method and verify identical contents')
+    args = parser.parse_args()
+    
+    project_root = args.project_root
+    output_dir = args.output_dir or os.path.join(project_root, "builds", "debug")
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
+    if args.compare:
+        compare_methods(project_root, output_dir)
+        return
+    
     # Create debug package
     package_path = create_debug_package(project_root, output_dir)
     
@@ -4,28 +4,13 @@ Create walking spritesheet from individual character sprite
 """
 
 import os
-from PIL import Image
+from walk_cycle import build_walk_sheets
 
 def create_walking_spritesheet(character_sprite_path, output_path, sprite_width=24, sprite_height=32):
     """
-    Create a walking spritesheet from a single character sprite by duplicating it in 4 frames
+    Create a 4-frame walking spritesheet (contact, squash, bob, squash) from a single character sprite
     """
-    # Load the source character sprite
-    char_sprite = Image.open(character_sprite_path)
-    
-    # Create a new image for the spritesheet (4 frames wide)
-    spritesheet_width = sprite_width * 4
-    spritesheet_height = sprite_height
-    spritesheet = Image.new('RGBA', (spritesheet_width, spritesheet_height), (0, 0, 0, 0))
-    
-    # Place the character sprite 4 times (basic walking cycle)
-    for i in range(4):
-        x_offset = i * sprite_width
-        spritesheet.paste(char_sprite, (x_offset, 0))
-    
-    # Save the spritesheet
-    spritesheet.save(output_path)
-    print(f"Created walking spritesheet: {output_path}")
+    build_walk_sheets({output_path: character_sprite_path}, (sprite_width, sprite_height), workers=1)
 
 def main():
     project_root = "/home/joe/Documents/wedding-game-v7"
@@ -45,15 +30,9 @@ def main():
         "quinn_spritesheet.png": "character_016.png",  # Character for Quinn
     }
     
-    # Create walking spritesheets for each character
-    for placeholder_name, character_file in character_mappings.items():
-        character_sprite_path = os.path.join(characters_path, character_file)
-        output_path = os.path.join(placeholders_path, placeholder_name)
-        
-        if os.path.exists(character_sprite_path):
-            create_walking_spritesheet(character_sprite_path, output_path)
-        else:
-            print(f"Warning: Character sprite not found: {character_sprite_path}")
+    # Create walking spritesheets for all characters in one batch
+    build_walk_sheets({os.path.join(placeholders_path, placeholder_name): os.path.join(characters_path, character_file)
+                       for placeholder_name, character_file in character_mappings.items()})
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
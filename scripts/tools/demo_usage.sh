@@ -31,7 +31,7 @@ echo "   ├── cc-by/            # Attribution required"
 echo "   ├── cc-by-sa/         # Attribution + share-alike"
 echo "   ├── gpl/              # GPL licensed"
 echo "   ├── other/            # Other licenses"
-echo "   ├── download_log.json # Resume capability"
+echo "   ├── catalog.sqlite    # Items, files and resume state"
 echo "   └── download_summary.md # Usage report"
 echo ""
 
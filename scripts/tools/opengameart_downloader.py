@@ -4,10 +4,17 @@ OpenGameArt.org 2D Art Downloader
 Downloads 2D art assets from OpenGameArt.org with proper rate limiting and error handling.
 
 Usage:
-    python opengameart_downloader.py [--max-pages=5] [--delay=2] [--output-dir=./downloaded_art]
+    python opengameart_downloader.py [--max-pages=5] [--delay=2] [--output-dir=./downloaded_art] [--concurrency=4]
+    python opengameart_downloader.py --benchmark-parsers=<dir of saved .html pages>
 
 Features:
 - Respects robots.txt and implements rate limiting
+- Per-host politeness scheduling with concurrent page and file fetches
+- On-disk HTTP cache with ETag/Last-Modified revalidation for pages
+- Byte-range resumable file transfers verified by length and SHA-256
+- Optional content-addressed blob store so identical files are stored once
+- Fast lxml/XPath extraction backend (--parser=lxml)
+- SQLite catalog (catalog.sqlite) of items, files, hashes and crawl state
 - Downloads with proper attribution information
 - Organizes files by license type
 - Resumes interrupted downloads
@@ -15,26 +22,222 @@ Features:
 """
 
 import requests
+import sys
 import time
 import os
 import json
 import re
 import argparse
+import base64
+import shutil
+import tempfile
+import threading
+import contextlib
+import io
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from bs4 import BeautifulSoup
 import hashlib
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from art_catalog import ArtCatalog
+from blob_store import BlobStore
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+ART_FILE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.zip', '.tar.gz']
+
+if LXML_AVAILABLE:
+    def _has_class(name: str) -> str:
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+    
+    # Compiled once; each list mirrors a find(...) or find(...) chain in extract_art_info
+    _XP_TITLE = [etree.XPath(f"(//h1[{_has_class('title')}])[1]"), etree.XPath("(//h1)[1]")]
+    _XP_BODY = [etree.XPath(f"(//div[{_has_class('field-name-body')}])[1]"),
+                etree.XPath(f"(//div[{_has_class('content')}])[1]")]
+    _XP_USERNAME = [etree.XPath(f"(//span[{_has_class('username')}])[1]")]
+    _XP_LICENSE = [etree.XPath(f"(//div[{_has_class('field-name-field-art-licenses')}])[1]")]
+    _XP_ATTACHMENTS = etree.XPath(f"//div[{_has_class('field-name-field-art-attach')}]//a[@href]")
+    _XP_LINKS = etree.XPath("//a[@href]")
+
+# Adaptive read sizes for file transfers: grow while reads return quickly,
+# shrink when the connection is slow so progress is flushed to disk often.
+MIN_CHUNK_SIZE = 16 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+# Saved search and item pages used by --benchmark-parsers
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures' / 'opengameart'
+
+class HostRateLimiter:
+    """Token-bucket politeness scheduler with one bucket per host.
+
+    Each host refills at one token every ``delay`` seconds and holds at most
+    ``burst`` tokens. Callers reserve a token before every request and sleep
+    outside the lock, so waiting on one host never blocks requests to another.
+    """
+
+    def __init__(self, delay: float, burst: int = 1):
+        self.delay = delay
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}  # host -> [tokens, last_refill]
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Block until a request to the host of ``url`` is allowed."""
+        if self.delay <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [float(self.burst), now])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) / self.delay)
+            bucket[1] = now
+            bucket[0] -= 1  # Reserve a slot; a negative balance is our queue position
+            wait = -bucket[0] * self.delay if bucket[0] < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+class HTTPCache:
+    """On-disk page cache keyed by URL with conditional revalidation.
+
+    Bodies live in ``<cache_dir>/<sha256(url)>.html`` next to an ``index.json``
+    holding validators (ETag/Last-Modified), store time and last access time.
+    Entries younger than ``ttl`` seconds are served without a request; older
+    ones are revalidated with If-None-Match/If-Modified-Since. The cache is
+    kept under ``max_bytes`` by evicting least recently used entries.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 6 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / "index.json"
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        # Drop entries whose body went missing
+        self.entries = {url: e for url, e in self.entries.items() if self._body_path(url).exists()}
+        self.total_bytes = sum(e['size'] for e in self.entries.values())
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the index entry for ``url`` (or None) and mark it recently used."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry['last_access'] = time.time()
+            return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def validators(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Conditional request headers for a stale entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, url: str) -> Optional[bytes]:
+        """Cached body, or None if another thread evicted it meanwhile."""
+        try:
+            return self._body_path(url).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def refresh(self, url: str, headers) -> Optional[bytes]:
+        """Handle a 304: restart the TTL clock and return the cached body."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            entry['stored_at'] = time.time()
+            entry['etag'] = headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = headers.get('Last-Modified', entry.get('last_modified'))
+        return self.read(url)
+
+    def store(self, url: str, body: bytes, headers):
+        """Save a 200 response body and its validators, evicting LRU entries if needed."""
+        self._body_path(url).write_bytes(body)
+        now = time.time()
+        with self._lock:
+            old = self.entries.get(url)
+            if old:
+                self.total_bytes -= old['size']
+            self.entries[url] = {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'stored_at': now,
+                'last_access': now,
+                'size': len(body),
+            }
+            self.total_bytes += len(body)
+            self._evict()
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for url in sorted(self.entries, key=lambda u: self.entries[u]['last_access']):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.total_bytes -= self.entries.pop(url)['size']
+            self._body_path(url).unlink(missing_ok=True)
+            self.stats['evictions'] += 1
+
+    def record(self, stat: str, saved_bytes: int = 0):
+        with self._lock:
+            self.stats[stat] += 1
+            self.stats['bytes_saved'] += saved_bytes
+
+    def save(self):
+        """Persist the index (bodies are written as they are stored)."""
+        with self._lock:
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_file, self.index_file)
 
 class OpenGameArtDownloader:
-    def __init__(self, output_dir: str = "./downloaded_art", delay: float = 2.0):
-        self.base_url = "https://opengameart.org"
+    def __init__(self, output_dir: str = "./downloaded_art", delay: float = 2.0,
+                 concurrency: int = 1, base_url: str = "https://opengameart.org",
+                 cache_ttl: Optional[float] = 6 * 3600, cache_max_bytes: int = 256 * 1024 * 1024,
+                 blob_store: Optional[str] = None, parser: str = 'html.parser'):
+        self.base_url = base_url.rstrip('/')
         self.output_dir = Path(output_dir)
-        self.delay = delay  # Seconds between requests
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.delay = delay  # Seconds between requests to the same host
+        self.concurrency = max(1, concurrency)
+        if parser == 'lxml' and not LXML_AVAILABLE:
+            raise ImportError("The lxml parser needs lxml: pip install -r requirements.txt")
+        self.parser = parser  # 'html.parser' (BeautifulSoup) or 'lxml' (compiled XPath)
+        self.headers = {
             'User-Agent': 'OpenGameArt Downloader (Educational/Game Development Use)'
-        })
+        }
+        self.rate_limiter = HostRateLimiter(delay)
+        self._local = threading.local()  # requests.Session is not thread-safe
+        self._lock = threading.Lock()
+        self._file_pool: Optional[ThreadPoolExecutor] = None  # Set while crawling
+        self._claimed_items: set = set()  # Art URLs already picked up by a worker this run
+        self.request_count = 0  # HTTP requests issued this run
         
         # Create output directory structure
         self.output_dir.mkdir(exist_ok=True)
@@ -45,22 +248,52 @@ class OpenGameArtDownloader:
         (self.output_dir / "gpl").mkdir(exist_ok=True)
         (self.output_dir / "other").mkdir(exist_ok=True)
         
+        # Page cache for cheap incremental re-runs (cache_ttl=None disables it)
+        self.cache = None
+        if cache_ttl is not None:
+            self.cache = HTTPCache(self.output_dir / "metadata" / "http_cache", cache_ttl, cache_max_bytes)
+        
+        # Deduplicate downloaded files through a shared content-addressed store
+        self.blob_store = BlobStore(blob_store) if blob_store else None
+        if self.blob_store and not self.blob_store.can_link(self.output_dir):
+            print(f"⚠️  Blob store {self.blob_store.root} is on a different filesystem than {self.output_dir}; "
+                  f"downloads will not be deduplicated")
+            self.blob_store = None
+        
+        # Catalog of items and files; imports download_log.json on first use
+        self.catalog = ArtCatalog(self.output_dir / "catalog.sqlite")
+        self.catalog.import_existing(self.output_dir)
+        
         # Load existing downloads to resume
         self.downloaded_items = self.load_download_log()
         
     def load_download_log(self) -> set:
         """Load list of already downloaded items to avoid duplicates."""
-        log_file = self.output_dir / "download_log.json"
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                return set(json.load(f))
-        return set()
-    
-    def save_download_log(self):
-        """Save list of downloaded items."""
-        log_file = self.output_dir / "download_log.json"
-        with open(log_file, 'w') as f:
-            json.dump(list(self.downloaded_items), f)
+        return self.catalog.downloaded_urls()
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session owned by the calling thread."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+    
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        """GET a URL once the per-host politeness budget allows it."""
+        self.rate_limiter.acquire(url)
+        with self._lock:
+            self.request_count += 1
+        kwargs.setdefault('timeout', 30)
+        return self.session.get(url, **kwargs)
+    
+    def _write_metadata(self, metadata_file: Path, art_info: Dict, file_checksums: Dict):
+        """Write an item's metadata.json including verified file sizes and hashes."""
+        metadata = dict(art_info, file_checksums=file_checksums)
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
     
     def get_license_folder(self, license_info: str) -> str:
         """Determine which folder to use based on license."""
@@ -83,27 +316,158 @@ class OpenGameArtDownloader:
         filename = re.sub(r'\s+', '_', filename)
         return filename[:100]  # Limit length
     
-    def download_file(self, url: str, filepath: Path) -> bool:
-        """Download a single file with error handling."""
+    def download_file(self, url: str, filepath: Path, restarted: bool = False) -> Optional[Dict]:
+        """Download a single file resumably, returning its size and SHA-256.
+        
+        Bytes are written to ``<name>.part``. An interrupted transfer resumes
+        from what is already on disk with a Range request, guarded by If-Range
+        so a file that changed upstream restarts cleanly; without a recorded
+        ETag or Last-Modified to send as If-Range it restarts from byte 0. The
+        file is renamed into place only after its length matches the server's
+        and its SHA-256 matches any digest the server advertises.
+        """
+        part_path = filepath.with_name(filepath.name + '.part')
+        state_path = filepath.with_name(filepath.name + '.part.json')
         try:
-            response = self.session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            state = {}
+            if offset and state_path.exists():
+                with open(state_path, 'r') as f:
+                    state = json.load(f)
+                if state.get('url') != url:
+                    state = {}
+            if not state.get('validator'):
+                # No way to tell the server which version the bytes came from
+                offset = 0
+            
+            headers = {'Accept-Encoding': 'identity'}  # Keep byte offsets meaningful
+            if offset:
+                headers['Range'] = f'bytes={offset}-'
+                headers['If-Range'] = state['validator']
             
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            response = self.http_get(url, stream=True, headers=headers)
+            hasher = hashlib.sha256()
+            if response.status_code == 416 and offset:
+                # Nothing left to fetch if the .part already holds every byte
+                total = self._content_range_total(response.headers)
+                response.close()
+                if total != offset:
+                    part_path.unlink()
+                    raise IOError(f"server rejected resume at byte {offset}")
+                self._hash_file(part_path, hasher)
+            else:
+                response.raise_for_status()
+                content_range = response.headers.get('Content-Range', '')
+                if response.status_code == 206 and not content_range.startswith(f'bytes {offset}-'):
+                    # A range we did not ask for: never save it as the file (or append it)
+                    response.close()
+                    part_path.unlink(missing_ok=True)
+                    state_path.unlink(missing_ok=True)
+                    if restarted:
+                        raise IOError(f"server sent range '{content_range}' for a request from byte {offset}")
+                    print(f"  ↺ Server sent range '{content_range}' instead of byte {offset}: restarting {filepath.name}")
+                    return self.download_file(url, filepath, restarted=True)
+                if response.status_code == 206:
+                    total = self._content_range_total(response.headers)
+                    if offset:
+                        self._detach(part_path)
+                        self._hash_file(part_path, hasher)
+                    mode = 'ab'
+                else:
+                    # Full 200 body: either a fresh download or the server ignored the range
+                    offset = 0
+                    total = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+                    mode = 'wb'
+                    # A fresh inode, so truncating never reaches a linked blob
+                    part_path.unlink(missing_ok=True)
+                
+                with open(state_path, 'w') as f:
+                    json.dump({'url': url, 'validator': response.headers.get('ETag') or response.headers.get('Last-Modified')}, f)
+                with open(part_path, mode) as f:
+                    self._stream_to_file(response, f, hasher)
             
-            print(f"  ✓ Downloaded: {filepath.name}")
-            return True
+            # Verify before the atomic rename into place
+            size = part_path.stat().st_size
+            if total is not None and size != total:
+                raise IOError(f"incomplete transfer: {size} of {total} bytes")
+            digest = hasher.hexdigest()
+            expected = self._advertised_sha256(response.headers)
+            if expected and expected != digest:
+                part_path.unlink()
+                raise IOError("checksum mismatch")
+            
+            os.replace(part_path, filepath)
+            state_path.unlink(missing_ok=True)
+            
+            resumed = f" (resumed at {offset} bytes)" if offset else ""
+            print(f"  ✓ Downloaded: {filepath.name}{resumed}")
+            return {'size': size, 'sha256': digest}
             
         except Exception as e:
             print(f"  ✗ Failed to download {url}: {e}")
-            if filepath.exists():
-                filepath.unlink()  # Remove partial file
-            return False
+            return None  # Any partial data stays in the .part file for the next run
+    
+    def _detach(self, part_path: Path):
+        """Give ``part_path`` its own inode before appending to it.
+        
+        A file renamed to ``.part`` may still be a hardlink or symlink into the
+        blob store; appending in place would corrupt the shared blob and every
+        other folder linked to it.
+        """
+        if part_path.is_symlink() or part_path.stat().st_nlink > 1:
+            tmp_path = part_path.with_name(part_path.name + '.tmp')
+            shutil.copyfile(part_path, tmp_path)
+            os.replace(tmp_path, part_path)
+    
+    def _stream_to_file(self, response: requests.Response, f, hasher):
+        """Copy a streamed body to ``f`` with adaptively sized reads."""
+        chunk_size = 64 * 1024
+        while True:
+            started = time.monotonic()
+            chunk = response.raw.read(chunk_size, decode_content=True)
+            if not chunk:
+                break
+            f.write(chunk)
+            hasher.update(chunk)
+            elapsed = time.monotonic() - started
+            if elapsed < 0.05 and chunk_size < MAX_CHUNK_SIZE:
+                chunk_size *= 2
+            elif elapsed > 0.5 and chunk_size > MIN_CHUNK_SIZE:
+                chunk_size //= 2
+    
+    def _hash_file(self, filepath: Path, hasher):
+        """Feed the bytes already on disk into ``hasher``."""
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b''):
+                hasher.update(block)
+    
+    def _content_range_total(self, headers) -> Optional[int]:
+        """Total length from a ``Content-Range: bytes a-b/total`` header."""
+        total = headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    
+    def _advertised_sha256(self, headers) -> Optional[str]:
+        """Hex SHA-256 from a Digest or Repr-Digest header, if the server sends one."""
+        for header in ('Repr-Digest', 'Digest'):
+            for item in headers.get(header, '').split(','):
+                algorithm, _, value = item.strip().partition('=')
+                if algorithm.lower() == 'sha-256' and value:
+                    try:
+                        return base64.b64decode(value.strip(':')).hex()
+                    except ValueError:
+                        return None
+        return None
     
-    def extract_art_info(self, soup: BeautifulSoup, art_url: str) -> Optional[Dict]:
+    def parse_document(self, body: bytes) -> Any:
+        """Parse an HTML page with the configured backend."""
+        if self.parser == 'lxml':
+            return lxml.html.document_fromstring(body)
+        return BeautifulSoup(body, 'html.parser')
+    
+    def extract_art_info(self, soup: Any, art_url: str) -> Optional[Dict]:
         """Extract art information from the art page."""
+        if not isinstance(soup, BeautifulSoup):
+            return self._extract_art_info_lxml(soup, art_url)
         try:
             # Get title
             title_elem = soup.find('h1', class_='title') or soup.find('h1')
@@ -127,7 +491,7 @@ class OpenGameArtDownloader:
             # Look for direct download links
             for link in soup.find_all('a', href=True):
                 href = link['href']
-                if any(ext in href.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.zip', '.tar.gz']):
+                if any(ext in href.lower() for ext in ART_FILE_EXTENSIONS):
                     if not href.startswith('http'):
                         href = urljoin(self.base_url, href)
                     download_links.append(href)
@@ -155,6 +519,51 @@ class OpenGameArtDownloader:
             print(f"  ✗ Error extracting info: {e}")
             return None
     
+    def _extract_art_info_lxml(self, root, art_url: str) -> Optional[Dict]:
+        """lxml version of extract_art_info: compiled XPath plus one pass over links."""
+        try:
+            def first_text(xpaths) -> Optional[str]:
+                # Same preference order as the find(...) or find(...) chains
+                for xpath in xpaths:
+                    found = xpath(root)
+                    if found:
+                        return found[0].text_content().strip()
+                return None
+            
+            title = first_text(_XP_TITLE) or "Unknown"
+            description = first_text(_XP_BODY) or ""
+            author = first_text(_XP_USERNAME)
+            license_info = first_text(_XP_LICENSE)
+            
+            # Single pass over every link: file links plus author/license fallbacks
+            download_links = []
+            for link in _XP_LINKS(root):
+                href = link.get('href')
+                href_lower = href.lower()
+                if author is None and '/users/' in href:
+                    author = link.text_content().strip()
+                if license_info is None and 'license' in href:
+                    license_info = link.text_content().strip()
+                if any(ext in href_lower for ext in ART_FILE_EXTENSIONS):
+                    download_links.append(href if href.startswith('http') else urljoin(self.base_url, href))
+            
+            for link in _XP_ATTACHMENTS(root):
+                href = link.get('href')
+                download_links.append(href if href.startswith('http') else urljoin(self.base_url, href))
+            
+            return {
+                'title': title,
+                'description': description,
+                'author': author or "Unknown",
+                'license': license_info or "Unknown",
+                'url': art_url,
+                'download_links': list(set(download_links))  # Remove duplicates
+            }
+            
+        except Exception as e:
+            print(f"  ✗ Error extracting info: {e}")
+            return None
+    
     def download_art_item(self, art_info: Dict) -> bool:
         """Download all files for a single art item."""
         if not art_info['download_links']:
@@ -169,13 +578,21 @@ class OpenGameArtDownloader:
         item_folder = self.output_dir / license_folder / safe_title
         item_folder.mkdir(exist_ok=True)
         
-        # Save metadata
+        # Load checksums recorded by earlier runs, then save metadata
         metadata_file = item_folder / "metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(art_info, f, indent=2, ensure_ascii=False)
+        file_checksums = {}
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    file_checksums = json.load(f).get('file_checksums', {})
+            except (OSError, ValueError):
+                pass
+        file_checksums.update(self.catalog.file_checksums(art_info['url']))
+        self._write_metadata(metadata_file, art_info, file_checksums)
         
         # Download files
         success_count = 0
+        futures = {}
         for i, download_url in enumerate(art_info['download_links']):
             try:
                 # Get filename from URL
@@ -186,51 +603,153 @@ class OpenGameArtDownloader:
                 
                 filepath = item_folder / filename
                 
-                # Skip if already exists and is valid
-                if filepath.exists() and filepath.stat().st_size > 0:
-                    print(f"  ↻ Already exists: {filename}")
-                    success_count += 1
-                    continue
-                
-                # Download file
-                if self.download_file(download_url, filepath):
-                    success_count += 1
+                # Skip only files whose size matches a verified download
+                if filepath.exists():
+                    record = file_checksums.get(filename)
+                    if record and filepath.stat().st_size == record['size']:
+                        print(f"  ↻ Already exists: {filename}")
+                        success_count += 1
+                        continue
+                    # Unverified or truncated: hand it over as a partial transfer;
+                    # download_file breaks any blob link and only resumes with a validator
+                    os.replace(filepath, filepath.with_name(filename + '.part'))
                 
-                # Rate limiting
-                time.sleep(self.delay)
+                # Download file (rate limited per host inside http_get)
+                if self._file_pool is None:
+                    record = self.download_file(download_url, filepath)
+                    if record:
+                        file_checksums[filename] = record
+                        self._store_blob(filepath, record)
+                        success_count += 1
+                else:
+                    futures[self._file_pool.submit(self.download_file, download_url, filepath)] = filename
                 
             except Exception as e:
                 print(f"  ✗ Error downloading {download_url}: {e}")
         
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+                if record:
+                    file_checksums[futures[future]] = record
+                    self._store_blob(item_folder / futures[future], record)
+                    success_count += 1
+            except Exception as e:
+                print(f"  ✗ Error downloading {futures[future]}: {e}")
+        
+        self._write_metadata(metadata_file, art_info, file_checksums)
+        status = 'downloaded' if success_count > 0 else 'failed'
+        self.catalog.record_item(art_info, license_folder, safe_title, status, file_checksums)
         return success_count > 0
     
-    def get_art_links_from_page(self, page_url: str) -> List[str]:
-        """Extract art item links from a search results page."""
-        try:
-            response = self.session.get(page_url, timeout=30)
+    def fetch_cached(self, url: str, params: Optional[Dict] = None) -> bytes:
+        """GET a page body, serving fresh cache entries and revalidating stale ones."""
+        if self.cache is None:
+            response = self.http_get(url, params=params)
             response.raise_for_status()
+            return response.content
+        
+        url = requests.Request('GET', url, params=params).prepare().url
+        entry = self.cache.lookup(url)
+        if entry and self.cache.is_fresh(entry):
+            body = self.cache.read(url)
+            if body is not None:
+                self.cache.record('hits', entry['size'])
+                return body
+            entry = None
+        
+        response = self.http_get(url, headers=self.cache.validators(entry))
+        if response.status_code == 304 and entry:
+            body = self.cache.refresh(url, response.headers)
+            if body is not None:
+                self.cache.record('revalidated', entry['size'])
+                return body
+            response = self.http_get(url)
+        response.raise_for_status()
+        self.cache.record('misses')
+        self.cache.store(url, response.content, response.headers)
+        return response.content
+    
+    def fetch_page(self, page_url: str, params: Optional[Dict] = None) -> Any:
+        """Fetch a listing page once and return its parsed document."""
+        return self.parse_document(self.fetch_cached(page_url, params))
+    
+    def iter_art_links(self, soup: Any) -> Iterator[str]:
+        """Lazily yield unique art item links from a parsed search results page."""
+        seen = set()
+        if isinstance(soup, BeautifulSoup):
+            hrefs = (link['href'] for link in soup.find_all('a', href=True))
+        else:
+            hrefs = (link.get('href') for link in _XP_LINKS(soup))
+        for href in hrefs:
+            # OpenGameArt art pages typically have /content/ in the URL
+            if '/content/' not in href:
+                continue
+            if not href.startswith('http'):
+                href = urljoin(self.base_url, href)
+            if href not in seen:
+                seen.add(href)
+                yield href
+    
+    def _store_blob(self, filepath: Path, record: Dict):
+        """Link a verified download into the blob store, if one is configured."""
+        if self.blob_store is None:
+            return
+        try:
+            self.blob_store.ingest(filepath, record['sha256'])
+        except OSError as e:
+            print(f"  ⚠ Could not add {filepath.name} to blob store: {e}")
+    
+    def process_art_item(self, art_url: str) -> bool:
+        """Fetch an art page, extract its metadata and download its files."""
+        # Skip if already downloaded or being handled by another worker
+        with self._lock:
+            if art_url in self.downloaded_items or art_url in self._claimed_items:
+                print(f"  ↻ Already downloaded, skipping: {art_url}")
+                return False
+            self._claimed_items.add(art_url)
+        
+        try:
+            # Get art page
+            art_soup = self.fetch_page(art_url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            art_links = []
+            # Extract art information
+            art_info = self.extract_art_info(art_soup, art_url)
+            if not art_info:
+                return False
             
-            # Look for art item links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                # OpenGameArt art pages typically have /content/ in the URL
-                if '/content/' in href and href not in art_links:
-                    if not href.startswith('http'):
-                        href = urljoin(self.base_url, href)
-                    art_links.append(href)
+            print(f"\n🖼️  {art_url}")
+            print(f"  📝 Title: {art_info['title']}")
+            print(f"  👤 Author: {art_info['author']}")
+            print(f"  📜 License: {art_info['license']}")
+            print(f"  🔗 Files: {len(art_info['download_links'])}")
+            
+            # Download the art item
+            if self.download_art_item(art_info):
+                with self._lock:
+                    self.downloaded_items.add(art_url)
+                print(f"  ✅ Successfully downloaded: {art_info['title']}")
+                downloaded = True
+            else:
+                print(f"  ❌ Download failed: {art_info['title']}")
+                downloaded = False
             
-            return art_links
+            # Progress is recorded in the catalog by download_art_item
+            return downloaded
             
         except Exception as e:
-            print(f"✗ Error fetching page {page_url}: {e}")
-            return []
+            print(f"  ✗ Error processing art item {art_url}: {e}")
+            return False
     
     def download_from_search(self, max_pages: int = 5):
-        """Download 2D art from OpenGameArt search results."""
-        base_search_url = "https://opengameart.org/art-search-advanced"
+        """Download 2D art from OpenGameArt search results.
+        
+        Art items are processed by a pool of ``concurrency`` workers while the
+        next search page is fetched; file downloads run on a second pool of the
+        same size so item workers never wait on their own pool. Politeness is
+        enforced per host by ``self.rate_limiter`` rather than global sleeps.
+        """
+        base_search_url = f"{self.base_url}/art-search-advanced"
         params = {
             'keys': '',
             'field_art_type_tid[]': '9',  # 2D Art
@@ -240,90 +759,55 @@ class OpenGameArtDownloader:
         
         print(f"🎨 Starting OpenGameArt 2D Art Download")
         print(f"📁 Output directory: {self.output_dir}")
-        print(f"⏱️  Rate limit: {self.delay} seconds between requests")
+        print(f"⏱️  Rate limit: {self.delay} seconds between requests per host")
+        print(f"🧵 Concurrency: {self.concurrency}")
         print(f"📄 Max pages: {max_pages}")
         print("-" * 50)
         
         total_downloaded = 0
+        item_pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="item")
+        self._file_pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="file")
+        pending = []
         
-        for page in range(max_pages):
-            print(f"\n📄 Processing page {page + 1}/{max_pages}")
-            
-            # Add page parameter for pages beyond the first
-            if page > 0:
-                params['page'] = page
-            
-            # Get search results page
-            try:
-                response = self.session.get(base_search_url, params=params, timeout=30)
-                response.raise_for_status()
-            except Exception as e:
-                print(f"✗ Error fetching search page {page + 1}: {e}")
-                continue
-            
-            # Extract art links
-            soup = BeautifulSoup(response.content, 'html.parser')
-            art_links = self.get_art_links_from_page(response.url)
-            
-            if not art_links:
-                print(f"⚠ No art links found on page {page + 1}")
-                continue
-            
-            print(f"🔗 Found {len(art_links)} art items on page {page + 1}")
-            
-            # Process each art item
-            page_downloads = 0
-            for i, art_url in enumerate(art_links):
-                print(f"\n[{i+1}/{len(art_links)}] Processing: {art_url}")
+        try:
+            for page in range(max_pages):
+                print(f"\n📄 Processing page {page + 1}/{max_pages}")
                 
-                # Skip if already downloaded
-                if art_url in self.downloaded_items:
-                    print(f"  ↻ Already downloaded, skipping")
-                    continue
+                # Add page parameter for pages beyond the first
+                if page > 0:
+                    params['page'] = page
                 
+                # Get search results page (fetched and parsed exactly once)
                 try:
-                    # Get art page
-                    art_response = self.session.get(art_url, timeout=30)
-                    art_response.raise_for_status()
-                    
-                    art_soup = BeautifulSoup(art_response.content, 'html.parser')
-                    
-                    # Extract art information
-                    art_info = self.extract_art_info(art_soup, art_url)
-                    if not art_info:
-                        continue
-                    
-                    print(f"  📝 Title: {art_info['title']}")
-                    print(f"  👤 Author: {art_info['author']}")
-                    print(f"  📜 License: {art_info['license']}")
-                    print(f"  🔗 Files: {len(art_info['download_links'])}")
-                    
-                    # Download the art item
-                    if self.download_art_item(art_info):
-                        self.downloaded_items.add(art_url)
-                        page_downloads += 1
-                        total_downloaded += 1
-                        print(f"  ✅ Successfully downloaded")
-                    else:
-                        print(f"  ❌ Download failed")
-                    
-                    # Save progress
-                    self.save_download_log()
-                    
+                    soup = self.fetch_page(base_search_url, params=params)
                 except Exception as e:
-                    print(f"  ✗ Error processing art item: {e}")
+                    print(f"✗ Error fetching search page {page + 1}: {e}")
+                    continue
                 
-                # Rate limiting between items
-                time.sleep(self.delay)
-            
-            print(f"\n📊 Page {page + 1} complete: {page_downloads} items downloaded")
+                # Queue art items as links are found; the next page is fetched while these run
+                page_items = 0
+                for art_url in self.iter_art_links(soup):
+                    pending.append(item_pool.submit(self.process_art_item, art_url))
+                    page_items += 1
+                
+                if not page_items:
+                    print(f"⚠ No art links found on page {page + 1}")
+                    continue
+                
+                print(f"🔗 Found {page_items} art items on page {page + 1}")
             
-            # Longer delay between pages
-            if page < max_pages - 1:
-                time.sleep(self.delay * 2)
+            for future in as_completed(pending):
+                if future.result():
+                    total_downloaded += 1
+        finally:
+            item_pool.shutdown(wait=True, cancel_futures=True)
+            self._file_pool.shutdown(wait=True, cancel_futures=True)
+            if self.cache is not None:
+                self.cache.save()
         
         print(f"\n🎉 Download complete!")
         print(f"📊 Total items downloaded: {total_downloaded}")
+        print(f"🌐 HTTP requests: {self.request_count}")
         print(f"📁 Files saved to: {self.output_dir}")
         
         # Generate summary report
@@ -337,19 +821,33 @@ class OpenGameArtDownloader:
             f.write("# OpenGameArt Download Summary\n\n")
             f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
-            # Count files by license
-            license_counts = {}
-            for license_dir in ['cc0', 'cc-by', 'cc-by-sa', 'gpl', 'other']:
-                license_path = self.output_dir / license_dir
-                if license_path.exists():
-                    count = len([d for d in license_path.iterdir() if d.is_dir()])
-                    license_counts[license_dir] = count
+            # Count items by license (one indexed query instead of a folder walk)
+            license_counts = self.catalog.count_by_license()
             
             f.write("## Downloads by License\n\n")
             for license_type, count in license_counts.items():
                 f.write(f"- **{license_type.upper()}**: {count} items\n")
             
-            f.write(f"\n**Total Items**: {sum(license_counts.values())}\n\n")
+            f.write(f"\n**Total Items**: {sum(license_counts.values())}\n")
+            totals = self.catalog.totals()
+            f.write(f"**Total Files**: {totals['files']} ({totals['unique_files']} unique, "
+                    f"{totals['bytes'] / (1024 * 1024):.1f} MB)\n\n")
+            
+            f.write("## Crawl Statistics\n\n")
+            f.write(f"- **HTTP requests this run**: {self.request_count}\n")
+            if self.cache is not None:
+                stats = self.cache.stats
+                lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+                hit_rate = (stats['hits'] + stats['revalidated']) / lookups * 100 if lookups else 0.0
+                f.write(f"- **Page cache**: {stats['hits']} fresh hits, {stats['revalidated']} revalidated (304), "
+                        f"{stats['misses']} misses ({hit_rate:.0f}% served from cache)\n")
+                f.write(f"- **Cache bytes saved**: {stats['bytes_saved'] / 1024:.1f} KB, "
+                        f"{stats['evictions']} evictions, {self.cache.total_bytes / 1024:.1f} KB cached\n")
+            if self.blob_store is not None:
+                stats = self.blob_store.stats
+                f.write(f"- **Blob store**: {stats['ingested']} new blobs, {stats['linked']} duplicates linked, "
+                        f"{stats['bytes_reclaimed'] / 1024:.1f} KB saved\n")
+            f.write("\n")
             
             f.write("## Usage Guidelines\n\n")
             f.write("- **CC0**: Public domain, no attribution required\n")
@@ -366,6 +864,146 @@ class OpenGameArtDownloader:
         
         print(f"📋 Summary report saved: {report_file}")
 
+def benchmark_parsers(fixture_dir: str = FIXTURE_DIR, rounds: int = 5):
+    """Time both extraction backends over saved pages and assert they agree.
+    
+    Defaults to the pages in ``fixtures/opengameart``; any directory of .html
+    files works, e.g. the page cache in ``<output-dir>/metadata/http_cache``.
+    """
+    paths = sorted(Path(fixture_dir).glob('*.html'))
+    pages = [p.read_bytes() for p in paths]
+    if not pages:
+        print(f"❌ No .html fixture pages found in {fixture_dir}")
+        return
+    if not LXML_AVAILABLE:
+        print("❌ lxml is not installed: pip install -r requirements.txt")
+        return
+    
+    print(f"⏱️  Benchmarking extraction over {len(pages)} pages x {rounds} rounds")
+    results = {}
+    timings = {}
+    scratch_dir = tempfile.mkdtemp(prefix="oga_benchmark_")
+    for parser in ('html.parser', 'lxml'):
+        downloader = OpenGameArtDownloader(scratch_dir, cache_ttl=None, parser=parser)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            extracted = []
+            for body in pages:
+                doc = downloader.parse_document(body)
+                info = downloader.extract_art_info(doc, "fixture")
+                extracted.append((info and dict(info, download_links=sorted(info['download_links'])),
+                                  list(downloader.iter_art_links(doc))))
+        timings[parser] = (time.perf_counter() - started) / (rounds * len(pages))
+        results[parser] = extracted
+        print(f"  {parser:12s} {timings[parser] * 1000:8.2f} ms/page")
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+    
+    mismatches = [path.name for path, a, b in zip(paths, results['html.parser'], results['lxml']) if a != b]
+    print(f"🚀 lxml speedup: {timings['html.parser'] / timings['lxml']:.1f}x")
+    print(f"{'✅' if not mismatches else '❌'} {len(pages) - len(mismatches)}/{len(pages)} pages extracted identically")
+    if mismatches:
+        raise AssertionError(f"parsers disagree on: {', '.join(mismatches)}")
+
+def _stub_handler(fixture_dir: Path, requests_log: List, log_lock: threading.Lock):
+    """Request handler serving fixture pages as a tiny OpenGameArt mirror."""
+    items = sorted(Path(fixture_dir).glob('item_*.html'))
+    
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass  # Keep the check's output readable
+        
+        def do_GET(self):
+            with log_lock:
+                requests_log.append((time.monotonic(), self.path))
+            parsed = urlparse(self.path)
+            base = f"http://{self.headers['Host']}"
+            if parsed.path == '/art-search-advanced':
+                page = int(parse_qs(parsed.query).get('page', ['0'])[0])
+                self._page(Path(fixture_dir) / f'search_page_{page}.html', base)
+            elif parsed.path.startswith('/content/'):
+                # Every item URL gets one of the item fixtures, titled after its slug
+                slug = parsed.path.rsplit('/', 1)[-1]
+                self._page(items[zlib.crc32(slug.encode()) % len(items)], base, slug)
+            elif parsed.path.startswith('/sites/'):
+                body = hashlib.sha256(parsed.path.encode()).digest() * 128
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', f'"{zlib.crc32(body):08x}"')
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.send_error(404)
+        
+        def _page(self, path: Path, base: str, slug: str = ''):
+            if not path.exists():
+                self.send_error(404)
+                return
+            text = path.read_text(encoding='utf-8').replace('https://opengameart.org', base)
+            if slug:
+                text = text.replace('id="page-title">', f'id="page-title">{slug} ', 1)
+            body = text.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+    return StubHandler
+
+def stub_crawl_check(fixture_dir: str = FIXTURE_DIR, max_pages: int = 2, concurrency: int = 4,
+                     delay: float = 0.03) -> bool:
+    """Crawl a local stub server built from the fixture pages and verify the result.
+    
+    Checks that every art link on the search fixtures is fetched exactly once,
+    that every item downloads, and that requests to the (single) stub host are
+    spaced by the per-host rate limit despite ``concurrency`` workers.
+    """
+    requests_log: List = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _stub_handler(Path(fixture_dir), requests_log, threading.Lock()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    scratch_dir = tempfile.mkdtemp(prefix="oga_stub_")
+    
+    print(f"🧪 Crawling stub server {base_url}: {max_pages} pages, concurrency {concurrency}, delay {delay}s")
+    try:
+        downloader = OpenGameArtDownloader(scratch_dir, delay=delay, concurrency=concurrency,
+                                           base_url=base_url, cache_ttl=None)
+        started = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            downloader.download_from_search(max_pages=max_pages)
+        elapsed = time.monotonic() - started
+        downloaded = len(downloader.catalog.downloaded_urls())
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    
+    # Expected art links, read straight from the search fixtures
+    expected = set()
+    for page in range(max_pages):
+        page_file = Path(fixture_dir) / f'search_page_{page}.html'
+        if page_file.exists():
+            for href in re.findall(r'href="([^"]*/content/[^"]*)"', page_file.read_text(encoding='utf-8')):
+                expected.add(urlparse(href).path)
+    fetched = [urlparse(path).path for _, path in requests_log if urlparse(path).path.startswith('/content/')]
+    times = sorted(t for t, _ in requests_log)
+    # Any run of `window` requests must span the rate limit, less some thread-scheduling jitter
+    window, jitter = 30, 0.25
+    spans = [b - a for a, b in zip(times, times[window - 1:])]
+    tightest = min(spans, default=(window - 1) * delay)
+    
+    checks = [
+        ("every art link fetched", set(fetched) == expected, f"{len(set(fetched))}/{len(expected)}"),
+        ("no art page fetched twice", len(fetched) == len(set(fetched)), f"{len(fetched)} fetches"),
+        ("every item downloaded", downloaded == len(expected), f"{downloaded}/{len(expected)}"),
+        ("per-host rate limit", (len(times) - 1) * delay <= elapsed + delay and tightest >= (window - 1) * delay - jitter,
+         f"{len(times)} requests in {elapsed:.2f}s, fastest {window} took {tightest * 1000:.0f} ms "
+         f"(limit {(window - 1) * delay * 1000:.0f} ms)"),
+    ]
+    for name, ok, detail in checks:
+        print(f"  {'✅' if ok else '❌'} {name}: {detail}")
+    return all(ok for _, ok, _ in checks)
+
 def main():
     parser = argparse.ArgumentParser(description='Download 2D art from OpenGameArt.org')
     parser.add_argument('--max-pages', type=int, default=5, 
@@ -374,14 +1012,43 @@ def main():
                        help='Delay between requests in seconds (default: 2.0)')
     parser.add_argument('--output-dir', type=str, default='./downloaded_art',
                        help='Output directory (default: ./downloaded_art)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of art items and files fetched in parallel (default: 1)')
+    parser.add_argument('--cache-ttl', type=float, default=6.0,
+                       help='Hours a cached page is reused before revalidation (default: 6.0)')
+    parser.add_argument('--cache-size', type=int, default=256,
+                       help='Maximum page cache size in MB (default: 256)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the on-disk page cache')
+    parser.add_argument('--blob-store', type=str, default=None,
+                       help='Content-addressed store directory; identical files are kept once and hardlinked')
+    parser.add_argument('--parser', choices=['html.parser', 'lxml'], default='html.parser',
+                       help='HTML extraction backend; lxml is several times faster (default: html.parser)')
+    parser.add_argument('--benchmark-parsers', type=str, nargs='?', const=str(FIXTURE_DIR), default=None, metavar='DIR',
+                       help='Benchmark both parsers over the saved .html pages in DIR (default: fixtures/opengameart) and exit')
+    parser.add_argument('--stub-check', action='store_true',
+                       help='Crawl a local stub server serving fixtures/opengameart and verify links and rate limiting, then exit')
+    parser.add_argument('--base-url', type=str, default='https://opengameart.org',
+                       help='Site root to crawl, e.g. a local mirror or stub server (default: https://opengameart.org)')
     
     args = parser.parse_args()
     
+    if args.benchmark_parsers:
+        benchmark_parsers(args.benchmark_parsers)
+        return
+    
+    if args.stub_check:
+        sys.exit(0 if stub_crawl_check() else 1)
+    
     # Validate arguments
     if args.max_pages < 1:
         print("Error: max-pages must be at least 1")
         return
     
+    if args.concurrency < 1:
+        print("Error: concurrency must be at least 1")
+        return
+    
     if args.delay < 1.0:
         print("Warning: Using delay less than 1 second may overload the server")
         print("Setting minimum delay to 1.0 seconds")
@@ -390,7 +1057,13 @@ def main():
     # Create downloader and start
     downloader = OpenGameArtDownloader(
         output_dir=args.output_dir,
-        delay=args.delay
+        delay=args.delay,
+        concurrency=args.concurrency,
+        base_url=args.base_url,
+        cache_ttl=None if args.no_cache else args.cache_ttl * 3600,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        blob_store=args.blob_store,
+        parser=args.parser
     )
     
     try:
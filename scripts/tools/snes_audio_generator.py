@@ -2,38 +2,262 @@
 """
 SNES-Style Audio Generator for Wedding Game
 Creates authentic 16-bit chiptune sound effects using numpy and wave
+
+Usage:
+    python snes_audio_generator.py                         # Render the built-in wedding SFX set
+    python snes_audio_generator.py sfx_scores/ my.json     # Render score files/directories
+    python snes_audio_generator.py --output-root=DIR       # Write somewhere other than assets/audio/sfx
+    python snes_audio_generator.py sfx_scores/ --jobs=0    # Render in one process per CPU
+    python snes_audio_generator.py sfx_scores/ --check     # Verify WAVs on disk match a fresh render
+    python snes_audio_generator.py --benchmark             # Time/allocation report per effect
+    python snes_audio_generator.py --benchmark-oscillators # Direct vs wavetable oscillator speed/aliasing
+    python snes_audio_generator.py --benchmark-streaming   # Peak memory of in-memory vs streamed tracks
+
+Scores are JSON or TOML files describing notes, waveforms, envelopes,
+vibrato and layers; see sfx_scores/README.md for the format. A score is only
+re-rendered when its content hash, RENDERER_VERSION or its output WAV changed.
+Scores marked "stream": true (long music tracks) are rendered and written in
+fixed-size blocks, so memory use does not grow with track length.
 """
 
 import numpy as np
 import wave
 import math
 import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+# Default destination: <repo>/assets/audio/sfx
+DEFAULT_OUTPUT_ROOT = Path(__file__).resolve().parents[2] / "assets" / "audio" / "sfx"
+
+# Recorded with every rendered score; bump whenever a change alters rendered
+# samples so every score is re-rendered once (refactors that keep the output
+# identical must not bump it)
+RENDERER_VERSION = 1
+
+# LRU bounds for the per-generator time-axis and envelope-ramp caches, so
+# rendering many tempo variants in one process does not grow them forever
+TIME_BASE_CACHE_SIZE = 64
+RAMP_CACHE_SIZE = 256
+
+NOTE_OFFSETS = {'C': -9, 'D': -7, 'E': -5, 'F': -4, 'G': -2, 'A': 0, 'B': 2}
+
+class Note(NamedTuple):
+    """One tone in a sequence; a frequency of 0 is a rest."""
+    frequency: float
+    duration: float
+    amplitude: float = 0.5
+    wave_type: str = 'sine'
+    envelope: Optional[Tuple[float, float, float, float]] = None  # (attack, decay, sustain, release)
+
+# A sequence step is a single note or a chord of notes sounding together
+Step = Union[Note, Sequence[Note]]
+
+def note_frequency(note: Union[str, float]) -> float:
+    """Frequency in Hz of a number or a note name such as 'C5', 'F#4' or 'Bb3'."""
+    if not isinstance(note, str):
+        return float(note)
+    match = re.fullmatch(r'([A-Ga-g])([#b]?)(-?\d)', note.strip())
+    if not match:
+        raise ValueError(f"Invalid note name: {note}")
+    letter, accidental, octave = match.groups()
+    semitones = NOTE_OFFSETS[letter.upper()] + {'#': 1, 'b': -1, '': 0}[accidental] + (int(octave) - 4) * 12
+    return 440.0 * 2 ** (semitones / 12)
+
+# Samples per block when streaming a score to disk
+STREAM_BLOCK_SIZE = 8192
+
+# Wavetable oscillators: one band-limited table per waveform and octave
+WAVETABLE_SIZE = 2048
+WAVETABLE_BASE_FREQUENCY = 20.0  # Bottom of the lowest octave band
+
+def _harmonic_series(wave: str, harmonics: int) -> Dict[int, float]:
+    """Fourier sine coefficients of a waveform, truncated to ``harmonics``."""
+    if wave == 'sine':
+        return {1: 1.0}
+    if wave == 'square':
+        return {n: 4 / (np.pi * n) for n in range(1, harmonics + 1, 2)}
+    if wave == 'sawtooth':
+        return {n: (2 / np.pi) * (-1) ** (n + 1) / n for n in range(1, harmonics + 1)}
+    if wave == 'triangle':
+        return {n: (8 / np.pi ** 2) * (-1) ** ((n - 1) // 2) / n ** 2 for n in range(1, harmonics + 1, 2)}
+    raise ValueError(f"Unknown wave type: wt_{wave}")
+
+class WavetableBank:
+    """Band-limited wavetables read by a phase accumulator.
+    
+    Each octave band gets a table holding only the harmonics that stay
+    below Nyquist at the top of that band, so square and sawtooth tones do
+    not alias. Tables are built on first use and cached; synthesis is a
+    linearly interpolated table read per sample instead of trig calls.
+    
+    Phase is 32-bit fixed point: the top bits index the table, the rest are
+    the interpolation fraction, and uint32 overflow wraps the cycle for free.
+    """
+    
+    def __init__(self, sample_rate: int, size: int = WAVETABLE_SIZE):
+        if size & (size - 1):
+            raise ValueError(f"Wavetable size must be a power of two: {size}")
+        self.sample_rate = sample_rate
+        self.size = size
+        self.fraction_bits = 32 - (size.bit_length() - 1)
+        self._tables = {}  # (wave, band) -> read-only (table, slope to next entry)
+        self._counter = np.arange(0, dtype=np.uint32)  # Shared 0..n-1 sample counter, grown on demand
+    
+    def table(self, wave: str, frequency: float) -> Tuple[np.ndarray, np.ndarray]:
+        band = max(0, int(np.log2(max(frequency, WAVETABLE_BASE_FREQUENCY) / WAVETABLE_BASE_FREQUENCY)))
+        key = (wave, band)
+        tables = self._tables.get(key)
+        if tables is None:
+            band_top = WAVETABLE_BASE_FREQUENCY * 2 ** (band + 1)
+            harmonics = max(1, int(self.sample_rate / 2 / band_top))
+            spectrum = np.zeros(self.size // 2 + 1, dtype=complex)
+            for n, coefficient in _harmonic_series(wave, min(harmonics, self.size // 2 - 1)).items():
+                spectrum[n] = -0.5j * coefficient * self.size  # irfft of this is coefficient * sin(n * phase)
+            table = np.fft.irfft(spectrum, self.size)
+            table /= np.abs(table).max()  # Gibbs overshoot would clip at full amplitude
+            slope = np.roll(table, -1) - table
+            table.flags.writeable = False
+            slope.flags.writeable = False
+            tables = self._tables[key] = (table, slope)
+        return tables
+    
+    def render(self, wave: str, frequency: float, out, start: int = 0):
+        """Write samples ``start .. start + len(out)`` of ``wave`` at ``frequency`` into ``out``."""
+        samples = len(out)
+        if len(self._counter) < samples:
+            self._counter = np.arange(samples, dtype=np.uint32)
+        table, slope = self.table(wave, frequency)
+        
+        increment = np.uint32(round(frequency * 2 ** 32 / self.sample_rate) % 2 ** 32)
+        phase = self._counter[:samples] + np.uint32(start % 2 ** 32)
+        phase *= increment  # Wraps modulo 2**32
+        index = phase >> np.uint32(self.fraction_bits)
+        phase &= np.uint32((1 << self.fraction_bits) - 1)
+        np.multiply(phase, 1.0 / (1 << self.fraction_bits), out=out)
+        out *= slope.take(index)
+        out += table.take(index)
+        return out
 
 class SNESAudioGenerator:
     def __init__(self, sample_rate=22050):  # Classic SNES sample rate
         self.sample_rate = sample_rate
         self.bit_depth = 16
-        
-    def generate_tone(self, frequency, duration, amplitude=0.5, wave_type='sine'):
-        """Generate a basic tone with SNES characteristics"""
-        samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
-        
+        self._time_bases = OrderedDict()  # (duration, sample_rate) -> read-only time axis, LRU order
+        self._ramps = OrderedDict()  # (samples, start, stop) -> read-only linear ramp, LRU order
+        self._wavetables = None
+        
+    @staticmethod
+    def _lru_get(cache: OrderedDict, key, limit: int, build):
+        """Return ``cache[key]``, building it read-only on a miss and evicting the least recently used."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value
+        value = build()
+        value.flags.writeable = False
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+        return value
+    
+    def time_base(self, duration):
+        """Cached, read-only ``np.linspace(0, duration, samples, False)``."""
+        return self._lru_get(self._time_bases, (duration, self.sample_rate), TIME_BASE_CACHE_SIZE,
+                             lambda: np.linspace(0, duration, int(self.sample_rate * duration), False))
+    
+    def _ramp(self, samples, start, stop):
+        """Cached, read-only ``np.linspace(start, stop, samples)``."""
+        return self._lru_get(self._ramps, (samples, start, stop), RAMP_CACHE_SIZE,
+                             lambda: np.linspace(start, stop, samples))
+    
+    @property
+    def wavetables(self) -> WavetableBank:
+        if self._wavetables is None:
+            self._wavetables = WavetableBank(self.sample_rate)
+        return self._wavetables
+    
+    def generate_tone(self, frequency, duration, amplitude=0.5, wave_type='sine', out=None):
+        """Generate a basic tone with SNES characteristics
+        
+        If ``out`` is given the tone is written into it (it must hold exactly
+        ``int(sample_rate * duration)`` samples) instead of a new array.
+        Wave types prefixed ``wt_`` (e.g. ``wt_square``) use the band-limited
+        wavetable oscillators instead of direct evaluation.
+        """
+        t = self.time_base(duration)
+        if out is None:
+            out = np.empty(len(t))
+        
+        if wave_type.startswith('wt_'):
+            self.wavetables.render(wave_type[3:], frequency, out)
+        else:
+            self._evaluate_wave(t, frequency, wave_type, out)
+        
+        out *= amplitude
+        return out
+    
+    def generate_tone_block(self, frequency, duration, amplitude, wave_type, start, out):
+        """Write samples ``start .. start + len(out)`` of a tone into ``out``.
+        
+        Streaming counterpart of ``generate_tone``: the time axis is built
+        for the block only, so a note can be rendered in pieces.
+        """
+        if wave_type.startswith('wt_'):
+            self.wavetables.render(wave_type[3:], frequency, out, start)
+        else:
+            # Same spacing as time_base's np.linspace(0, duration, samples, False)
+            t = np.arange(start, start + len(out), dtype=float)
+            t *= duration / int(self.sample_rate * duration)
+            self._evaluate_wave(t, frequency, wave_type, out)
+        out *= amplitude
+        return out
+    
+    def _evaluate_wave(self, t, frequency, wave_type, out):
+        """Evaluate a direct (non-wavetable) waveform at times ``t`` into ``out``."""
         if wave_type == 'sine':
-            wave_data = amplitude * np.sin(2 * np.pi * frequency * t)
+            np.multiply(t, 2 * np.pi * frequency, out=out)
+            np.sin(out, out=out)
         elif wave_type == 'square':
-            wave_data = amplitude * np.sign(np.sin(2 * np.pi * frequency * t))
+            np.multiply(t, 2 * np.pi * frequency, out=out)
+            np.sin(out, out=out)
+            np.sign(out, out=out)
         elif wave_type == 'sawtooth':
-            wave_data = amplitude * (2 * (t * frequency - np.floor(t * frequency + 0.5)))
+            np.multiply(t, frequency, out=out)
+            np.subtract(out, np.floor(out + 0.5), out=out)
+            out *= 2
         elif wave_type == 'triangle':
-            wave_data = amplitude * (2 * np.arcsin(np.sin(2 * np.pi * frequency * t)) / np.pi)
-        
-        return wave_data
+            np.multiply(t, 2 * np.pi * frequency, out=out)
+            np.sin(out, out=out)
+            np.arcsin(out, out=out)
+            out *= 2 / np.pi
+        else:
+            raise ValueError(f"Unknown wave type: {wave_type}")
     
-    def apply_envelope(self, wave_data, attack=0.1, decay=0.1, sustain=0.7, release=0.2):
-        """Apply ADSR envelope to simulate classic SNES sound shaping"""
+    def apply_envelope(self, wave_data, attack=0.1, decay=0.1, sustain=0.7, release=0.2, in_place=False):
+        """Apply ADSR envelope to simulate classic SNES sound shaping
+        
+        Each stage multiplies its slice of the signal directly, so no
+        full-length envelope array is built. ``in_place=True`` shapes
+        ``wave_data`` itself instead of a copy.
+        """
+        if not in_place:
+            wave_data = np.array(wave_data, dtype=float)
         samples = len(wave_data)
-        envelope = np.ones(samples)
         
         attack_samples = int(attack * samples)
         decay_samples = int(decay * samples)
@@ -41,30 +265,98 @@ class SNESAudioGenerator:
         sustain_samples = samples - attack_samples - decay_samples - release_samples
         
         # Attack
-        envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
+        wave_data[:attack_samples] *= self._ramp(attack_samples, 0, 1)
         
         # Decay
         start_idx = attack_samples
         end_idx = start_idx + decay_samples
-        envelope[start_idx:end_idx] = np.linspace(1, sustain, decay_samples)
+        wave_data[start_idx:end_idx] *= self._ramp(decay_samples, 1, sustain)
         
         # Sustain
         start_idx = end_idx
         end_idx = start_idx + sustain_samples
-        envelope[start_idx:end_idx] = sustain
+        wave_data[start_idx:end_idx] *= sustain
         
         # Release
         start_idx = end_idx
-        envelope[start_idx:] = np.linspace(sustain, 0, release_samples)
+        wave_data[start_idx:] *= self._ramp(release_samples, sustain, 0)
         
-        return wave_data * envelope
+        return wave_data
+    
+    def envelope_gain(self, envelope, total, start, count):
+        """ADSR gain for samples ``start .. start + count`` of a ``total``-sample sound.
+        
+        Same breakpoints as ``apply_envelope``, evaluated with ``np.interp``
+        so a long sound can be shaped one block at a time.
+        """
+        attack, decay, sustain, release = envelope
+        attack_samples = int(attack * total)
+        decay_samples = int(decay * total)
+        release_samples = int(release * total)
+        sustain_samples = total - attack_samples - decay_samples - release_samples
+        
+        # Breakpoints reproduce each stage's np.linspace(first, last, stage_samples)
+        xp, fp = [], []
+        position = 0
+        for count_samples, first, last in ((attack_samples, 0, 1), (decay_samples, 1, sustain),
+                                           (sustain_samples, sustain, sustain), (release_samples, sustain, 0)):
+            if count_samples > 0:
+                xp.append(position)
+                fp.append(first)
+                if count_samples > 1:
+                    xp.append(position + count_samples - 1)
+                    fp.append(last)
+            position += max(count_samples, 0)
+        return np.interp(np.arange(start, start + count), xp, fp)
     
     def add_vibrato(self, wave_data, vibrato_frequency=5, vibrato_depth=0.1):
         """Add vibrato effect common in SNES audio"""
         samples = len(wave_data)
-        t = np.linspace(0, len(wave_data) / self.sample_rate, samples)
-        vibrato = 1 + vibrato_depth * np.sin(2 * np.pi * vibrato_frequency * t)
-        return wave_data * vibrato
+        vibrato = np.linspace(0, 2 * np.pi * vibrato_frequency * samples / self.sample_rate, samples)
+        np.sin(vibrato, out=vibrato)
+        vibrato *= vibrato_depth
+        vibrato += 1
+        vibrato *= wave_data
+        return vibrato
+    
+    def render_sequence(self, steps: List[Step]):
+        """Render notes/chords back to back into one preallocated buffer.
+        
+        The output length is the sum of the step lengths, so nothing is
+        concatenated; chord voices after the first are rendered into one
+        reused scratch buffer and added in place. A single note repeated
+        later in the sequence is copied from where it was first rendered.
+        """
+        steps = [(step,) if isinstance(step, Note) else tuple(step) for step in steps]
+        lengths = [max(int(self.sample_rate * note.duration) for note in chord) for chord in steps]
+        output = np.zeros(sum(lengths))
+        scratch = np.empty(max(lengths, default=0))
+        
+        rendered = {}  # single-note step -> position it was first rendered at
+        position = 0
+        for chord, length in zip(steps, lengths):
+            if len(chord) == 1 and chord[0] in rendered:
+                first = rendered[chord[0]]
+                output[position:position + length] = output[first:first + length]
+                position += length
+                continue
+            if len(chord) == 1:
+                rendered[chord[0]] = position
+            for voice, note in enumerate(chord):
+                if note.frequency == 0 or note.amplitude == 0:
+                    continue  # Rest: the buffer is already silent
+                samples = int(self.sample_rate * note.duration)
+                target = output[position:position + samples]
+                if voice > 0:
+                    target = scratch[:samples]
+                self.generate_tone(note.frequency, note.duration, note.amplitude, note.wave_type, out=target)
+                if note.envelope:
+                    target = self.apply_envelope(target, *note.envelope, in_place=True)
+                if voice > 0:
+                    output[position:position + samples] += target
+            position += length
+        
+        return output
     
     def quantize_to_8bit(self, wave_data):
         """Simulate 8-bit quantization for more authentic SNES sound"""
@@ -86,6 +378,170 @@ class SNESAudioGenerator:
             wav_file.setframerate(self.sample_rate)
             wav_file.writeframes(wave_data_int.tobytes())
     
+    def save_brr(self, wave_data, filename):
+        """Save wave data as SNES-style BRR (4-bit ADPCM, about 3.5x smaller than WAV)"""
+        from brr_codec import save_brr
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        return save_brr(Path(filename), np.int16(wave_data * 32767), self.sample_rate)
+    
+    def _score_note(self, spec: Dict, defaults: Dict) -> Note:
+        """Build a Note from a score entry, filling gaps from ``defaults``."""
+        spec = {**defaults, **spec}
+        tempo = spec.get('tempo', 1.0)
+        if 'rest' in spec:
+            return Note(0, spec['rest'] / tempo)
+        envelope = spec.get('envelope')
+        return Note(note_frequency(spec['note']) * spec.get('pitch', 1.0), spec['duration'] / tempo,
+                    spec.get('amplitude', 0.5), spec.get('wave', 'sine'), tuple(envelope) if envelope else None)
+    
+    def _score_steps(self, sequence: List[Dict], defaults: Dict) -> List[Step]:
+        steps = []
+        for entry in sequence:
+            if 'chord' in entry:
+                chord_defaults = {**defaults, **{k: v for k, v in entry.items() if k != 'chord'}}
+                steps.append([self._score_note(note, chord_defaults) for note in entry['chord']])
+            else:
+                steps.append(self._score_note(entry, defaults))
+        return steps
+    
+    def _layer_steps(self, layer: Dict, defaults: Dict) -> List[Step]:
+        return self._score_steps(layer['sequence'], {**defaults, **layer.get('defaults', {})}) * layer.get('repeat', 1)
+    
+    def _shape(self, wave_data, spec: Dict):
+        """Apply a score's or layer's envelope and vibrato to rendered audio."""
+        if spec.get('envelope'):
+            wave_data = self.apply_envelope(wave_data, *spec['envelope'], in_place=True)
+        if spec.get('vibrato'):
+            vibrato = spec['vibrato']
+            wave_data = self.add_vibrato(wave_data, vibrato.get('frequency', 5), vibrato.get('depth', 0.1))
+        return wave_data
+    
+    def _score_layers(self, score: Dict) -> Tuple[Dict, List[Dict]]:
+        defaults = score.get('defaults', {})
+        # Variant transforms scale every note in the score
+        defaults = {**defaults, **{k: score[k] for k in ('pitch', 'tempo') if k in score}}
+        layers = score.get('layers') or [{'sequence': score.get('sequence', []), 'repeat': score.get('repeat', 1)}]
+        return defaults, layers
+    
+    def render_score(self, score: Dict):
+        """Render a declarative score (see sfx_scores/README.md) to a waveform."""
+        defaults, layers = self._score_layers(score)
+        rendered = []
+        for layer in layers:
+            layer_data = self.render_sequence(self._layer_steps(layer, defaults))
+            layer_data = self._shape(layer_data, layer)
+            if layer.get('gain', 1.0) != 1.0:
+                layer_data *= layer['gain']
+            rendered.append(layer_data)
+        
+        # Mix layers into the first (longest) buffer
+        rendered.sort(key=len, reverse=True)
+        mix = rendered[0]
+        for layer_data in rendered[1:]:
+            mix[:len(layer_data)] += layer_data
+        
+        mix = self._shape(mix, score)
+        if score.get('quantize'):
+            mix = self.quantize_to_8bit(mix)
+        return mix
+    
+    def _shape_block(self, block, spec: Dict, total: int, start: int):
+        """Block-wise ``_shape``: envelope and vibrato for samples ``start ..`` of ``total``."""
+        if spec.get('envelope'):
+            block *= self.envelope_gain(spec['envelope'], total, start, len(block))
+        if spec.get('vibrato'):
+            vibrato = spec['vibrato']
+            # add_vibrato's phase runs over np.linspace(0, 2*pi*f*total/sr, total)
+            phase = np.arange(start, start + len(block), dtype=float)
+            phase *= 2 * np.pi * vibrato.get('frequency', 5) * total / self.sample_rate / max(total - 1, 1)
+            np.sin(phase, out=phase)
+            phase *= vibrato.get('depth', 0.1)
+            phase += 1
+            block *= phase
+    
+    def iter_score_blocks(self, score: Dict, block_size: int = STREAM_BLOCK_SIZE) -> Iterator[np.ndarray]:
+        """Render a score as float32 blocks of ``block_size`` samples.
+        
+        Only the notes sounding in the current block are synthesized and
+        every buffer is block-sized, so memory stays flat however long the
+        score is. Matches ``render_score`` to within float32 rounding.
+        """
+        defaults, layers = self._score_layers(score)
+        
+        # Flatten each layer into (start sample, note) events
+        prepared = []
+        for layer in layers:
+            events = []
+            position = 0
+            for step in self._layer_steps(layer, defaults):
+                chord = (step,) if isinstance(step, Note) else tuple(step)
+                events.extend((position, note) for note in chord if note.frequency != 0 and note.amplitude != 0)
+                position += max(int(self.sample_rate * note.duration) for note in chord)
+            prepared.append((layer, events, position))
+        total = max((length for _, _, length in prepared), default=0)
+        
+        mix = np.empty(block_size)
+        layer_buffer = np.empty(block_size)
+        voice = np.empty(block_size)
+        cursors = [0] * len(prepared)
+        sounding: List[List[Tuple[int, Note]]] = [[] for _ in prepared]
+        
+        for block_start in range(0, total, block_size):
+            block_end = min(block_start + block_size, total)
+            block = mix[:block_end - block_start]
+            block[:] = 0
+            for i, (layer, events, length) in enumerate(prepared):
+                if block_start >= length:
+                    continue
+                layer_end = min(block_end, length)
+                layer_block = layer_buffer[:layer_end - block_start]
+                layer_block[:] = 0
+                
+                while cursors[i] < len(events) and events[cursors[i]][0] < layer_end:
+                    sounding[i].append(events[cursors[i]])
+                    cursors[i] += 1
+                still_sounding = []
+                for note_start, note in sounding[i]:
+                    note_length = int(self.sample_rate * note.duration)
+                    lo, hi = max(block_start, note_start), min(layer_end, note_start + note_length)
+                    if hi > lo:
+                        segment = self.generate_tone_block(note.frequency, note.duration, note.amplitude, note.wave_type,
+                                                           lo - note_start, voice[:hi - lo])
+                        if note.envelope:
+                            segment *= self.envelope_gain(note.envelope, note_length, lo - note_start, hi - lo)
+                        layer_block[lo - block_start:hi - block_start] += segment
+                    if note_start + note_length > layer_end:
+                        still_sounding.append((note_start, note))
+                sounding[i] = still_sounding
+                
+                self._shape_block(layer_block, layer, length, block_start)
+                if layer.get('gain', 1.0) != 1.0:
+                    layer_block *= layer['gain']
+                block[:len(layer_block)] += layer_block
+            
+            self._shape_block(block, score, total, block_start)
+            if score.get('quantize'):
+                block = self.quantize_to_8bit(block)
+            yield block.astype(np.float32)
+    
+    def save_wav_stream(self, blocks: Iterable[np.ndarray], filename) -> int:
+        """Write float blocks to a WAV file as they arrive; returns the frame count.
+        
+        Each block is converted to 16-bit and written on its own, so the
+        full signal is never held in memory.
+        """
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        frames = 0
+        with wave.open(filename, 'w') as wav_file:
+            wav_file.setnchannels(1)  # Mono
+            wav_file.setsampwidth(2)  # 16-bit
+            wav_file.setframerate(self.sample_rate)
+            for block in blocks:
+                block = np.asarray(block, dtype=np.float32) * np.float32(32767)
+                wav_file.writeframesraw(block.astype(np.int16).tobytes())
+                frames += len(block)
+        return frames
+    
     def create_wedding_bell(self):
         """Create a cheerful wedding bell chime"""
         # Bell-like sound with multiple harmonics
@@ -96,15 +552,13 @@ class SNESAudioGenerator:
         harmonics = [1, 2, 3, 4.2, 5.4]  # Bell-like harmonic series
         amplitudes = [1.0, 0.6, 0.4, 0.3, 0.2]
         
-        bell_sound = np.zeros(int(self.sample_rate * duration))
-        
-        for harmonic, amplitude in zip(harmonics, amplitudes):
-            freq = base_freq * harmonic
-            tone = self.generate_tone(freq, duration, amplitude * 0.3, 'sine')
-            bell_sound += tone
+        bell_sound = self.render_sequence([
+            [Note(base_freq * harmonic, duration, amplitude * 0.3, 'sine')
+             for harmonic, amplitude in zip(harmonics, amplitudes)]
+        ])
         
         # Apply envelope and effects
-        bell_sound = self.apply_envelope(bell_sound, 0.01, 0.1, 0.6, 0.8)
+        bell_sound = self.apply_envelope(bell_sound, 0.01, 0.1, 0.6, 0.8, in_place=True)
         bell_sound = self.add_vibrato(bell_sound, 3, 0.05)
         
         return bell_sound
@@ -114,14 +568,9 @@ class SNESAudioGenerator:
         notes = [523, 659, 784]  # C-E-G major chord
         duration = 0.4
         
-        chord = np.zeros(int(self.sample_rate * duration))
-        
-        for note in notes:
-            tone = self.generate_tone(note, duration, 0.3, 'sine')
-            tone = self.apply_envelope(tone, 0.02, 0.1, 0.8, 0.3)
-            chord += tone
-        
-        return chord
+        return self.render_sequence([
+            [Note(note, duration, 0.3, 'sine', (0.02, 0.1, 0.8, 0.3)) for note in notes]
+        ])
     
     def create_menu_select(self):
         """Create a menu selection beep"""
@@ -129,22 +578,20 @@ class SNESAudioGenerator:
         duration = 0.1
         
         beep = self.generate_tone(frequency, duration, 0.5, 'square')
-        beep = self.apply_envelope(beep, 0.01, 0.02, 0.9, 0.05)
+        beep = self.apply_envelope(beep, 0.01, 0.02, 0.9, 0.05, in_place=True)
         beep = self.quantize_to_8bit(beep)
         
         return beep
     
     def create_menu_confirm(self):
         """Create a menu confirmation sound"""
-        # Two-tone confirmation
-        tone1 = self.generate_tone(600, 0.08, 0.4, 'square')
-        tone2 = self.generate_tone(800, 0.12, 0.4, 'square')
-        
-        # Add small gap between tones
-        gap = np.zeros(int(self.sample_rate * 0.02))
-        
-        confirm = np.concatenate([tone1, gap, tone2])
-        confirm = self.apply_envelope(confirm, 0.01, 0.05, 0.8, 0.1)
+        # Two-tone confirmation with a small gap between tones
+        confirm = self.render_sequence([
+            Note(600, 0.08, 0.4, 'square'),
+            Note(0, 0.02),
+            Note(800, 0.12, 0.4, 'square'),
+        ])
+        confirm = self.apply_envelope(confirm, 0.01, 0.05, 0.8, 0.1, in_place=True)
         
         return confirm
     
@@ -154,23 +601,12 @@ class SNESAudioGenerator:
         notes = [392, 440, 494, 523, 587, 659]  # G-A-B-C-D-E
         duration_per_note = 0.15
         
-        fanfare = np.array([])
-        
-        for note in notes:
-            tone = self.generate_tone(note, duration_per_note, 0.6, 'square')
-            tone = self.apply_envelope(tone, 0.01, 0.05, 0.8, 0.05)
-            fanfare = np.concatenate([fanfare, tone])
+        steps = [Note(note, duration_per_note, 0.6, 'square', (0.01, 0.05, 0.8, 0.05)) for note in notes]
         
         # Add final chord
-        final_chord = np.zeros(int(self.sample_rate * 0.5))
-        for note in [523, 659, 784]:  # C major chord
-            tone = self.generate_tone(note, 0.5, 0.4, 'sine')
-            tone = self.apply_envelope(tone, 0.02, 0.1, 0.7, 0.3)
-            final_chord += tone
-        
-        fanfare = np.concatenate([fanfare, final_chord])
+        steps.append([Note(note, 0.5, 0.4, 'sine', (0.02, 0.1, 0.7, 0.3)) for note in [523, 659, 784]])  # C major chord
         
-        return fanfare
+        return self.render_sequence(steps)
     
     def create_disaster_alarm(self):
         """Create a disaster warning sound"""
@@ -179,17 +615,13 @@ class SNESAudioGenerator:
         low_freq = 600
         duration = 0.3
         
-        high_tone = self.generate_tone(high_freq, duration, 0.6, 'square')
-        low_tone = self.generate_tone(low_freq, duration, 0.6, 'square')
-        
         # Apply sharp envelope for alarm effect
-        high_tone = self.apply_envelope(high_tone, 0.01, 0.1, 0.9, 0.05)
-        low_tone = self.apply_envelope(low_tone, 0.01, 0.1, 0.9, 0.05)
+        envelope = (0.01, 0.1, 0.9, 0.05)
+        high_tone = Note(high_freq, duration, 0.6, 'square', envelope)
+        low_tone = Note(low_freq, duration, 0.6, 'square', envelope)
         
         # Repeat pattern
-        alarm = np.concatenate([high_tone, low_tone, high_tone, low_tone])
-        
-        return alarm
+        return self.render_sequence([high_tone, low_tone, high_tone, low_tone])
     
     def create_bingo_correct(self):
         """Create a correct answer sound for Glen's bingo"""
@@ -197,15 +629,10 @@ class SNESAudioGenerator:
         notes = [523, 659, 784, 1047]  # C-E-G-C octave
         duration_per_note = 0.1
         
-        arpeggio = np.array([])
-        
-        for i, note in enumerate(notes):
-            amplitude = 0.5 - (i * 0.05)  # Gradually decrease volume
-            tone = self.generate_tone(note, duration_per_note, amplitude, 'sine')
-            tone = self.apply_envelope(tone, 0.01, 0.02, 0.9, 0.02)
-            arpeggio = np.concatenate([arpeggio, tone])
-        
-        return arpeggio
+        return self.render_sequence([
+            Note(note, duration_per_note, 0.5 - (i * 0.05), 'sine', (0.01, 0.02, 0.9, 0.02))  # Gradually decrease volume
+            for i, note in enumerate(notes)
+        ])
     
     def create_bingo_wrong(self):
         """Create a wrong answer sound for Glen's bingo"""
@@ -213,36 +640,312 @@ class SNESAudioGenerator:
         notes = [400, 350, 300]
         duration_per_note = 0.2
         
-        sad_sound = np.array([])
-        
-        for note in notes:
-            tone = self.generate_tone(note, duration_per_note, 0.4, 'sawtooth')
-            tone = self.apply_envelope(tone, 0.05, 0.1, 0.7, 0.3)
-            sad_sound = np.concatenate([sad_sound, tone])
-        
-        return sad_sound
+        return self.render_sequence([
+            Note(note, duration_per_note, 0.4, 'sawtooth', (0.05, 0.1, 0.7, 0.3)) for note in notes
+        ])
 
-# Generate all the wedding game sound effects
-def generate_wedding_sounds():
+def _alias_ratio_db(wave_data, frequency, sample_rate):
+    """Energy outside the harmonics of ``frequency`` relative to the total, in dB."""
+    spectrum = np.abs(np.fft.rfft(wave_data * np.blackman(len(wave_data)))) ** 2
+    bins = np.fft.rfftfreq(len(wave_data), 1 / sample_rate)
+    harmonic_offset = np.abs((bins / frequency) - np.round(bins / frequency)) * frequency
+    on_harmonic = (harmonic_offset <= 3 * sample_rate / len(wave_data)) & (bins >= frequency / 2)
+    return 10 * np.log10(spectrum[~on_harmonic].sum() / spectrum.sum() + 1e-20)
+
+def benchmark_oscillators(rounds=200, duration=0.5, frequency=1244.5):
+    """Compare direct and wavetable oscillators: ns per sample and aliasing."""
+    generator = SNESAudioGenerator()
+    out = np.empty(int(generator.sample_rate * duration))
+    print(f"{'wave':10s} {'direct ns/sample':>17s} {'table ns/sample':>16s} {'direct alias dB':>16s} {'table alias dB':>15s}")
+    for wave_type in ('sine', 'square', 'sawtooth', 'triangle'):
+        row = []
+        for variant in (wave_type, f"wt_{wave_type}"):
+            generator.generate_tone(frequency, duration, 1.0, variant, out=out)  # Warm caches
+            started = time.perf_counter()
+            for _ in range(rounds):
+                generator.generate_tone(frequency, duration, 1.0, variant, out=out)
+            elapsed = (time.perf_counter() - started) / rounds / len(out)
+            row.append((elapsed, _alias_ratio_db(out, frequency, generator.sample_rate)))
+        (direct_time, direct_alias), (table_time, table_alias) = row
+        print(f"{wave_type:10s} {direct_time * 1e9:17.2f} {table_time * 1e9:16.2f} "
+              f"{direct_alias:16.1f} {table_alias:15.1f}")
+
+def benchmark_streaming(minutes=(0.5, 2, 8)):
+    """Peak allocation of in-memory vs streamed rendering as track length grows."""
+    import tempfile
     generator = SNESAudioGenerator()
-    output_dir = "/home/joe/Documents/wedding-game-v7/assets/audio/sfx/"
-    
-    sounds = {
-        "wedding_bell_chime.wav": generator.create_wedding_bell(),
-        "success_chime.wav": generator.create_success_chime(),
-        "menu_select_snes.wav": generator.create_menu_select(),
-        "menu_confirm_snes.wav": generator.create_menu_confirm(),
-        "celebration_fanfare.wav": generator.create_celebration_fanfare(),
-        "disaster_alarm.wav": generator.create_disaster_alarm(),
-        "bingo_correct.wav": generator.create_bingo_correct(),
-        "bingo_wrong.wav": generator.create_bingo_wrong(),
-    }
-    
-    for filename, wave_data in sounds.items():
-        filepath = output_dir + filename
-        generator.save_wav(wave_data, filepath)
-        print(f"Generated: {filename}")
+    phrase = load_score(Path(__file__).parent / "sfx_scores" / "celebration_fanfare.json")
+    phrase_seconds = len(generator.render_score(phrase)) / generator.sample_rate
+    
+    print(f"{'minutes':>8s} {'in-memory MB':>13s} {'streamed MB':>12s} {'in-memory s':>12s} {'streamed s':>11s}")
+    with tempfile.TemporaryDirectory() as scratch:
+        output_path = os.path.join(scratch, "track.wav")
+        for length in minutes:
+            track = {**phrase, 'repeat': max(1, round(length * 60 / phrase_seconds))}
+            row = []
+            for render in (lambda: generator.save_wav(generator.render_score(track), output_path),
+                           lambda: generator.save_wav_stream(generator.iter_score_blocks(track), output_path)):
+                tracemalloc.start()
+                started = time.perf_counter()
+                render()
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                row.append((peak, elapsed))
+            (memory_peak, memory_time), (stream_peak, stream_time) = row
+            print(f"{length:8g} {memory_peak / 2 ** 20:13.1f} {stream_peak / 2 ** 20:12.1f} "
+                  f"{memory_time:12.2f} {stream_time:11.2f}")
+
+def load_score(path: Path) -> Dict:
+    """Read a JSON or TOML score file."""
+    path = Path(path)
+    if path.suffix == '.toml':
+        if tomllib is None:
+            raise RuntimeError("TOML scores need Python 3.11+ (or use JSON)")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def score_hash(score: Dict) -> str:
+    """Content hash of a score (after variant expansion)."""
+    canonical = json.dumps(score, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def wav_signature(path: Path) -> Optional[List[int]]:
+    """[size, mtime_ns] of an output WAV, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def manifest_entry(score_digest: str, output_path: Path) -> Dict:
+    """What .score_manifest.json records for one rendered output."""
+    return {'score': score_digest, 'renderer': RENDERER_VERSION, 'wav': wav_signature(output_path)}
+
+def find_scores(paths: List[str]) -> List[Path]:
+    """Expand files and directories into a sorted list of score files."""
+    scores = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            scores.extend(sorted(p for p in path.iterdir() if p.suffix in ('.json', '.toml')))
+        else:
+            scores.append(path)
+    return scores
+
+def expand_variants(score: Dict, output_name: str) -> List[Tuple[str, Dict]]:
+    """Expand a score's ``variants`` block into (output name, score) pairs.
+    
+    ``{"pitch": [0.9, 1.1], "tempo": [1.0, 1.25]}`` yields every pitch/tempo
+    combination, written as ``<name>_p0.9_t1.25.wav``. Scores without
+    variants yield themselves.
+    """
+    variants = score.get('variants')
+    if not variants:
+        return [(output_name, score)]
+    base = {k: v for k, v in score.items() if k != 'variants'}
+    stem, suffix = os.path.splitext(output_name)
+    expanded = []
+    for pitch in variants.get('pitch', [1.0]):
+        for tempo in variants.get('tempo', [1.0]):
+            expanded.append((f"{stem}_p{pitch:g}_t{tempo:g}{suffix}", {**base, 'pitch': pitch, 'tempo': tempo}))
+    return expanded
+
+# Built-in effects rendered by generate_wedding_sounds: output name -> create_* method
+BUILTIN_EFFECTS = {
+    "wedding_bell_chime.wav": "create_wedding_bell",
+    "success_chime.wav": "create_success_chime",
+    "menu_select_snes.wav": "create_menu_select",
+    "menu_confirm_snes.wav": "create_menu_confirm",
+    "celebration_fanfare.wav": "create_celebration_fanfare",
+    "disaster_alarm.wav": "create_disaster_alarm",
+    "bingo_correct.wav": "create_bingo_correct",
+    "bingo_wrong.wav": "create_bingo_wrong",
+}
+
+# One generator (and its caches) per sample rate, per process
+_generators: Dict[int, SNESAudioGenerator] = {}
+
+def _generator(sample_rate: int) -> SNESAudioGenerator:
+    if sample_rate not in _generators:
+        _generators[sample_rate] = SNESAudioGenerator(sample_rate)
+    return _generators[sample_rate]
+
+def pcm_digest(wave_data) -> str:
+    """SHA-256 of the 16-bit PCM frames ``save_wav`` would write."""
+    return hashlib.sha256(np.int16(wave_data * 32767).tobytes()).hexdigest()
+
+def wav_digest(path: Path) -> Optional[str]:
+    """SHA-256 of a WAV file's frames, or None if it cannot be read."""
+    try:
+        with wave.open(str(path), 'rb') as wav_file:
+            return hashlib.sha256(wav_file.readframes(wav_file.getnframes())).hexdigest()
+    except (OSError, EOFError, wave.Error):
+        return None
+
+def _render_job(output_path: str, source: Union[str, Dict], check: bool = False) -> Tuple[str, float, Optional[bool]]:
+    """Render one sound: ``source`` is a score or a create_* method name.
+    
+    Runs in a worker process, so only the path, the timing and (when
+    checking) whether the render matches the file on disk travel back.
+    """
+    started = time.perf_counter()
+    if isinstance(source, str):
+        generator = _generator(22050)
+        wave_data = getattr(generator, source)()
+    elif source.get('stream'):
+        # Long tracks: render block by block without holding the waveform
+        generator = _generator(source.get('sample_rate', 22050))
+        blocks = generator.iter_score_blocks(source)
+        if check:
+            hasher = hashlib.sha256()
+            for block in blocks:
+                hasher.update((block * np.float32(32767)).astype(np.int16).tobytes())
+            matches = hasher.hexdigest() == wav_digest(Path(output_path))
+        else:
+            generator.save_wav_stream(blocks, output_path)
+            matches = None
+        return output_path, time.perf_counter() - started, matches
+    else:
+        generator = _generator(source.get('sample_rate', 22050))
+        wave_data = generator.render_score(source)
+    
+    matches = None
+    if check:
+        matches = pcm_digest(wave_data) == wav_digest(Path(output_path))
+    else:
+        generator.save_wav(wave_data, output_path)
+    return output_path, time.perf_counter() - started, matches
+
+def run_jobs(jobs: List[Tuple[str, Union[str, Dict]]], workers: int = 1, check: bool = False) -> Iterator[Tuple[str, float, Optional[bool]]]:
+    """Render (output path, source) jobs, yielding results as each one finishes.
+    
+    With ``workers > 1`` every sound is rendered and written by a pool
+    worker, so peak memory is one waveform per worker instead of the whole
+    set, and results arrive in completion order.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for output_path, source in jobs:
+            yield _render_job(output_path, source, check)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_job, output_path, source, check) for output_path, source in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _report_check(results: Iterator[Tuple[str, float, Optional[bool]]]) -> bool:
+    """Print one line per checked sound; True if every render matched its file."""
+    mismatched = []
+    for output_path, _, matches in results:
+        if not matches:
+            mismatched.append(Path(output_path).name)
+            print(f"MISMATCH: {Path(output_path).name}")
+    if mismatched:
+        print(f"{len(mismatched)} sounds differ from the files on disk")
+        return False
+    print("All renders match the files on disk")
+    return True
+
+def render_scores(score_paths: List[Path], output_root: Path = DEFAULT_OUTPUT_ROOT, force: bool = False,
+                  workers: int = 1, check: bool = False) -> bool:
+    """Render many scores (and their variants), skipping unchanged ones.
+    
+    ``<output_root>/.score_manifest.json`` records, per output, the score's
+    hash, RENDERER_VERSION and the WAV's size and mtime. A score is skipped
+    only when all three still match, so edited scores, a bumped renderer and
+    WAVs overwritten by something else are re-rendered.
+    With ``check=True`` nothing is written: every score is re-rendered and
+    compared frame for frame with its WAV on disk. Returns False on a mismatch.
+    """
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_root / ".score_manifest.json"
+    manifest = {}
+    if manifest_file.exists():
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+    
+    jobs = []
+    digests = {}
+    skipped = 0
+    for path in score_paths:
+        score = load_score(path)
+        for output_name, variant in expand_variants(score, score.get('output', f"{path.stem}.wav")):
+            output_path = output_root / output_name
+            digest = score_hash(variant)
+            if not check and not force and manifest.get(output_name) == manifest_entry(digest, output_path):
+                skipped += 1
+                continue
+            jobs.append((str(output_path), variant))
+            digests[str(output_path)] = (output_name, digest)
+    
+    if check:
+        return _report_check(run_jobs(jobs, workers, check=True))
+    
+    rendered = 0
+    try:
+        for output_path, elapsed, _ in run_jobs(jobs, workers):
+            output_name, digest = digests[output_path]
+            manifest[output_name] = manifest_entry(digest, Path(output_path))
+            rendered += 1
+            print(f"Generated: {output_name} ({elapsed * 1000:.0f} ms)")
+    finally:
+        # Keep what finished even if a later score fails
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Rendered {rendered} scores, {skipped} unchanged")
+    return True
+
+# Generate all the wedding game sound effects
+def generate_wedding_sounds(output_root: Path = DEFAULT_OUTPUT_ROOT, workers: int = 1, check: bool = False) -> bool:
+    output_dir = Path(output_root)
+    jobs = [(str(output_dir / filename), effect) for filename, effect in BUILTIN_EFFECTS.items()]
+    
+    if check:
+        return _report_check(run_jobs(jobs, workers, check=True))
+    for output_path, elapsed, _ in run_jobs(jobs, workers):
+        print(f"Generated: {Path(output_path).name} ({elapsed * 1000:.0f} ms)")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Render SNES-style sound effects')
+    parser.add_argument('scores', nargs='*',
+                       help='Score files or directories to render (default: the built-in wedding set)')
+    parser.add_argument('--output-root', type=str, default=str(DEFAULT_OUTPUT_ROOT),
+                       help=f'Directory to write WAV files to (default: {DEFAULT_OUTPUT_ROOT})')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render scores even if unchanged')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Render in this many worker processes (default: 1, 0 = one per CPU)')
+    parser.add_argument('--check', action='store_true',
+                       help='Re-render without writing and verify the WAVs on disk match exactly')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='Report time and peak allocation per effect, then exit')
+    parser.add_argument('--benchmark-oscillators', action='store_true',
+                       help='Compare direct and wavetable oscillators (speed and aliasing), then exit')
+    parser.add_argument('--benchmark-streaming', action='store_true',
+                       help='Compare peak memory of in-memory and streamed rendering, then exit')
+    args = parser.parse_args()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
+    if args.benchmark:
+        from bench_snes_effects import benchmark_effects
+        benchmark_effects()
+    elif args.benchmark_oscillators:
+        benchmark_oscillators()
+    elif args.benchmark_streaming:
+        benchmark_streaming()
+    elif args.scores:
+        ok = render_scores(find_scores(args.scores), Path(args.output_root), force=args.force,
+                           workers=workers, check=args.check)
+        sys.exit(0 if ok else 1)
+    else:
+        ok = generate_wedding_sounds(Path(args.output_root), workers=workers, check=args.check)
+        if not args.check:
+            print("All SNES-style wedding sound effects generated successfully!")
+        sys.exit(0 if ok else 1)
 
 if __name__ == "__main__":
-    generate_wedding_sounds()
-    print("All SNES-style wedding sound effects generated successfully!")
\ No newline at end of file
+    main()
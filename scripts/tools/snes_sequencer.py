@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+SNES-Style Music Sequencer for Wedding Game
+Composes background music from patterns and tracks using the SNES audio generator
+
+Usage:
+    python snes_sequencer.py music_scores/wedding_theme.json           # Render to assets/audio/music
+    python snes_sequencer.py song.json --output-root=/tmp/music        # Write somewhere else
+    python snes_sequencer.py music_scores/ --benchmark                 # Real-time factor per song
+
+Features:
+- Songs are JSON: a tempo, named patterns of notes in beats, and tracks that
+  play patterns in order with their own instrument, gain and pan
+- Sample-accurate: note starts are computed in frames from the tempo, not by
+  concatenating note buffers
+- Every voice is mixed straight into one preallocated float32 stereo bus
+- Voice limit (8 by default, like the SNES DSP); the oldest voice is cut when
+  a new note needs a channel
+"""
+
+import os
+import json
+import time
+import wave
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from snes_audio_generator import SNESAudioGenerator, note_frequency
+
+# Default destination: <repo>/assets/audio/music
+DEFAULT_OUTPUT_ROOT = Path(__file__).resolve().parents[2] / "assets" / "audio" / "music"
+
+SNES_VOICES = 8
+
+# Short fade applied where a stolen voice is cut, to avoid clicks
+STEAL_FADE_FRAMES = 64
+
+class PatternNote(NamedTuple):
+    """A note inside a pattern, positioned and sized in beats."""
+    beat: float
+    frequency: float
+    length: float
+    velocity: float = 1.0
+
+class ScheduledNote(NamedTuple):
+    """A note placed on the song timeline, in frames."""
+    start: int
+    frames: int
+    frequency: float
+    velocity: float
+    track: int
+
+class Pattern:
+    def __init__(self, name: str, length: float, notes: List[PatternNote]):
+        self.name = name
+        self.length = length  # In beats
+        self.notes = notes
+
+    @classmethod
+    def from_dict(cls, name: str, spec: Dict) -> 'Pattern':
+        """Notes are ``[beat, note, length]`` or ``[beat, note, length, velocity]``."""
+        notes = [PatternNote(entry[0], note_frequency(entry[1]), entry[2], *entry[3:4]) for entry in spec['notes']]
+        length = spec.get('length', max((note.beat + note.length for note in notes), default=0))
+        return cls(name, length, notes)
+
+class Track:
+    def __init__(self, name: str, sequence: List[str], wave_type: str = 'square',
+                 envelope: Optional[Tuple[float, float, float, float]] = None,
+                 gain: float = 0.5, pan: float = 0.0, transpose: int = 0):
+        self.name = name
+        self.sequence = sequence  # Pattern names played back to back
+        self.wave_type = wave_type
+        self.envelope = envelope
+        self.gain = gain
+        self.pan = pan  # -1 (left) .. 1 (right)
+        self.transpose = transpose  # Semitones
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'Track':
+        envelope = spec.get('envelope')
+        return cls(spec['name'], spec['sequence'], spec.get('wave', 'square'),
+                   tuple(envelope) if envelope else None, spec.get('gain', 0.5),
+                   spec.get('pan', 0.0), spec.get('transpose', 0))
+
+    def pan_gains(self) -> Tuple[float, float]:
+        """Constant-power left/right gains for this track's pan position."""
+        angle = (min(max(self.pan, -1.0), 1.0) + 1) * np.pi / 4
+        return self.gain * np.cos(angle), self.gain * np.sin(angle)
+
+class Song:
+    def __init__(self, tempo: float, patterns: Dict[str, Pattern], tracks: List[Track],
+                 sample_rate: int = 22050, max_voices: int = SNES_VOICES, output: Optional[str] = None):
+        self.tempo = tempo  # Beats per minute
+        self.patterns = patterns
+        self.tracks = tracks
+        self.sample_rate = sample_rate
+        self.max_voices = max_voices
+        self.output = output
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'Song':
+        patterns = {name: Pattern.from_dict(name, pattern) for name, pattern in spec['patterns'].items()}
+        tracks = [Track.from_dict(track) for track in spec['tracks']]
+        for track in tracks:
+            missing = [name for name in track.sequence if name not in patterns]
+            if missing:
+                raise ValueError(f"Track '{track.name}' uses unknown patterns: {', '.join(missing)}")
+        return cls(spec.get('tempo', 120), patterns, tracks, spec.get('sample_rate', 22050),
+                   spec.get('max_voices', SNES_VOICES), spec.get('output'))
+
+    @classmethod
+    def load(cls, path: Path) -> 'Song':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def beat_frames(self, beats: float) -> int:
+        return int(round(beats * 60 / self.tempo * self.sample_rate))
+
+    def schedule(self) -> List[ScheduledNote]:
+        """Every note of every track on one timeline, sorted by start frame."""
+        notes = []
+        for track_index, track in enumerate(self.tracks):
+            transpose = 2 ** (track.transpose / 12)
+            beat = 0.0
+            for pattern_name in track.sequence:
+                pattern = self.patterns[pattern_name]
+                for note in pattern.notes:
+                    if note.frequency == 0:
+                        continue  # Rest
+                    start = self.beat_frames(beat + note.beat)
+                    frames = self.beat_frames(beat + note.beat + note.length) - start
+                    if frames > 0:
+                        notes.append(ScheduledNote(start, frames, note.frequency * transpose,
+                                                   note.velocity, track_index))
+                beat += pattern.length
+        notes.sort(key=lambda note: (note.start, note.track))
+        return notes
+
+    def length_frames(self) -> int:
+        beats = max((sum(self.patterns[name].length for name in track.sequence) for track in self.tracks), default=0)
+        return self.beat_frames(beats)
+
+def allocate_voices(notes: List[ScheduledNote], max_voices: int) -> Tuple[List[int], int]:
+    """Assign notes to a fixed number of voices, cutting the oldest when full.
+
+    Returns the number of frames each note actually sounds for and how many
+    notes were cut short.
+    """
+    sounding_frames = [note.frames for note in notes]
+    active: List[int] = []  # Indices of notes holding a voice, oldest first
+    stolen = 0
+    for index, note in enumerate(notes):
+        active = [i for i in active if notes[i].start + sounding_frames[i] > note.start]
+        if len(active) >= max_voices:
+            oldest = active.pop(0)
+            sounding_frames[oldest] = note.start - notes[oldest].start
+            stolen += 1
+        active.append(index)
+    return sounding_frames, stolen
+
+class Sequencer:
+    def __init__(self, song: Song):
+        self.song = song
+        self.generator = SNESAudioGenerator(song.sample_rate)
+        self.stats = {'notes': 0, 'stolen_voices': 0, 'peak_voices': 0}
+
+    def render(self) -> np.ndarray:
+        """Render the song to a float32 stereo bus of shape (frames, 2)."""
+        song = self.song
+        notes = song.schedule()
+        sounding_frames, stolen = allocate_voices(notes, song.max_voices)
+
+        end = max((note.start + note.frames for note in notes), default=0)
+        bus = np.zeros((max(end, song.length_frames()), 2), dtype=np.float32)
+        voice = np.empty(max((note.frames for note in notes), default=0))
+        scaled = np.empty(len(voice), dtype=np.float32)
+        gains = [track.pan_gains() for track in song.tracks]
+
+        for note, frames in zip(notes, sounding_frames):
+            if frames <= 0:
+                continue
+            track = song.tracks[note.track]
+            # Render the whole note so its envelope keeps its shape, then mix what sounds
+            tone = self.generator.generate_tone_block(note.frequency, note.frames / song.sample_rate,
+                                                      note.velocity, track.wave_type, 0, voice[:note.frames])
+            if track.envelope:
+                tone = self.generator.apply_envelope(tone, *track.envelope, in_place=True)
+            tone = tone[:frames]
+            if frames < note.frames:
+                fade = min(STEAL_FADE_FRAMES, frames)
+                tone[frames - fade:] *= np.linspace(1, 0, fade)
+
+            left_gain, right_gain = gains[note.track]
+            target = bus[note.start:note.start + frames]
+            np.multiply(tone, left_gain, out=scaled[:frames])
+            target[:, 0] += scaled[:frames]
+            np.multiply(tone, right_gain, out=scaled[:frames])
+            target[:, 1] += scaled[:frames]
+
+        self.stats['notes'] = len(notes)
+        self.stats['stolen_voices'] = stolen
+        self.stats['peak_voices'] = peak_polyphony(notes, sounding_frames)
+        return bus
+
+def peak_polyphony(notes: List[ScheduledNote], sounding_frames: List[int]) -> int:
+    """Largest number of notes sounding at the same frame."""
+    changes = sorted([(note.start, 1) for note, frames in zip(notes, sounding_frames) if frames > 0] +
+                     [(note.start + frames, -1) for note, frames in zip(notes, sounding_frames) if frames > 0])
+    peak = current = 0
+    for _, change in changes:
+        current += change
+        peak = max(peak, current)
+    return peak
+
+def save_stereo_wav(bus: np.ndarray, filename: str, sample_rate: int):
+    """Write a (frames, 2) float bus as a 16-bit stereo WAV, clipping overs."""
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    np.clip(bus, -1.0, 1.0, out=bus)
+    pcm = (bus * np.float32(32767)).astype(np.int16)  # Row-major, so frames stay interleaved L/R
+    with wave.open(filename, 'w') as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+def find_songs(paths: List[str]) -> List[Path]:
+    songs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            songs.extend(sorted(path.glob('*.json')))
+        else:
+            songs.append(path)
+    return songs
+
+def benchmark_songs(song_paths: List[Path], rounds: int = 5):
+    """Report render speed as a real-time factor (seconds of audio per second of CPU)."""
+    print(f"{'song':28s} {'length s':>9s} {'notes':>6s} {'render ms':>10s} {'realtime x':>11s}")
+    for path in song_paths:
+        sequencer = Sequencer(Song.load(path))
+        bus = sequencer.render()  # Warm caches
+        started = time.perf_counter()
+        for _ in range(rounds):
+            sequencer.render()
+        elapsed = (time.perf_counter() - started) / rounds
+        seconds = len(bus) / sequencer.song.sample_rate
+        print(f"{path.stem:28s} {seconds:9.1f} {sequencer.stats['notes']:6d} "
+              f"{elapsed * 1000:10.1f} {seconds / elapsed:11.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Render SNES-style music from pattern/track songs')
+    parser.add_argument('songs', nargs='+', help='Song files or directories of songs')
+    parser.add_argument('--output-root', type=str, default=str(DEFAULT_OUTPUT_ROOT),
+                       help=f'Directory to write WAV files to (default: {DEFAULT_OUTPUT_ROOT})')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='Report render time and real-time factor instead of writing files')
+    args = parser.parse_args()
+
+    song_paths = find_songs(args.songs)
+    if args.benchmark:
+        benchmark_songs(song_paths)
+        return
+
+    for path in song_paths:
+        song = Song.load(path)
+        sequencer = Sequencer(song)
+        started = time.perf_counter()
+        bus = sequencer.render()
+        elapsed = time.perf_counter() - started
+        output_path = Path(args.output_root) / (song.output or f"{path.stem}.wav")
+        save_stereo_wav(bus, str(output_path), song.sample_rate)
+        stats = sequencer.stats
+        print(f"🎵 {output_path.name}: {len(bus) / song.sample_rate:.1f}s, {stats['notes']} notes, "
+              f"peak {stats['peak_voices']} voices, {stats['stolen_voices']} stolen ({elapsed * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
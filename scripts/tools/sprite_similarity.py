@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Sprite Similarity Index
+Finds near-duplicate images with perceptual hashes and a multi-index hash table
+
+Usage:
+    python sprite_similarity.py                                  # assets/graphics/characters
+    python sprite_similarity.py ./downloaded_art --threshold=6 --jobs=8
+    python sprite_similarity.py --report=clusters.json --hash=dhash
+
+Features:
+- dHash (gradient) and pHash (DCT) for every image, computed for whole batches
+  at once with NumPy: one resize per image, then array maths for all of them
+- Incremental: hashes are cached by path, mtime and size; only new or changed
+  files are decoded again
+- Multi-index hash table over the 64-bit hashes: images are only compared
+  when they agree exactly on one of threshold + 1 hash chunks, so finding
+  near-duplicates does not compare every image against every other
+- Near-duplicates are grouped into clusters (connected components of the
+  "within threshold" graph)
+"""
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[2] / "assets" / "graphics" / "characters"
+CACHE_NAME = ".sprite_hashes.json"
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
+
+HASH_SIZE = 8  # 8x8 bits = 64-bit hashes
+PHASH_SIZE = 32  # pHash DCT input size
+
+# Transparent pixels are flattened onto grey so sprites with and without an
+# alpha channel hash alike
+BACKGROUND = (128, 128, 128, 255)
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, so the 2-D DCT of X is D @ X @ D.T."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+DCT_MATRIX = _dct_matrix(PHASH_SIZE)
+
+def load_thumbnails(path: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Greyscale thumbnails for both hashes: (9x8 for dHash, 32x32 for pHash)."""
+    try:
+        with Image.open(path) as image:
+            image.draft('RGB', (PHASH_SIZE * 2, PHASH_SIZE * 2))  # JPEG: decode at reduced size
+            if image.mode in ('RGBA', 'LA', 'P') or 'transparency' in image.info:
+                image = image.convert('RGBA')
+                flattened = Image.new('RGBA', image.size, BACKGROUND)
+                flattened.alpha_composite(image)
+                image = flattened
+            grey = image.convert('L')
+            small = grey.resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR)
+            large = grey.resize((PHASH_SIZE, PHASH_SIZE), Image.BILINEAR)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    return np.asarray(small, dtype=np.float32), np.asarray(large, dtype=np.float32)
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """(n, 64) booleans to n unsigned 64-bit integers, first bit most significant."""
+    return np.packbits(bits, axis=1).view('>u8').ravel().astype(np.uint64)
+
+def dhash_batch(small: np.ndarray) -> np.ndarray:
+    """Difference hashes for a (n, 8, 9) stack: is each pixel brighter than its right neighbour?"""
+    return _pack_bits((small[:, :, :-1] > small[:, :, 1:]).reshape(len(small), -1))
+
+def phash_batch(large: np.ndarray) -> np.ndarray:
+    """DCT hashes for a (n, 32, 32) stack: low frequencies above or below their median."""
+    low = DCT_MATRIX[:HASH_SIZE]
+    coefficients = np.einsum('ij,njk,lk->nil', low, large, low).reshape(len(large), -1)
+    # The DC term is only overall brightness; leave it out of the median
+    median = np.median(coefficients[:, 1:], axis=1, keepdims=True)
+    return _pack_bits(coefficients > median)
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits of each uint64 (SWAR bit counting, vectorized)."""
+    values = values - ((values >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    values = (values & np.uint64(0x3333333333333333)) + ((values >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    values = (values + (values >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((values * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+class MultiIndexHash:
+    """Multi-index hash table for Hamming-distance search over 64-bit hashes.
+
+    Hashes are split into threshold + 1 disjoint chunks. Two hashes within
+    the threshold must agree exactly on at least one chunk (pigeonhole), so
+    only hashes sharing a chunk value are ever compared. Exact duplicates
+    are indexed once: ``values`` holds the distinct hashes and ``inverse``
+    maps every input hash to its entry there.
+    """
+    def __init__(self, hashes: np.ndarray, threshold: int):
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.threshold = threshold
+        self.values, inverse = np.unique(self.hashes, return_inverse=True)
+        self.inverse = inverse.ravel()
+        # Input indices grouped by value: by_value[value_starts[v]:value_starts[v + 1]]
+        self.by_value = np.argsort(self.inverse, kind='stable')
+        self.value_starts = np.searchsorted(self.inverse[self.by_value], np.arange(len(self.values) + 1))
+        chunks = min(threshold + 1, 64)
+        bounds = np.linspace(0, 64, chunks + 1).astype(int)
+        self.tables = []  # (shift, mask, sorted chunk values, order)
+        for low, high in zip(bounds[:-1], bounds[1:]):
+            shift, mask = np.uint64(low), np.uint64((1 << int(high - low)) - 1)
+            keys = (self.values >> shift) & mask
+            order = np.argsort(keys, kind='stable')
+            self.tables.append((shift, mask, keys[order], order))
+        self.compared = 0
+
+    def query(self, value: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and distances of every hash within the threshold of value."""
+        value = np.uint64(value)
+        candidates = []
+        for shift, mask, keys, order in self.tables:
+            key = (value >> shift) & mask
+            candidates.append(order[np.searchsorted(keys, key, 'left'):np.searchsorted(keys, key, 'right')])
+        candidates = np.unique(np.concatenate(candidates)) if candidates else np.empty(0, dtype=np.intp)
+        self.compared += len(candidates)
+        distances = popcount(self.values[candidates] ^ value)
+        close = distances <= self.threshold
+        members = [self.by_value[self.value_starts[v]:self.value_starts[v + 1]] for v in candidates[close].tolist()]
+        counts = np.diff(self.value_starts)[candidates[close]]
+        return (np.concatenate(members) if members else np.empty(0, dtype=np.intp),
+                np.repeat(distances[close], counts))
+
+    def pairs(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Every pair of distinct values within the threshold, as indices into ``values``, in batches.
+
+        Each pair is yielded once, by the first table whose chunk both agree on.
+        """
+        for number, (_, _, keys, order) in enumerate(self.tables):
+            offset = 1
+            # Pair each hash with the ones `offset` places later in the same bucket
+            while offset < len(keys):
+                same = np.flatnonzero(keys[offset:] == keys[:-offset])
+                if not len(same):
+                    break
+                first, second = order[same], order[same + offset]
+                self.compared += len(same)
+                difference = self.values[first] ^ self.values[second]
+                keep = popcount(difference) <= self.threshold
+                for shift, mask, _, _ in self.tables[:number]:
+                    keep &= ((difference >> shift) & mask) != 0  # Already yielded by that table
+                yield first[keep], second[keep]
+                offset += 1
+
+def find_images(root: Path) -> List[Path]:
+    return sorted(path for path in root.rglob('*')
+                  if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file())
+
+class SimilarityIndex:
+    def __init__(self, root: Path, cache_path: Optional[Path] = None, workers: Optional[int] = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else self.root / CACHE_NAME
+        self.workers = workers or os.cpu_count() or 1
+        self.entries: Dict[str, Dict] = {}  # Relative path -> mtime_ns, size, dhash, phash
+        self.stats = {'images': 0, 'hashed': 0, 'cached': 0, 'unreadable': 0}
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.entries}, f)
+
+    def update(self, chunk_size: int = 256) -> Dict[str, int]:
+        """Hash new or changed images and drop deleted ones from the cache."""
+        cached = self._load_cache()
+        pending = []
+        for path in find_images(self.root):
+            relative = path.relative_to(self.root).as_posix()
+            stat = path.stat()
+            entry = cached.get(relative)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                self.entries[relative] = entry
+                self.stats['cached'] += 1
+            else:
+                pending.append((relative, path, stat))
+        self.stats['images'] = len(self.entries) + len(pending)
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 and len(pending) > 1 else None
+        try:
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start:start + chunk_size]
+                paths = [str(path) for _, path, _ in chunk]
+                if pool:
+                    thumbnails = list(pool.map(load_thumbnails, paths, chunksize=8))
+                else:
+                    thumbnails = [load_thumbnails(path) for path in paths]
+                readable = [(item, thumbs) for item, thumbs in zip(chunk, thumbnails) if thumbs is not None]
+                self.stats['unreadable'] += len(chunk) - len(readable)
+                if not readable:
+                    continue
+                dhashes = dhash_batch(np.stack([thumbs[0] for _, thumbs in readable]))
+                phashes = phash_batch(np.stack([thumbs[1] for _, thumbs in readable]))
+                for ((relative, _, stat), _), dhash, phash in zip(readable, dhashes, phashes):
+                    self.entries[relative] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                              'dhash': f"{int(dhash):016x}", 'phash': f"{int(phash):016x}"}
+                    self.stats['hashed'] += 1
+        finally:
+            if pool:
+                pool.shutdown()
+        self._save_cache()
+        return self.stats
+
+    def hash_array(self, hash_name: str = 'phash') -> Tuple[List[str], np.ndarray]:
+        paths = sorted(self.entries)
+        return paths, np.array([int(self.entries[path][hash_name], 16) for path in paths], dtype=np.uint64)
+
+    def clusters(self, threshold: int = 8, hash_name: str = 'phash') -> List[List[Tuple[str, int]]]:
+        """Groups of images linked by hashes within threshold, largest first.
+
+        Each member is reported with its distance to the cluster's first image.
+        """
+        paths, hashes = self.hash_array(hash_name)
+        table = MultiIndexHash(hashes, threshold)
+        # Identical hashes join their value's first image directly (it is its own parent)
+        representative = table.by_value[table.value_starts[:-1]]
+        parent = representative[table.inverse].tolist()
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for first, second in table.pairs():
+            for a, b in zip(representative[first].tolist(), representative[second].tolist()):
+                a, b = find(a), find(b)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(paths)):
+            groups.setdefault(find(i), []).append(i)
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            distances = popcount(hashes[members] ^ hashes[members[0]])
+            result.append([(paths[i], int(distance)) for i, distance in zip(members, distances)])
+        self.stats['compared_pairs'] = table.compared
+        return sorted(result, key=len, reverse=True)
+
+def _pair_set(first: np.ndarray, second: np.ndarray) -> set:
+    return set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+
+def benchmark_pairs(hashes: np.ndarray, threshold: int, label: str):
+    """Time finding every near-duplicate pair: multi-index table against a linear scan.
+
+    Pairs are compared between distinct hash values; exact duplicates are
+    grouped without pairing them.
+    """
+    started = time.perf_counter()
+    table = MultiIndexHash(hashes, threshold)
+    found_index = set()
+    yielded = 0
+    for first, second in table.pairs():
+        found_index |= _pair_set(first, second)
+        yielded += len(first)
+    index_time = time.perf_counter() - started
+
+    values = table.values
+    started = time.perf_counter()
+    found_linear = set()
+    for i in range(len(values) - 1):
+        close = np.flatnonzero(popcount(values[i + 1:] ^ values[i]) <= threshold) + i + 1
+        found_linear |= _pair_set(np.full(len(close), i), close)
+    linear_time = time.perf_counter() - started
+
+    print(f"⏱️  {label}: {len(hashes)} hashes ({len(hashes) - len(values)} exact duplicates), "
+          f"all pairs at distance <= {threshold}: "
+          f"multi-index {index_time * 1000:.0f} ms ({table.compared} comparisons), "
+          f"linear scan {linear_time * 1000:.0f} ms ({len(values) * (len(values) - 1) // 2} comparisons); "
+          f"{'same' if found_index == found_linear else 'DIFFERENT'} pairs ({len(found_index)}, "
+          f"{yielded - len(found_index)} repeated)")
+
+def synthetic_hashes(count: int, variants: int = 4, max_flips: int = 4, seed: int = 0) -> np.ndarray:
+    """Random hashes in groups of near-duplicates, to benchmark at mirror scale."""
+    rng = np.random.default_rng(seed)
+    bases = rng.integers(0, 2 ** 63, count // variants, dtype=np.uint64) * np.uint64(2) + rng.integers(0, 2, count // variants, dtype=np.uint64)
+    hashes = np.repeat(bases, variants)
+    for i in range(len(hashes)):
+        for bit in rng.choice(64, rng.integers(0, max_flips + 1), replace=False):
+            hashes[i] ^= np.uint64(1) << np.uint64(bit)
+    return hashes
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate images with perceptual hashes')
+    parser.add_argument('root', nargs='?', default=str(DEFAULT_ROOT),
+                       help=f'Folder to index (default: {DEFAULT_ROOT})')
+    parser.add_argument('--threshold', type=int, default=8,
+                       help='Maximum Hamming distance between near-duplicates (default: 8 of 64 bits)')
+    parser.add_argument('--hash', choices=['phash', 'dhash'], default='phash',
+                       help='Hash used for matching (default: phash)')
+    parser.add_argument('--cache', type=str, default=None,
+                       help=f'Hash cache file (default: <root>/{CACHE_NAME})')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Worker processes for decoding images (default: CPU count)')
+    parser.add_argument('--report', type=str, default=None,
+                       help='Also write the clusters to this JSON file')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='Time near-duplicate search against a linear scan (also on 20k synthetic hashes)')
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ Folder not found: {root}")
+        return
+
+    index = SimilarityIndex(root, args.cache, args.jobs or None)
+    started = time.perf_counter()
+    stats = index.update()
+    print(f"🔍 {stats['images']} images: {stats['hashed']} hashed, {stats['cached']} from cache, "
+          f"{stats['unreadable']} unreadable ({time.perf_counter() - started:.2f}s)")
+
+    clusters = index.clusters(args.threshold, args.hash)
+    print(f"🧬 {len(clusters)} clusters of near-duplicates ({args.hash}, distance <= {args.threshold}):")
+    for number, members in enumerate(clusters, 1):
+        print(f"  Cluster {number} ({len(members)} images):")
+        for member, distance in members:
+            print(f"    {distance:2d}  {member}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'root': str(root), 'hash': args.hash, 'threshold': args.threshold,
+                       'clusters': [[{'path': member, 'distance': distance} for member, distance in members]
+                                    for members in clusters]}, f, indent=2)
+        print(f"📄 Report written to {args.report}")
+
+    if args.benchmark:
+        benchmark_pairs(index.hash_array(args.hash)[1], args.threshold, root.name)
+        synthetic = synthetic_hashes(20000)
+        benchmark_pairs(synthetic, args.threshold, 'synthetic')
+        benchmark_pairs(np.concatenate([synthetic, np.repeat(synthetic[:1], 3000)]), args.threshold,
+                        'synthetic + 3000 identical')
+
+if __name__ == "__main__":
+    main()
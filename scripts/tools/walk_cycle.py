@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Walk cycle generator shared by create_walking_spritesheet.py and create_joe_variants.py
+Turns a single character sprite into a walking strip with bob and squash frames
+
+Features:
+- Frames are derived with NumPy row remapping on the decoded sprite: the body
+  squashes onto its feet on the contact frames and bobs up on the passing frames
+- All frames of a strip come from one fancy-indexing gather, no per-pixel loops
+- A batch decodes each source sprite once and encodes the strips in a process pool
+"""
+
+import os
+import time
+import numpy as np
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+def cycle_poses(frames: int = 4, bob: int = 1, squash: int = 1, height: int = 32) -> List[Tuple[int, float]]:
+    """(lift in pixels, vertical scale) per frame: contact, down (squash), passing (bob up), down."""
+    squashed = (height - squash) / height
+    half = [(0, 1.0), (0, squashed), (bob, 1.0), (0, squashed)]
+    return [half[i * len(half) // frames] for i in range(frames)]
+
+def fit_to_frame(sprite: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Place the sprite at the frame's top-left corner, cropping or padding with transparency."""
+    width, height = frame_size
+    canvas = np.zeros((height, width, 4), dtype=np.uint8)
+    h, w = min(height, sprite.shape[0]), min(width, sprite.shape[1])
+    canvas[:h, :w] = sprite[:h, :w]
+    return canvas
+
+def walk_strip(sprite: np.ndarray, frame_size: Tuple[int, int] = (24, 32), frames: int = 4,
+               bob: int = 1, squash: int = 1) -> np.ndarray:
+    """Build a horizontal walking strip (RGBA, frames * width wide) from one sprite.
+
+    Each frame is a row remap of the sprite anchored at its feet: rows are
+    shifted up by the frame's lift and scaled towards the feet by its squash.
+    """
+    width, height = frame_size
+    canvas = fit_to_frame(sprite, frame_size)
+    opaque_rows = np.flatnonzero(canvas[:, :, 3].any(axis=1))
+    feet = opaque_rows[-1] if len(opaque_rows) else height - 1
+
+    poses = cycle_poses(frames, bob, squash, height)
+    lift = np.array([pose[0] for pose in poses])[:, None]
+    scale = np.array([pose[1] for pose in poses])[:, None]
+    y = np.arange(height)[None, :]
+    # Target row y shows source row feet - (feet - (y + lift)) / scale
+    source_rows = np.rint(feet - (feet - (y + lift)) / scale).astype(np.intp)
+    # Out-of-range rows read the transparent padding row at index `height`
+    source_rows[(source_rows < 0) | (source_rows >= height)] = height
+    padded = np.concatenate([canvas, np.zeros((1, width, 4), dtype=np.uint8)])
+
+    strip = padded[source_rows]  # (frames, height, width, 4)
+    return np.ascontiguousarray(strip.transpose(1, 0, 2, 3).reshape(height, frames * width, 4))
+
+def _encode_strip(job):
+    pixels, output_path = job
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    Image.fromarray(pixels, 'RGBA').save(output_path)
+    return output_path
+
+def build_walk_sheets(mappings: Dict[str, str], frame_size: Tuple[int, int] = (24, 32), frames: int = 4,
+                      bob: int = 1, squash: int = 1, workers: Optional[int] = None) -> List[str]:
+    """Create a walking strip for every ``output_path: source_sprite_path`` mapping.
+
+    Each source is decoded once even if several outputs use it; strips are
+    synthesized in this process and PNG-encoded in a process pool.
+    """
+    started = time.perf_counter()
+    sprites = {}
+    jobs = []
+    for output_path, source_path in mappings.items():
+        if not os.path.exists(source_path):
+            print(f"Warning: Character sprite not found: {source_path}")
+            continue
+        if source_path not in sprites:
+            with Image.open(source_path) as image:
+                sprites[source_path] = np.asarray(image.convert('RGBA'))
+        jobs.append((walk_strip(sprites[source_path], frame_size, frames, bob, squash), output_path))
+    synthesized = time.perf_counter()
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = list(pool.map(_encode_strip, jobs))
+    else:
+        written = [_encode_strip(job) for job in jobs]
+
+    for output_path in written:
+        print(f"Created walking spritesheet: {output_path}")
+    print(f"⏱️  {len(sprites)} sprites decoded, {len(jobs)} strips built in "
+          f"{(synthesized - started) * 1000:.0f} ms, encoded in {(time.perf_counter() - synthesized) * 1000:.0f} ms "
+          f"({max(workers, 1)} workers)")
+    return written
@@ -31,6 +31,53 @@ const ITEM_SPRITES := {
 	"camera": "res://assets/graphics/items/camera.png"
 }
 
+## Packed atlas written by scripts/tools/atlas_packer.py (one texture for the
+## placeholder characters, items and transparent character portraits instead
+## of one per file). Frames are named after their source file.
+const ATLAS_DIR := "res://assets/graphics/atlases"
+const ATLAS_MAP_PATH := ATLAS_DIR + "/characters.json"
+
+static var _atlas_frames: Dictionary = {}
+static var _atlas_pages: Array[Texture2D] = []
+static var _atlas_loaded := false
+
+## Load the atlas frame map once; frames stay empty if it is missing
+static func _load_atlas_map() -> void:
+	_atlas_loaded = true
+	if not FileAccess.file_exists(ATLAS_MAP_PATH):
+		return
+	var atlas_map = JSON.parse_string(FileAccess.get_file_as_string(ATLAS_MAP_PATH))
+	if not atlas_map is Dictionary:
+		push_warning("Invalid atlas map: " + ATLAS_MAP_PATH)
+		return
+	for page in atlas_map.get("atlases", []):
+		_atlas_pages.append(load(ATLAS_DIR + "/" + page.file) as Texture2D)
+	_atlas_frames = atlas_map.get("frames", {})
+
+## Get a frame from the packed atlas as an AtlasTexture, or null if it is not packed
+static func get_atlas_frame(frame_name: String) -> Texture2D:
+	if not _atlas_loaded:
+		_load_atlas_map()
+	if not _atlas_frames.has(frame_name):
+		return null
+	var entry: Dictionary = _atlas_frames[frame_name]
+	var page := int(entry.atlas)
+	if page >= _atlas_pages.size() or _atlas_pages[page] == null:
+		return null
+	var texture := AtlasTexture.new()
+	texture.atlas = _atlas_pages[page]
+	texture.region = Rect2(entry.region[0], entry.region[1], entry.region[2], entry.region[3])
+	# Margin restores the transparent border trimmed away by the packer
+	texture.margin = Rect2(entry.margin[0], entry.margin[1], entry.margin[2], entry.margin[3])
+	return texture
+
+## Load a sprite texture, preferring its packed atlas frame over the separate file
+static func load_sprite_texture(texture_path: String) -> Texture2D:
+	var texture := get_atlas_frame(texture_path.get_file().get_basename())
+	if texture == null:
+		texture = load(texture_path) as Texture2D
+	return texture
+
 ## Create a sprite with proper sizing for the given type
 static func create_sprite(sprite_type: String, sprite_name: String = "") -> Sprite2D:
 	var sprite = Sprite2D.new()
@@ -53,8 +100,8 @@ static func create_sprite(sprite_type: String, sprite_name: String = "") -> Spri
 		push_warning("Sprite not found: %s/%s" % [sprite_type, sprite_name])
 		return sprite
 	
-	# Load and set texture
-	var texture = load(texture_path) as Texture2D
+	# Load and set texture, preferring the shared atlas
+	var texture := load_sprite_texture(texture_path)
 	if texture:
 		sprite.texture = texture
 		
@@ -90,7 +137,7 @@ static func create_animated_sprite(sprite_type: String, sprite_name: String, fra
 				texture_path = ITEM_SPRITES.get(sprite_name, "")
 		
 		if not texture_path.is_empty():
-			var texture = load(texture_path) as Texture2D
+			var texture := load_sprite_texture(texture_path)
 			if texture:
 				sprite_frames.add_animation("default")
 				sprite_frames.add_frame("default", texture)
@@ -111,6 +158,10 @@ static func load_character_frames(character_name: String) -> SpriteFrames:
 	var frames_path = "res://assets/graphics/characters/%s/%s_frames.tres" % [character_name, character_name]
 	if ResourceLoader.exists(frames_path):
 		return load(frames_path) as SpriteFrames
+	# Fall back to the placeholder strip packed into the atlas
+	var atlas_frames_path = "%s/%s_spritesheet_frames.tres" % [ATLAS_DIR, character_name]
+	if ResourceLoader.exists(atlas_frames_path):
+		return load(atlas_frames_path) as SpriteFrames
 	return null
 
 ## Utility function to set sprite size directly